@@ -0,0 +1,73 @@
+"""Compares the peak memory and time of checking a large inventory read from different 'actual' sources. Run from the
+repository root:
+
+    python -m benchmarks.actual_sources
+    python -m benchmarks.actual_sources --size 1000000
+
+The actual standard methods are written to a CSV file with extra columns, as an ERP export would have, and checked
+as a list of dicts loaded from the file, as the file path (compact catalog) and as a sorted merge (SortedActual).
+Peak memory is measured with tracemalloc and includes the fetched items.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from stdchecker.astm import check_astm
+from stdchecker.catalog import SortedActual
+from stdchecker.record import StdRecord
+from stdchecker.sources import read_file
+
+EXTRA_COLUMNS = ("desc", "location", "owner", "updated_at")
+
+
+def write_actual(path, size):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("id", "no", "rev") + EXTRA_COLUMNS)
+        for i in range(size):
+            writer.writerow((i, f"ASTM D{i:07d}", "18" if i % 2 else "20(2015)", "Standard Test Method for " * 4,
+                             f"Lab {i % 20}", "Quality", "2026-01-01"))
+
+
+def fetched_items(size):
+    for i in range(size):
+        yield StdRecord(f"D{i:07d}", None, f"ASTM D{i:07d}", "20", "", "astm", None)
+
+
+def measure(actual_factory, size):
+    tracemalloc.start()
+    start = time.perf_counter()
+    outdated = 0
+    for checked_item in check_astm(fetched_items(size), actual_factory(), id_from_actual=True):
+        outdated += not checked_item['check']
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, outdated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare 'actual' sources of the check functions.")
+    parser.add_argument("--size", type=int, default=200000, help="Number of standard methods.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as path:
+        csv_path = os.path.join(path, "actual.csv")
+        write_actual(csv_path, args.size)
+        sources = {
+            'list of dicts': lambda: list(read_file(csv_path)),
+            'file path': lambda: csv_path,
+            'sorted merge': lambda: SortedActual(csv_path),
+        }
+        print(f"{'source':<16} {'time':>10} {'peak memory':>14} {'outdated':>10}")
+        for name, factory in sources.items():
+            elapsed, peak, outdated = measure(factory, args.size)
+            print(f"{name:<16} {elapsed:>8.2f} s {peak / 2 ** 20:>10.2f} MiB {outdated:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
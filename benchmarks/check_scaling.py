@@ -0,0 +1,44 @@
+"""Compares the running time of check functions with a plain list scan and with an ActualCatalog as the inventory
+grows. Run from the repository root:
+
+    python -m benchmarks.check_scaling
+"""
+import time
+from stdchecker.catalog import ActualCatalog
+from stdchecker.astm import check_astm
+
+SIZES = (1000, 2000, 4000, 8000)
+
+
+def make_inventory(size):
+    fetched = [{'query': f"D{i}", 'error': None, 'no': f"ASTM D{i}", 'rev': "20", 'desc': "", 'body': "astm",
+                'url': None} for i in range(size)]
+    actual = [{'id': i, 'no': f"ASTM D{i}", 'rev': "18" if i % 2 else "20(2015)"} for i in range(size)]
+    return fetched, actual
+
+
+def linear_check(fetched, actual):
+    # Lookup used by the check functions before ActualCatalog was introduced.
+    for fetched_item in fetched:
+        fetched_no = fetched_item['no']
+        yield next((i for i in actual if i['no'] == fetched_no), None)
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    for _ in func(*args):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'rows':>8} {'list scan (s)':>14} {'catalog (s)':>12}")
+    for size in SIZES:
+        fetched, actual = make_inventory(size)
+        scan = measure(linear_check, fetched, actual)
+        catalog = measure(check_astm, fetched, ActualCatalog(actual))
+        print(f"{size:>8} {scan:>14.4f} {catalog:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()
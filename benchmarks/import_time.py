@@ -0,0 +1,59 @@
+"""Import time of the package. Run from the repository root:
+
+    python -m benchmarks.import_time                # time each scenario 10 times
+    python -m benchmarks.import_time --repeat 30
+
+Each scenario is run in a fresh interpreter, since modules are imported only once per process. The best and median
+wall time of the interpreter are reported together with the time of a bare interpreter, and whether the HTTP
+(requests) and HTML (bs4) stacks were loaded.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from benchmarks.suite import ROOT_PATH, format_time
+
+SCENARIOS = {
+    'python': "pass",
+    'import stdchecker': "import stdchecker",
+    'check_tse': "from stdchecker import check_tse; list(check_tse([], []))",
+    'check_all': "from stdchecker import check_all",
+    'fetch_tse': "from stdchecker import fetch_tse",
+    'make_soup': "from stdchecker import fetch_astm; from stdchecker.parsers import make_soup; "
+                 "make_soup('<b></b>')",
+}
+REPORT = "import sys; print('requests' in sys.modules, 'bs4' in sys.modules)"
+
+
+def run(code, repeat=10):
+    """
+    Runs code in a fresh interpreter a number of times and returns the wall times and the loaded HTTP and HTML
+    stacks of the last run.
+    """
+    times = list()
+    stdout = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stdout = subprocess.run([sys.executable, "-c", f"{code}\n{REPORT}"], cwd=ROOT_PATH, capture_output=True,
+                                text=True, check=True).stdout
+        times.append(time.perf_counter() - start)
+    loaded_requests, loaded_bs4 = stdout.split()
+    return times, loaded_requests == "True", loaded_bs4 == "True"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time importing stdchecker in fresh interpreters.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of interpreters started for each scenario.")
+    args = parser.parse_args(argv)
+
+    print(f"{'scenario':<20} {'min':>12} {'median':>12} {'requests':>9} {'bs4':>5}")
+    for name, code in SCENARIOS.items():
+        times, loaded_requests, loaded_bs4 = run(code, repeat=args.repeat)
+        print(f"{name:<20} {format_time(min(times)):>12} {format_time(statistics.median(times)):>12} "
+              f"{'yes' if loaded_requests else 'no':>9} {'yes' if loaded_bs4 else 'no':>5}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
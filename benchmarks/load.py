@@ -0,0 +1,157 @@
+"""End-to-end load test of the fetch and check pipeline against the local stand-in server
+(:mod:`benchmarks.mockserver`). Run from the repository root:
+
+    python -m benchmarks.load --body astm --queries 500 --concurrency 1 4 16 --latency 0.05 --jitter 0.02
+
+For each concurrency level, the queries are searched on a thread pool (the same way as the fetch functions do) and the
+results are checked against a synthetic inventory. Requests per second, p50/p99 latency per query (including retries)
+and peak memory traced by :mod:`tracemalloc` are reported. The server runs in a separate process, so it does not
+compete with the client for the GIL or show up in the memory figures. Tracing memory slows down the allocation-heavy
+HTML parsing noticeably, so use ``--no-memory`` when tuning throughput. ``--stream`` reads ASTM pages in chunks and
+closes each connection early; combine it with ``--bandwidth`` to compare it with whole-page downloads on a slow host.
+"""
+import argparse
+import multiprocessing
+import time
+import tracemalloc
+from functools import partial
+import requests
+from stdchecker.astm import search_astm, check_astm, download_astm, parse_astm
+from stdchecker.iec import search_iec, check_iec, download_iec, parse_iec
+from stdchecker.ieee import search_ieee, check_ieee, download_ieee, parse_ieee
+from stdchecker.tse import search_tse, check_tse, download_tse, parse_tse
+from stdchecker.endpoints import set_base_url
+from stdchecker.pool import create_session, map_queries, map_parsed
+from stdchecker.ratelimit import set_rate_limit, remove_rate_limit
+from stdchecker.resilience import set_resilience, remove_resilience
+from benchmarks.mockserver import serve, add_fault_arguments, fault_kwargs
+
+PIPELINES = {
+    'astm': (search_astm, check_astm, lambda i: f"D{1000 + i}", "20"),
+    'iec': (search_iec, check_iec, lambda i: f"{61000 + i}", "2020"),
+    'ieee': (search_ieee, check_ieee, lambda i: f"C{1000 + i}.104", "2019"),
+    'tse': (search_tse, check_tse, lambda i: f"TS EN IEC {61000 + i}", "01.01.2020"),
+}
+PARSE_STAGES = {
+    'astm': (download_astm, parse_astm),
+    'iec': (download_iec, parse_iec),
+    'ieee': (download_ieee, parse_ieee),
+    'tse': (download_tse, parse_tse),
+}
+
+
+def timed(func, latencies):
+    def wrapper(query_item, session):
+        start = time.perf_counter()
+        try:
+            return func(query_item, session)
+        finally:
+            latencies.append(time.perf_counter() - start)
+    return wrapper
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+def run_level(body, queries, concurrency, trace_memory=True, parse_workers=None, parse_chunksize=None, stream=False):
+    """
+    Runs the pipeline of a standard body once and returns a dict of the measurements. If 'parse_workers' is given,
+    responses are parsed on a process pool and the latencies exclude parsing. 'stream' only applies to ASTM.
+    """
+    search_func, check_func, _, rev = PIPELINES[body]
+    download_func, parse_func = PARSE_STAGES[body]
+    if stream and body == "astm":
+        search_func = partial(search_func, stream=True)
+        download_func = partial(download_func, stream=True)
+    latencies = list()
+    session = create_session(concurrency, user_agent=body != "tse")
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    fetched = list()
+    if parse_workers:
+        found_lists = map_parsed(timed(download_func, latencies), parse_func, queries, session,
+                                 max_workers=concurrency, parse_workers=parse_workers, chunksize=parse_chunksize,
+                                 ordered=False, body=body)
+    else:
+        found_lists = map_queries(timed(search_func, latencies), queries, session, max_workers=concurrency,
+                                  ordered=False)
+    for results in found_lists:
+        fetched.extend(results)
+    actual = [{'no': i['no'], 'rev': rev} for i in fetched if i['no']]
+    checked = list(check_func(fetched, actual))
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    session.close()
+    return {
+        'concurrency': concurrency,
+        'elapsed': elapsed,
+        'queries_per_second': len(queries) / elapsed,
+        'p50': percentile(latencies, 0.50),
+        'p99': percentile(latencies, 0.99),
+        'errors': sum(1 for i in fetched if i['error']),
+        'checked': len(checked),
+        'peak_memory': peak,
+    }
+
+
+def server_stats(url):
+    return requests.get(f"{url}/__stats", timeout=10).json()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test stdchecker against a local stand-in server.")
+    parser.add_argument("--body", choices=list(PIPELINES), default="astm")
+    parser.add_argument("--queries", type=int, default=200, help="Number of unique queries per run.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Concurrency levels.")
+    parser.add_argument("--rate-limit", type=float, help="Requests per second of a stdchecker.ratelimit limiter.")
+    parser.add_argument("--resilience", action="store_true", help="Enable stdchecker.resilience with defaults.")
+    parser.add_argument("--no-memory", action="store_true", help="Do not trace memory allocations.")
+    parser.add_argument("--parse-workers", type=int, help="Parse the responses on a pool of this many processes.")
+    parser.add_argument("--stream", action="store_true", help="Only read ASTM pages up to the needed elements.")
+    parser.add_argument("--parse-chunksize", type=int, help="Number of responses sent to a parsing process at a time.")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, kwargs=dict(ready=ready, **fault_kwargs(args)), daemon=True)
+    server.start()
+    try:
+        url = ready.get(timeout=30)
+        set_base_url(args.body, url)
+        queries = [PIPELINES[args.body][2](i) for i in range(args.queries)]
+        print(f"{args.body} against {url}, {args.queries} queries, latency {args.latency}s ± {args.jitter}s, "
+              f"error rate {args.error_rate}, throttle rate {args.throttle_rate}")
+        print(f"{'workers':>8} {'requests':>9} {'req/s':>9} {'query/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+              f"{'errors':>7} {'peak MiB':>9}")
+        for concurrency in args.concurrency:
+            remove_rate_limit()
+            remove_resilience()
+            if args.rate_limit:
+                set_rate_limit(args.body, rate=args.rate_limit, concurrency=concurrency, max_concurrency=concurrency)
+            if args.resilience:
+                set_resilience(args.body)
+            before = sum(server_stats(url).values())
+            result = run_level(args.body, queries, concurrency, trace_memory=not args.no_memory,
+                               parse_workers=args.parse_workers, parse_chunksize=args.parse_chunksize,
+                               stream=args.stream)
+            requests_sent = sum(server_stats(url).values()) - before
+            peak = "-" if result['peak_memory'] is None else f"{result['peak_memory'] / 2 ** 20:.2f}"
+            print(f"{concurrency:>8} {requests_sent:>9} {requests_sent / result['elapsed']:>9.1f} "
+                  f"{result['queries_per_second']:>9.1f} {result['p50'] * 1000:>9.1f} {result['p99'] * 1000:>9.1f} "
+                  f"{result['errors']:>7} {peak:>9}")
+    finally:
+        remove_rate_limit()
+        remove_resilience()
+        set_base_url(args.body)
+        server.terminate()
+        server.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Ingestion, differential refresh and check throughput of the local catalog index (:mod:`stdchecker.offline`). Run
+from the repository root:
+
+    python -m benchmarks.local_index
+    python -m benchmarks.local_index --size 1000000
+
+A synthetic ASTM catalog is ingested into a temporary index, then ingested again with 1% of the revisions changed.
+Finally an inventory of the same size is checked against the index without sending requests.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from stdchecker.astm import check_astm
+from stdchecker.catalog import ActualCatalog
+from stdchecker.offline import LocalIndex
+
+
+def catalog_dump(size, changed_every=None):
+    for i in range(size):
+        rev = "21" if changed_every and i % changed_every == 0 else "20"
+        yield {'no': f"ASTM D{i}", 'rev': rev, 'desc': "Standard Test Method", 'url': None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the local catalog index.")
+    parser.add_argument("--size", type=int, default=200000, help="Number of catalog entries and inventory rows.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as path, LocalIndex(os.path.join(path, "index.sqlite")) as index:
+        start = time.perf_counter()
+        counts = index.ingest("astm", catalog_dump(args.size))
+        print(f"ingest   {time.perf_counter() - start:8.2f} s  {counts}")
+        start = time.perf_counter()
+        counts = index.ingest("astm", catalog_dump(args.size, changed_every=100))
+        print(f"refresh  {time.perf_counter() - start:8.2f} s  {counts}")
+
+        queries = [f"D{i}" for i in range(args.size)]
+        actual = ActualCatalog({'id': i, 'no': f"ASTM D{i}", 'rev': "20"} for i in range(args.size))
+        start = time.perf_counter()
+        outdated = sum(not i['check'] for i in check_astm(index.fetch("astm", queries), actual, id_from_actual=True))
+        elapsed = time.perf_counter() - start
+        print(f"check    {elapsed:8.2f} s  {args.size / elapsed * 60:,.0f} rows/min, {outdated} outdated")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""Local stand-in for the websites of the standard bodies. Run from the repository root:
+
+    python -m benchmarks.mockserver --port 8000 --latency 0.05 --jitter 0.02 --error-rate 0.01
+
+The server answers the four endpoints used by stdchecker from the fixtures in tests/webdata:
+
+- ``GET /Standards/<designation>.htm`` (ASTM product page)
+- ``GET /searchkey&key=<number>&...`` (IEC search)
+- ``POST /wp-admin/admin-ajax.php`` (IEEE search)
+- ``POST /Standard/Standard/StandardAra.aspx`` (TSE search)
+
+The designation in a fixture is replaced by the queried one, so every query is found. Latency, jitter, server errors
+(503) and throttling (429) are injected at random. ``GET /__stats`` returns the number of requests by status code.
+Point stdchecker at the server with :func:`stdchecker.endpoints.set_base_url`.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote_plus
+
+WEBDATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "webdata")
+BODIES = ("astm", "iec", "ieee", "tse")
+
+
+def read_webdata(filename):
+    with open(os.path.join(WEBDATA_PATH, filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class MockStandardsServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server which serves the fixtures with injected latency, errors and throttling.
+    """
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0,
+                 retry_after=0, seed=None, bandwidth=None):
+        """
+        :param host: Host to listen on.
+        :param port: Port to listen on. 0 selects a free port.
+        :param latency: Mean seconds to wait before responding.
+        :param jitter: Latency varies uniformly between latency - jitter and latency + jitter.
+        :param error_rate: Fraction of requests answered with 503 Service Unavailable.
+        :param throttle_rate: Fraction of requests answered with 429 Too Many Requests.
+        :param retry_after: Value of the 'Retry-After' header of 429 responses.
+        :param seed: Seed of the random number generator.
+        :param bandwidth: Bytes per second of each response body. If None, bodies are sent at once.
+        """
+        super().__init__((host, port), MockStandardsHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.bandwidth = bandwidth
+        self.stats = Counter()
+        self.stats_lock = threading.Lock()
+        self.fixtures = {
+            'astm': read_webdata("D92.html"),
+            'iec': read_webdata("60296.html"),
+            'ieee': read_webdata("ieee_search.json"),
+            'tse': read_webdata("tse.html"),
+        }
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Serves requests in a background thread.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-standards-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def handle_error(self, request, client_address):
+        # Clients which read only the beginning of a response close the connection. That is not an error.
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    def count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def fault(self):
+        """
+        Sleeps for the injected latency and returns an injected status code or None.
+        """
+        with self.stats_lock:
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            roll = self.random.random()
+        time.sleep(delay)
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+
+class MockStandardsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/__stats":
+            with self.server.stats_lock:
+                stats = dict(self.server.stats)
+            return self.respond(200, json.dumps(stats), "application/json")
+        if self.path.startswith("/Standards/") and self.path.endswith(".htm"):
+            query = unquote_plus(self.path[len("/Standards/"):-len(".htm")])
+            return self.serve("astm", lambda html: html.replace("D92", query))
+        if self.path.startswith("/searchkey&"):
+            params = parse_qs(self.path[len("/searchkey&"):])
+            query = params.get("key", [""])[0]
+            return self.serve("iec", lambda html: html.replace("60296", query))
+        self.respond(404, "Not found")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        if self.path == "/wp-admin/admin-ajax.php":
+            query = form.get("q", [""])[0]
+            return self.serve("ieee", lambda text: text.replace("C57.104", query), "application/json")
+        if self.path == "/Standard/Standard/StandardAra.aspx":
+            query = form.get("ctl00$cph1$txtTsNo", [""])[0]
+            return self.serve("tse", lambda html: html.replace("60296", query.split()[-1] if query else ""))
+        self.respond(404, "Not found")
+
+    def serve(self, body, render, content_type="text/html; charset=utf-8"):
+        status = self.server.fault()
+        if status is not None:
+            self.server.count(f"{body} {status}")
+            headers = {'Retry-After': str(self.server.retry_after)} if status == 429 else None
+            return self.respond(status, "Injected fault", headers=headers)
+        self.server.count(f"{body} 200")
+        self.respond(200, render(self.server.fixtures[body]), content_type)
+
+    def respond(self, status, text, content_type="text/plain; charset=utf-8", headers=None):
+        content = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        bandwidth = self.server.bandwidth
+        if not bandwidth:
+            self.wfile.write(content)
+            return
+        chunk_size = 8192
+        for start in range(0, len(content), chunk_size):
+            time.sleep(chunk_size / bandwidth)
+            self.wfile.write(content[start:start + chunk_size])
+            self.wfile.flush()
+
+
+def serve(port=0, ready=None, **kwargs):
+    """
+    Runs a server until the process is terminated. If 'ready' is a :class:`multiprocessing.Queue`, the URL of the
+    server is put into it once it is listening.
+    """
+    server = MockStandardsServer(port=port, **kwargs)
+    if ready is not None:
+        ready.put(server.url)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean response latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform latency jitter in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429 responses.")
+    parser.add_argument("--seed", type=int, help="Seed of the random number generator.")
+    parser.add_argument("--bandwidth", type=float, help="Bytes per second of each response body.")
+
+
+def fault_kwargs(args) -> dict:
+    return {'latency': args.latency, 'jitter': args.jitter, 'error_rate': args.error_rate,
+            'throttle_rate': args.throttle_rate, 'seed': args.seed, 'bandwidth': args.bandwidth}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve stand-ins of the standard bodies' websites.")
+    parser.add_argument("--port", type=int, default=8000)
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    server = MockStandardsServer(port=args.port, **fault_kwargs(args))
+    print(f"Serving on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""Microbenchmarks of the parse and check functions. Run from the repository root:
+
+    python -m benchmarks.suite                      # run and print all benchmarks
+    python -m benchmarks.suite --save               # also store the results in benchmarks/results
+    python -m benchmarks.suite --compare FILE       # compare with the results stored in FILE
+    python -m benchmarks.suite -k check --quick     # only check benchmarks, only the smallest inventory
+
+Parse benchmarks time the extraction of standard method data from the fixtures in tests/webdata without sending
+requests. Check benchmarks time the check functions on synthetic inventories of 1k, 10k and 100k rows. Each
+benchmark is run with :class:`timeit.Timer` and the minimum and median time per call of the repeats are reported.
+
+Saved results are specific to the machine they were measured on, so benchmarks/results is not tracked by git. To check
+a change for regressions, save a run of the base commit and compare a run of the change with it on the same machine.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from stdchecker.astm import parse_astm, check_astm
+from stdchecker.iec import parse_iec, check_iec
+from stdchecker.ieee import parse_ieee, check_ieee
+from stdchecker.tse import parse_tse, check_tse
+from stdchecker.parsers import get_html_parser, set_html_parser
+from stdchecker.record import StdRecord
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEBDATA_PATH = os.path.join(ROOT_PATH, "tests", "webdata")
+RESULTS_PATH = os.path.join(ROOT_PATH, "benchmarks", "results")
+SIZES = (1000, 10000, 100000)
+REGRESSION_THRESHOLD = 1.10
+
+
+def read_webdata(filename):
+    with open(os.path.join(WEBDATA_PATH, filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def parse_benchmarks():
+    astm_html = read_webdata("D92.html")
+    iec_html = read_webdata("60296.html")
+    ieee_json = read_webdata("ieee_search.json")
+    tse_html = read_webdata("tse.html")
+    return {
+        'parse_astm': lambda: parse_astm("D92", astm_html, "https://www.astm.org/Standards/D92.htm"),
+        'parse_iec': lambda: parse_iec("60296", iec_html),
+        'parse_ieee': lambda: parse_ieee("C57.104", ieee_json),
+        'parse_tse': lambda: parse_tse("TS EN IEC 60296", tse_html),
+    }
+
+
+def make_inventory(body, size):
+    """
+    Returns fetched and actual lists of a synthetic inventory. Half of the actual standard methods are outdated.
+    """
+    if body == "astm":
+        no, latest, revs = "ASTM D{}", "20", ("20(2015)", "18")
+    elif body == "iec":
+        no, latest, revs = "IEC {}", "2020", ("2020 RLV", "2011")
+    elif body == "ieee":
+        no, latest, revs = "IEEE C{}", "2019", ("2019", "2008")
+    else:
+        no, latest, revs = "TS EN {}", "01.02.2020", ("01.02.2020", "03.04.2011")
+    fetched = [{'query': no.format(i), 'error': None, 'no': no.format(i), 'rev': latest, 'desc': "", 'body': body,
+                'url': None} for i in range(size)]
+    actual = [{'id': i, 'no': no.format(i), 'rev': revs[i % 2]} for i in range(size)]
+    return fetched, actual
+
+
+def check_benchmarks(sizes=SIZES):
+    benchmarks = dict()
+    for body, check_func in (("astm", check_astm), ("iec", check_iec), ("ieee", check_ieee), ("tse", check_tse)):
+        for size in sizes:
+            fetched, actual = make_inventory(body, size)
+            benchmarks[f"check_{body}[{size}]"] = (
+                lambda f=check_func, fetched=fetched, actual=actual: list(f(fetched, actual, id_from_actual=True)))
+            records = [StdRecord.from_dict(i) for i in fetched]
+            benchmarks[f"check_{body}_compact[{size}]"] = (
+                lambda f=check_func, records=records, actual=actual: list(f(records, actual, id_from_actual=True)))
+    return benchmarks
+
+
+def run(func, repeat=5, min_time=0.2):
+    """
+    Times a callable and returns a dict of the minimum and median seconds per call.
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / elapsed)) if elapsed else number
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'min': min(times), 'median': statistics.median(times), 'number': number, 'repeat': repeat}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_PATH, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results, path=RESULTS_PATH):
+    """
+    Stores the results in a JSON file named after the time and the git commit of the run, and returns its path.
+    """
+    os.makedirs(path, exist_ok=True)
+    commit = results['meta']['commit'] or "unknown"
+    filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    filepath = os.path.join(path, filename)
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return filepath
+
+
+def format_time(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the stdchecker microbenchmarks.")
+    parser.add_argument("-k", dest="keyword", help="Only run benchmarks whose name contains this string.")
+    parser.add_argument("--quick", action="store_true", help="Only use the smallest synthetic inventory.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repeats of each benchmark.")
+    parser.add_argument("--html-parser", help="BeautifulSoup parser backend, e.g. 'lxml'.")
+    parser.add_argument("--save", action="store_true", help="Store the results in benchmarks/results.")
+    parser.add_argument("--compare", metavar="FILE", help="Compare with the results stored in a JSON file.")
+    args = parser.parse_args(argv)
+
+    if args.html_parser:
+        set_html_parser(args.html_parser)
+    benchmarks = dict(parse_benchmarks(), **check_benchmarks(SIZES[:1] if args.quick else SIZES))
+    if args.keyword:
+        benchmarks = {name: func for name, func in benchmarks.items() if args.keyword in name}
+    baseline = dict()
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)['results']
+
+    results = {
+        'meta': {'commit': git_commit(), 'python': platform.python_version(), 'platform': platform.platform(),
+                 'html_parser': get_html_parser(), 'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z")},
+        'results': dict(),
+    }
+    regressions = 0
+    print(f"{'benchmark':<28} {'min':>12} {'median':>12} {'change':>8}")
+    for name, func in benchmarks.items():
+        result = run(func, repeat=args.repeat)
+        results['results'][name] = result
+        change = ""
+        if name in baseline:
+            ratio = result['min'] / baseline[name]['min']
+            change = f"{ratio:.2f}x"
+            if ratio > REGRESSION_THRESHOLD:
+                change += " !"
+                regressions += 1
+        print(f"{name:<28} {format_time(result['min']):>12} {format_time(result['median']):>12} {change:>8}")
+    if args.save:
+        print(f"Results are saved to {save(results)}")
+    if regressions:
+        print(f"{regressions} benchmarks are slower than the baseline by more than "
+              f"{REGRESSION_THRESHOLD - 1:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,6 +18,14 @@ setuptools.setup(
         "beautifulsoup4",
         "requests",
     ],
+    extras_require={
+        "async": ["httpx"],
+        "http2": ["httpx[http2]"],
+        "lxml": ["lxml"],
+    },
+    entry_points={
+        "console_scripts": ["stdchecker = stdchecker.cli:main"],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "License :: OSI Approved :: MIT License",
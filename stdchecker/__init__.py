@@ -1,8 +1,5 @@
+import importlib
 import logging
-from stdchecker.astm import fetch_astm, check_astm, check_astm_as_list
-from stdchecker.iec import fetch_iec, check_iec, check_iec_as_list
-from stdchecker.tse import fetch_tse, check_tse, check_tse_as_list
-from stdchecker.ieee import fetch_ieee, check_ieee, check_ieee_as_list
 
 __title__ = "stdchecker"
 __version__ = "0.1.6"
@@ -12,6 +9,7 @@ __license__ = "MIT"
 __status__ = "development"
 
 __all__ = [
+    "ActualCatalog",
     "fetch_astm",
     "check_astm",
     "check_astm_as_list",
@@ -23,8 +21,49 @@ __all__ = [
     "check_tse_as_list",
     "fetch_ieee",
     "check_ieee",
-    "check_ieee_as_list"
+    "check_ieee_as_list",
+    "check_all"
 ]
 
+# Submodules of the public names. They are imported on first access, so that importing the package stays fast and
+# a check-only workflow does not load the HTTP and HTML parsing dependencies.
+_LAZY = {
+    "ActualCatalog": "catalog",
+    "fetch_astm": "astm",
+    "check_astm": "astm",
+    "check_astm_as_list": "astm",
+    "fetch_iec": "iec",
+    "check_iec": "iec",
+    "check_iec_as_list": "iec",
+    "fetch_tse": "tse",
+    "check_tse": "tse",
+    "check_tse_as_list": "tse",
+    "fetch_ieee": "ieee",
+    "check_ieee": "ieee",
+    "check_ieee_as_list": "ieee",
+    "check_all": "orchestrator",
+}
+
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        # Submodules (e.g. stdchecker.astm) were imported with the package before, so they are resolved on access.
+        if not name.startswith("_"):
+            try:
+                return importlib.import_module(f".{name}", __name__)
+            except ModuleNotFoundError as e:
+                if e.name != f"{__name__}.{name}":
+                    raise
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
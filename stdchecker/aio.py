@@ -0,0 +1,316 @@
+"""Asyncio counterparts of the fetch and check functions. Requests are sent with the non-blocking
+`httpx <https://www.python-httpx.org>`_ client, which can be installed with ``pip install stdchecker[async]``.
+
+Async generators yield dicts as soon as they are ready, so results are not in the order of the query list. Dicts have
+the same keys and values as the ones yielded by the synchronous functions.
+"""
+import asyncio
+import importlib.util
+import logging
+from collections.abc import AsyncIterable, Iterable
+import httpx
+from .constants import USER_AGENT
+from .catalog import as_catalog
+from .astm import astm_url, parse_astm, check_astm
+from . import iec, ieee, tse
+from .iec import parse_iec, check_iec, _exact_iec
+from .ieee import ieee_form_data, parse_ieee, check_ieee
+from .tse import tse_form_data, parse_tse, check_tse
+
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+_HEADERS = {'User-Agent': USER_AGENT}
+_DONE = object()
+
+
+def create_client(concurrency=8, http2=None, keepalive_expiry=5.0, **kwargs) -> httpx.AsyncClient:
+    """
+    Creates an :class:`httpx.AsyncClient` object whose connection pool is large enough for the given concurrency. A
+    client can be passed to the fetch functions of every standard body and reused across calls, so that connections
+    stay open.
+
+    :param concurrency: Maximum number of connections.
+    :param http2: If True, HTTP/2 is negotiated with the servers which support it, so requests to a host share a
+        single connection. It requires the 'h2' package (``pip install httpx[http2]``). If None, HTTP/2 is used when
+        'h2' is installed.
+    :param keepalive_expiry: Seconds an idle connection is kept open.
+    :param kwargs: Other keyword arguments passed to :class:`httpx.AsyncClient`. Redirects are followed unless
+        'follow_redirects' is False, as they are by the synchronous functions.
+    :return: An :class:`httpx.AsyncClient` object.
+    """
+    if http2 is None:
+        http2 = importlib.util.find_spec("h2") is not None
+    kwargs.setdefault("timeout", 10)
+    kwargs.setdefault("follow_redirects", True)
+    kwargs.setdefault("limits", httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency,
+                                             keepalive_expiry=keepalive_expiry))
+    return httpx.AsyncClient(http2=http2, **kwargs)
+
+
+async def search_astm_async(query_item, client) -> list:
+    """
+    Gets the product page of a standard method from the ASTM website.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param client: An :class:`httpx.AsyncClient` object.
+    :return: A list containing a single dict of the standard method data.
+    """
+    query_item = str(query_item)
+    url = astm_url(query_item)
+    try:
+        response = await client.get(url, headers=_HEADERS)
+        response.raise_for_status()
+    except httpx.HTTPStatusError:
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Not found", 'no': None, 'rev': None, 'desc': None, 'body': "astm",
+                 'url': None}]
+    except httpx.HTTPError:
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "astm", 'url': None}]
+    return parse_astm(query_item, response.text, url)
+
+
+async def search_iec_async(query_item, client) -> list:
+    """
+    Gets query results from the IEC search engine.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param client: An :class:`httpx.AsyncClient` object.
+    :return: A list of dicts containing search results.
+    """
+    query_item = str(query_item)
+    url = iec.IEC_SEARCH_URL.format(query_item)
+    try:
+        response = await client.get(url, headers=_HEADERS)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "iec", 'url': None}]
+    return parse_iec(query_item, response.text)
+
+
+async def search_ieee_async(query_item, client) -> list:
+    """
+    Gets query results from the IEEE search engine.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param client: An :class:`httpx.AsyncClient` object.
+    :return: A list of dicts containing search results.
+    """
+    query_item = str(query_item)
+    try:
+        response = await client.post(ieee.IEEE_SEARCH_URL, data=ieee_form_data(query_item), headers=_HEADERS)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "ieee", 'url': None}]
+    return parse_ieee(query_item, response.text)
+
+
+async def search_tse_async(query_item, client) -> list:
+    """
+    Gets query results of the TSE search engine.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param client: An :class:`httpx.AsyncClient` object.
+    :return: A list of dicts containing search results.
+    """
+    query_item = str(query_item)
+    try:
+        response = await client.post(tse.TSE_SEARCH_URL, data=tse_form_data(query_item))
+        response.raise_for_status()
+    except httpx.HTTPError:
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "tse", 'url': None}]
+    return parse_tse(query_item, response.text)
+
+
+async def _search_iec_exact_async(query_item, client) -> list:
+    return _exact_iec(query_item, await search_iec_async(query_item, client))
+
+
+async def map_queries_async(func, query_list, client, concurrency=8):
+    """
+    Awaits ``func(query, client)`` for every query with at most 'concurrency' calls in flight and yields the return
+    values in completion order.
+
+    :param func: A coroutine function which takes a query string and a client object.
+    :param query_list: An iterable of query strings.
+    :param client: An :class:`httpx.AsyncClient` object shared by all calls.
+    :param concurrency: Maximum number of calls in flight.
+    :return: An async generator that yields return values of the calls.
+    """
+    queue = asyncio.Queue(maxsize=concurrency)
+    query_iter = iter(query_list)
+
+    async def worker():
+        try:
+            # All workers share the same iterator, which is safe since they run on the same event loop.
+            for query in query_iter:
+                await queue.put(await func(query, client))
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(_DONE)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+    running = len(workers)
+    try:
+        while running:
+            result = await queue.get()
+            if result is _DONE:
+                running -= 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                yield result
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+async def _fetch(search_func, query_list, concurrency, client):
+    if isinstance(query_list, str):
+        query_list = (query_list,)
+    if not isinstance(query_list, Iterable):
+        raise TypeError(f"Argument must be a string or an iterable object, {query_list.__class__.__name__} given.")
+    query_list = (str(i) for i in query_list)
+    if client is None:
+        async with create_client(concurrency) as client:
+            async for found_list in map_queries_async(search_func, query_list, client, concurrency):
+                for found_item in found_list:
+                    yield found_item
+    else:
+        async for found_list in map_queries_async(search_func, query_list, client, concurrency):
+            for found_item in found_list:
+                yield found_item
+
+
+def fetch_astm_async(query_list, concurrency=8, client=None):
+    """
+    Fetches data of the latest revision of standard methods from the ASTM website.
+
+    :param query_list: A string or an iterable object contains query strings. A query string should be designation
+        (or number) of a standard method.
+    :param concurrency: Maximum number of requests in flight.
+    :param client: An :class:`httpx.AsyncClient` object. If None, a client is created and closed by the generator.
+    :return: An async generator that yields dicts containing data of the latest standard method(s).
+    """
+    return _fetch(search_astm_async, query_list, concurrency, client)
+
+
+def fetch_iec_async(query_list, concurrency=8, client=None):
+    """
+    Fetches data of the latest revision of standard methods from the IEC search engine.
+
+    :param query_list: A string or an iterable object contains query strings. A query string should be designation
+        (or number) of a standard method.
+    :param concurrency: Maximum number of requests in flight.
+    :param client: An :class:`httpx.AsyncClient` object. If None, a client is created and closed by the generator.
+    :return: An async generator that yields dicts containing data of the latest standard method(s).
+    """
+    return _fetch(_search_iec_exact_async, query_list, concurrency, client)
+
+
+def fetch_ieee_async(query_list, concurrency=8, client=None):
+    """
+    Fetches data of the latest revision of standard methods from the IEEE search engine.
+
+    :param query_list: A string or an iterable object contains query strings. A query string should be designation
+        (or number) of a standard method.
+    :param concurrency: Maximum number of requests in flight.
+    :param client: An :class:`httpx.AsyncClient` object. If None, a client is created and closed by the generator.
+    :return: An async generator that yields dicts containing data of the latest standard method(s).
+    """
+    return _fetch(search_ieee_async, query_list, concurrency, client)
+
+
+def fetch_tse_async(query_list, concurrency=8, client=None):
+    """
+    Fetches data of the latest revision of standard methods from the TSE search engine.
+
+    :param query_list: A string or an iterable object contains query strings. A query string should be designation
+        (or number) of a standard method.
+    :param concurrency: Maximum number of requests in flight.
+    :param client: An :class:`httpx.AsyncClient` object. If None, a client is created and closed by the generator.
+    :return: An async generator that yields dicts containing data of the latest standard method(s).
+    """
+    return _fetch(search_tse_async, query_list, concurrency, client)
+
+
+async def _check(check_func, fetched, actual, id_from_actual):
+    actual = as_catalog(actual)
+    if isinstance(fetched, AsyncIterable):
+        async for fetched_item in fetched:
+            for checked_item in check_func((fetched_item,), actual, id_from_actual=id_from_actual):
+                yield checked_item
+    elif isinstance(fetched, Iterable):
+        for checked_item in check_func(fetched, actual, id_from_actual=id_from_actual):
+            yield checked_item
+    else:
+        raise TypeError("'fetched' argument must be an iterable or an async iterable of dicts.")
+
+
+def check_astm_async(fetched, actual: list, id_from_actual=False):
+    """
+    Checks the revision status of actual standard methods. See :func:`stdchecker.astm.check_astm`.
+
+    :param fetched: An async iterable (e.g. :func:`fetch_astm_async`) or an iterable of dicts containing the latest
+        revision data.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor.
+    :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
+    :return: An async generator that yields dicts containing comparison data.
+    """
+    return _check(check_astm, fetched, actual, id_from_actual)
+
+
+def check_iec_async(fetched, actual: list, id_from_actual=False):
+    """
+    Checks the revision status of actual standard methods. See :func:`stdchecker.iec.check_iec`.
+
+    :param fetched: An async iterable (e.g. :func:`fetch_iec_async`) or an iterable of dicts containing the latest
+        revision data.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor.
+    :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
+    :return: An async generator that yields dicts containing comparison data.
+    """
+    return _check(check_iec, fetched, actual, id_from_actual)
+
+
+def check_ieee_async(fetched, actual: list, id_from_actual=False):
+    """
+    Checks the revision status of actual standard methods. See :func:`stdchecker.ieee.check_ieee`.
+
+    :param fetched: An async iterable (e.g. :func:`fetch_ieee_async`) or an iterable of dicts containing the latest
+        revision data.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor.
+    :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
+    :return: An async generator that yields dicts containing comparison data.
+    """
+    return _check(check_ieee, fetched, actual, id_from_actual)
+
+
+def check_tse_async(fetched, actual: list, id_from_actual=False):
+    """
+    Checks the revision status of actual standard methods. See :func:`stdchecker.tse.check_tse`.
+
+    :param fetched: An async iterable (e.g. :func:`fetch_tse_async`) or an iterable of dicts containing the latest
+        revision data.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor.
+    :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
+    :return: An async generator that yields dicts containing comparison data.
+    """
+    return _check(check_tse, fetched, actual, id_from_actual)
@@ -1,76 +1,231 @@
 """Functions for fetching standard method data from the ASTM website and checking if actual standard methods are
 up to date.
 """
+import html as htmllib
 import logging
-import requests
+import re
+from functools import partial
 from collections.abc import Iterable
-from bs4 import BeautifulSoup
-from .constants import USER_AGENT
+from .catalog import as_catalog
+from .parsers import make_soup
+from .pool import session_scope, map_queries, map_parsed
+from .transport import request
+from .record import StdRecord
+from .normalize import normalize_astm_rev
+from .metrics import count, timed, timed_items
 
 ASTM_URL = "https://www.astm.org/Standards/{0}.htm"
+# Opening tags of the designation and the title elements. A class attribute with more than one class matches too.
+ASTM_SKU_PATTERN = re.compile(r"""<b\s[^>]*?class=["'][^"']*(?<![\w-])sku(?![\w-])[^>]*>""")
+ASTM_NAME_PATTERN = re.compile(r"""<b\s[^>]*?class=["'][^"']*(?<![\w-])name(?![\w-])[^>]*>""")
+ASTM_STREAM_CHUNK_SIZE = 8192
+_TEXT_PATTERN = re.compile(r"([^<]*)</b>")
+_SKU_BYTES_PATTERN = re.compile(ASTM_SKU_PATTERN.pattern.encode("ascii"))
+_NAME_BYTES_PATTERN = re.compile(ASTM_NAME_PATTERN.pattern.encode("ascii"))
 log = logging.getLogger(__name__)
 # log.addHandler(logging.NullHandler()) is not necessary since parent's handler is already NullHandler.
 
 
-def fetch_astm(query_list):
+def astm_url(query_item) -> str:
+    """
+    Returns the URL of the product page of a standard method on the ASTM website.
+
+    :param query_item: Designation or number of the standard method.
+    :return: URL string.
+    """
+    query_upper = str(query_item).upper()
+    if query_upper.startswith("ASTM "):
+        query_upper = query_upper.replace("ASTM ", "")
+    return ASTM_URL.format(query_upper)
+
+
+def _astm_text(pattern, html):
+    """
+    Returns the match of the plain text content of the first element whose opening tag matches the pattern, or None if
+    there is no such element or it holds markup.
+    """
+    tag = pattern.search(html)
+    return _TEXT_PATTERN.match(html, tag.end()) if tag else None
+
+
+@timed("parse", "astm")
+def parse_astm(query_item, html, url) -> list:
+    """
+    Extracts standard method data from an ASTM product page.
+
+    :param query_item: Designation or number of the standard method which is searched.
+    :param html: HTML content of the product page.
+    :param url: URL of the product page.
+    :return: A list containing a single dict of the standard method data.
+    """
+    query_item = str(query_item)
+    # The elements usually hold plain text, which is found without building an HTML tree. Only the first element of
+    # each class is used, as the tree search does. If it holds markup, the tree is built.
+    sku_match = _astm_text(ASTM_SKU_PATTERN, html)
+    name_match = _astm_text(ASTM_NAME_PATTERN, html) if sku_match else None
+    try:
+        if name_match:
+            std_name = htmllib.unescape(sku_match.group(1)).replace('\xa0', ' ')
+            std_desc = htmllib.unescape(name_match.group(1)).strip()
+        else:
+            soup = make_soup(html, only="b")
+            std_name = soup.find("b", {'class': "sku"}).string.replace('\xa0', ' ')
+            std_desc = soup.find("b", {'class': "name"}).text.strip()
+        std_name_split = std_name.split("-")
+        std_number = std_name_split[0]
+        std_rev = std_name_split[1]
+    except (AttributeError, IndexError):
+        log.exception("An exception has occurred while parsing HTML data. ASTM page content may have changed.")
+        count("parse_error", "astm")
+        return [{'query': query_item, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "astm", 'url': None}]
+    return [{'query': query_item, 'error': None, 'no': std_number, 'rev': std_rev, 'desc': std_desc, 'body': "astm",
+             'url': url}]
+
+
+def read_astm_stream(response, chunk_size=ASTM_STREAM_CHUNK_SIZE) -> str:
+    """
+    Reads a streamed ASTM product page in chunks until the designation and the title elements are read, then closes
+    the connection without downloading the rest of the page.
+
+    :param response: A :class:`requests.Response` object of a request sent with ``stream=True``.
+    :param chunk_size: Number of bytes read at a time.
+    :return: The page up to the end of the title element, or the whole page if the elements are not found.
+    """
+    encoding = response.encoding or "utf-8"
+    content = bytearray()
+    # Ends of the opening tags and of the first designation and title elements.
+    tags = [None, None]
+    ends = [None, None]
+    end = None
+    try:
+        for chunk in response.iter_content(chunk_size):
+            # Tags may be split between chunks, so the search starts a little before the new chunk.
+            start = max(0, len(content) - 512)
+            content += chunk
+            for i, pattern in enumerate((_SKU_BYTES_PATTERN, _NAME_BYTES_PATTERN)):
+                if tags[i] is None:
+                    tag = pattern.search(content, start)
+                    tags[i] = tag.end() if tag else None
+                if tags[i] is not None and ends[i] is None:
+                    close = content.find(b"</b>", tags[i])
+                    ends[i] = close + 4 if close >= 0 else None
+            if None not in ends:
+                end = max(ends)
+                break
+    finally:
+        response.close()
+    count("bytes", "astm", len(content))
+    if end is not None:
+        log.debug(f"Read {len(content)} bytes of the ASTM page {response.url}.")
+        return bytes(content[:end]).decode(encoding, errors="replace")
+    return bytes(content).decode(encoding, errors="replace")
+
+
+def download_astm(query_item, session, cache=None, stream=False):
+    """
+    Gets the product page of a standard method from the ASTM website without parsing it.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :param stream: If True, the page is read in chunks and the connection is closed once the designation and the title
+        are read (see :func:`read_astm_stream`). Ignored if 'cache' is given, since whole pages are cached.
+    :return: A (query, HTML, URL) tuple of the arguments of :func:`parse_astm`, or a list containing a single error
+        dict if the request failed.
+    """
+    import requests
+    query_item = str(query_item)
+    url = astm_url(query_item)
+    stream = stream and cache is None
+    try:
+        if stream:
+            response = request(session, "GET", url, body="astm", key=query_item, timeout=10, stream=True)
+            return query_item, read_astm_stream(response), url
+        response = request(session, "GET", url, body="astm", key=query_item, cache=cache, timeout=10)
+    except requests.HTTPError:
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Not found", 'no': None, 'rev': None, 'desc': None, 'body': "astm",
+                 'url': None}]
+    except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError):
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "astm", 'url': None}]
+    return query_item, response.text, url
+
+
+def search_astm(query_item, session, cache=None, stream=False) -> list:
+    """
+    Gets the product page of a standard method from the ASTM website.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :param stream: If True, only the beginning of the page is downloaded (see :func:`download_astm`).
+    :return: A list containing a single dict of the standard method data.
+    """
+    downloaded = download_astm(query_item, session, cache=cache, stream=stream)
+    if isinstance(downloaded, list):
+        return downloaded
+    return parse_astm(*downloaded)
+
+
+def fetch_astm(query_list, max_workers=None, ordered=True, cache=None, compact=False, parse_workers=None,
+               parse_chunksize=None, session=None, stream=False):
     """
     Fetches data of the latest revision of standard methods from the ASTM website.
 
     :param query_list: A string or an iterable object contains query strings. A query string should be designation
         (or number) of a standard method.
+    :param max_workers: Number of threads sending requests concurrently. If None, queries are sent one at a time.
+    :param ordered: If True, results are yielded in the order of 'query_list', otherwise as soon as they are ready.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :param compact: If True, :class:`StdRecord <stdchecker.record.StdRecord>` objects are yielded instead of dicts.
+    :param parse_workers: Number of processes parsing the downloaded pages. If given, pages are downloaded by the
+        threads and parsed on a process pool (see :func:`stdchecker.pool.map_parsed`).
+    :param parse_chunksize: Number of pages sent to a parsing process at a time.
+    :param session: A :ref:`Session <requests.Session>` object owned by the caller, which is reused and not closed.
+        If None, the session set with :func:`stdchecker.pool.set_shared_session` is used, or a session is created for
+        the call.
+    :param stream: If True, pages are read in chunks and each connection is closed as soon as the designation and the
+        title are read, instead of downloading whole pages. Ignored if 'cache' is given. A closed connection cannot be
+        reused, so this pays off only when the rest of a page takes longer to transfer than a new connection to open.
     :return: A generator that yields dicts containing data of the latest standard method(s).
     """
     if isinstance(query_list, str):
         query_list = (query_list,)
     if not isinstance(query_list, Iterable):
         raise TypeError(f"Argument must be a string or an iterable object, {query_list.__class__.__name__} given.")
-    with requests.Session() as session:
-        session.headers.update({'User-Agent': USER_AGENT})
-        for query in query_list:
-            query = str(query)
-            query_upper = query.upper()
-            if query_upper.startswith("ASTM "):
-                query_upper = query_upper.replace("ASTM ", "")
-            url = ASTM_URL.format(query_upper)
-            try:
-                response = session.get(url, timeout=10)
-                response.raise_for_status()
-            except requests.HTTPError:
-                log.exception("Request exception has occurred.")
-                yield {'query': query, 'error': "Not found", 'no': None, 'rev': None, 'desc': None, 'body': "astm",
-                       'url': None}
-                continue
-            except requests.ConnectionError:
-                log.exception("Request exception has occurred.")
-                yield {'query': query, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
-                       'body': "astm", 'url': None}
-                continue
-            html = response.text
-            soup = BeautifulSoup(html, "html.parser")
-            try:
-                std_name = soup.find("b", {'class': "sku"}).string.replace('\xa0', ' ')
-                std_desc = soup.find("b", {'class': "name"}).text.strip()
-                std_name_split = std_name.split("-")
-                std_number = std_name_split[0]
-                std_rev = std_name_split[1]
-            except (AttributeError, IndexError):
-                log.exception("An exception has occurred while parsing HTML data. ASTM page content may have changed.")
-                yield {'query': query, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None,
-                       'body': "astm", 'url': None}
-                continue
-            yield {'query': query, 'error': None, 'no': std_number, 'rev': std_rev, 'desc': std_desc, 'body': "astm",
-                   'url': url}
+    with session_scope(session, max_workers) as session:
+        if parse_workers:
+            download = partial(download_astm, cache=cache, stream=stream)
+            found_lists = map_parsed(download, parse_astm, query_list, session, max_workers=max_workers,
+                                     parse_workers=parse_workers, chunksize=parse_chunksize, ordered=ordered,
+                                     body="astm")
+        else:
+            search = partial(search_astm, cache=cache, stream=stream)
+            found_lists = map_queries(search, query_list, session, max_workers=max_workers, ordered=ordered)
+        for found_list in found_lists:
+            for found_item in found_list:
+                yield StdRecord.from_dict(found_item) if compact else found_item
     return
 
 
+@timed_items("check", "astm")
 def check_astm(fetched: Iterable, actual: list, id_from_actual=False):
     """
     Checks the revision status of actual standard methods.
 
     :param fetched: An iterable of dicts containing the latest revision data. Dict should include at least 'no' and
         'rev' keys for comparison and an 'error' key to indicate the status of fetching.
-    :param actual: A list of dicts containing the actual revision data. Dict should include at least 'no' and 'rev' keys
-        for comparison.
+        :class:`StdRecord <stdchecker.record.StdRecord>` objects are updated in place and yielded instead of copied.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor. Dict should include
+        at least 'no' and 'rev' keys for comparison.
     :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
     :return: A generator that yields dicts containing comparison data. The dict includes all items and keys from
         the fetched dict, 'rev' key from the actual dict as 'actual' and 'check' key which is the comparison result
@@ -78,42 +233,27 @@ def check_astm(fetched: Iterable, actual: list, id_from_actual=False):
     """
     if not isinstance(fetched, Iterable):
         raise TypeError("'fetched' argument must be an iterable of dicts.")
-    if not isinstance(actual, (list, tuple)):
-        raise TypeError("'actual' argument must be a list or a tuple of dicts.")
+    actual = as_catalog(actual)
     for fetched_item in fetched:
-        checked_item = dict(fetched_item)
-        if fetched_item["error"] is None:
-            fetched_no = fetched_item['no']
-            actual_item = next((i for i in actual if i['no'] == fetched_no), None)
-            if actual_item:
-                fetched_rev = fetched_item['rev']
-                actual_rev = actual_item['rev']
-                if "(" in fetched_rev and ")" in fetched_rev:
-                    fetched_rev = fetched_rev[0:fetched_rev.rfind("(")]
-                if "(" in actual_rev and ")" in actual_rev:
-                    actual_rev2 = actual_rev[0:actual_rev.rfind("(")]
-                else:
-                    actual_rev2 = actual_rev
-                if fetched_rev == actual_rev2:
-                    checked_item['check'] = True
-                else:
-                    checked_item['check'] = False
-                checked_item['actual'] = actual_rev
-                if id_from_actual:
-                    checked_item['id'] = actual_item.get("id")
-                yield checked_item
+        # Records are updated in place, dicts are copied.
+        checked_item = fetched_item if isinstance(fetched_item, StdRecord) else dict(fetched_item)
+        actual_item = None
+        if fetched_item['error'] is None:
+            actual_item, actual_rev_key = actual.lookup(fetched_item['no'], normalize_astm_rev)
+        if actual_item is not None:
+            if normalize_astm_rev(fetched_item['rev']) == actual_rev_key:
+                checked_item['check'] = True
             else:
-                checked_item['actual'] = "Yok"
                 checked_item['check'] = False
-                if id_from_actual:
-                    checked_item['id'] = None
-                yield checked_item
+            checked_item['actual'] = actual_item['rev']
+            if id_from_actual:
+                checked_item['id'] = actual_item.get("id")
         else:
             checked_item['actual'] = "Yok"
             checked_item['check'] = False
             if id_from_actual:
                 checked_item['id'] = None
-            yield checked_item
+        yield checked_item
     return
 
 
@@ -123,8 +263,10 @@ def check_astm_as_list(fetched: Iterable, actual: list, id_from_actual=False) ->
 
     :param fetched: An iterable of dicts containing the latest revision data. Dict should include at least 'no' and
         'rev' keys for comparison and an 'error' key to indicate the status of fetching.
-    :param actual: A list of dicts containing the actual revision data. Dict should include at least 'no' and 'rev' keys
-        for comparison.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor. Dict should include
+        at least 'no' and 'rev' keys for comparison.
     :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
     :return: A list of dicts containing comparison data. The dict includes all items and keys from
         the fetched dict, 'rev' key from the actual dict as 'actual' and 'check' key which is the comparison result
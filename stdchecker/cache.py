@@ -0,0 +1,160 @@
+"""Persistent on-disk cache of the responses of standard bodies' websites."""
+import logging
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+DAY = 24 * 60 * 60
+DEFAULT_TTL = {
+    'astm': 7 * DAY,
+    'iec': 7 * DAY,
+    'ieee': 7 * DAY,
+    'tse': 7 * DAY,
+}
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+CacheEntry = namedtuple("CacheEntry", ["text", "etag", "last_modified", "stored_at"])
+
+
+def normalize_key(query_item) -> str:
+    """
+    Returns the cache key of a query. Queries which differ only in letter case or whitespace share the same key.
+    """
+    return " ".join(str(query_item).upper().split())
+
+
+class ResponseCache:
+    """
+    Stores response texts in an SQLite database, keyed by standard body and normalized query.
+
+    An entry is fresh for the time-to-live of its standard body. A stale entry is still used if the server answers a
+    conditional request (``If-None-Match`` / ``If-Modified-Since``) with 304 Not Modified. When the total size of the
+    stored texts exceeds 'max_size', the least recently used entries are evicted.
+
+    The cache can be shared by threads and used as a context manager.
+    """
+
+    def __init__(self, path, ttl=None, max_size=DEFAULT_MAX_SIZE):
+        """
+        :param path: Path of the SQLite database file. It is created if it does not exist. ':memory:' can be used
+            for a non-persistent cache.
+        :param ttl: Time-to-live in seconds. Either a number used for all standard bodies or a dict of standard body
+            names ('astm', 'iec', 'ieee', 'tse') and numbers which overrides :data:`DEFAULT_TTL`.
+        :param max_size: Maximum total size of the stored texts in bytes.
+        """
+        if isinstance(ttl, dict):
+            self.ttl = dict(DEFAULT_TTL, **ttl)
+        elif ttl is not None:
+            self.ttl = dict.fromkeys(DEFAULT_TTL, ttl)
+        else:
+            self.ttl = dict(DEFAULT_TTL)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "body TEXT NOT NULL, key TEXT NOT NULL, text TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL, "
+                "PRIMARY KEY (body, key))")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def get(self, body, key):
+        """
+        Returns the cache entry of a query, whether it is fresh or not.
+
+        :param body: Name of the standard body, e.g. 'astm'.
+        :param key: Query string. It is normalized with :func:`normalize_key`.
+        :return: A :class:`CacheEntry` or None if the query is not cached.
+        """
+        key = normalize_key(key)
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT text, etag, last_modified, stored_at FROM responses WHERE body = ? AND key = ?",
+                (body, key)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE body = ? AND key = ?",
+                                     (time.time(), body, key))
+        return CacheEntry(*row)
+
+    def is_fresh(self, body, entry) -> bool:
+        """
+        Checks if a cache entry is younger than the time-to-live of its standard body.
+        """
+        return time.time() - entry.stored_at < self.ttl.get(body, 0)
+
+    def set(self, body, key, text, etag=None, last_modified=None):
+        """
+        Stores the response text of a query and evicts least recently used entries if the cache is full.
+
+        :param body: Name of the standard body, e.g. 'astm'.
+        :param key: Query string. It is normalized with :func:`normalize_key`.
+        :param text: Response text.
+        :param etag: Value of the 'ETag' response header.
+        :param last_modified: Value of the 'Last-Modified' response header.
+        """
+        key = normalize_key(key)
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (body, key, text, etag, last_modified, now, now, size))
+            self._evict()
+
+    def touch(self, body, key):
+        """
+        Marks a cache entry as fresh again, e.g. after the server responds with 304 Not Modified.
+        """
+        key = normalize_key(key)
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE body = ? AND key = ?",
+                                     (now, now, body, key))
+
+    def clear(self, body=None):
+        """
+        Deletes all entries or the entries of a standard body.
+        """
+        with self._lock, self._connection:
+            if body is None:
+                self._connection.execute("DELETE FROM responses")
+            else:
+                self._connection.execute("DELETE FROM responses WHERE body = ?", (body,))
+
+    def size(self) -> int:
+        """
+        Returns the total size of the stored texts in bytes.
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = self._connection.execute("SELECT rowid, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = list()
+        for rowid, size in rows:
+            if total <= self.max_size:
+                break
+            evicted.append((rowid,))
+            total -= size
+        self._connection.executemany("DELETE FROM responses WHERE rowid = ?", evicted)
+        log.debug(f"Evicted {len(evicted)} cache entries.")
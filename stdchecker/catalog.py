@@ -0,0 +1,203 @@
+"""Index of actual standard methods used by the check functions."""
+from collections.abc import Iterable
+from .normalize import get_normalizer
+from .record import ActualRecord
+from .sources import iter_source
+
+
+def _actual_rev(item):
+    """
+    Returns the revision of an actual item read from a source.
+
+    :raises ValueError: If the revision is missing. Sources drop blank CSV cells, and SQL NULLs are read as None.
+    """
+    rev = item.get("rev")
+    if rev is None:
+        raise ValueError(f"Revision of actual standard method '{item['no']}' is missing.")
+    return rev
+
+
+class ActualCatalog:
+    """
+    Indexes actual standard methods by their 'no' key, so that each lookup of the check functions takes constant time
+    instead of scanning the whole list. If more than one item has the same 'no', the first one is used, as the
+    check functions did with a list.
+
+    Normalized revisions are computed at most once per item and normalizer, and stored next to the item. A catalog can
+    be built once and passed to the check functions of every standard body in place of the 'actual' list.
+    """
+
+    def __init__(self, actual: Iterable, compact=False):
+        """
+        :param actual: An iterable of dicts containing the actual revision data. Dict should include at least 'no' and
+            'rev' keys. It is consumed once.
+        :param compact: If True, only 'no', 'rev' and 'id' keys of each item are kept in an
+            :class:`ActualRecord <stdchecker.record.ActualRecord>` instead of the whole dict.
+        :raises ValueError: If 'compact' is True and the revision of an item is missing (e.g. a blank CSV cell).
+        """
+        if not isinstance(actual, Iterable):
+            raise TypeError("'actual' argument must be an iterable of dicts.")
+        self._index = index = dict()
+        self._normalized = dict()
+        if compact:
+            for item in actual:
+                no = item['no']
+                if no not in index:
+                    index[no] = ActualRecord(no, _actual_rev(item), item.get("id"))
+        else:
+            for item in actual:
+                index.setdefault(item['no'], item)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, no):
+        return no in self._index
+
+    def __iter__(self):
+        return iter(self._index.values())
+
+    def get(self, no):
+        """
+        Returns the actual item with the given number.
+
+        :param no: Number of the standard method, e.g. 'ASTM D92'.
+        :return: The actual dict or None if not found.
+        """
+        return self._index.get(no)
+
+    def normalize_all(self, normalize):
+        """
+        Computes the normalized revisions of all items in one batch, so that lookups do not normalize them one by one.
+        Items whose revisions cannot be normalized (e.g. a blank TSE revision) are left to :meth:`lookup`, so the error
+        is raised only if such an item is checked.
+
+        :param normalize: Name of a standard body (e.g. 'tse') or a callable which takes a revision string and returns
+            a comparable key.
+        :return: The catalog itself.
+        """
+        if not callable(normalize):
+            normalize = get_normalizer(normalize)
+        if normalize is None:
+            return self
+        normalized = self._normalized.setdefault(normalize, dict())
+        for no, item in self._index.items():
+            if no not in normalized:
+                try:
+                    normalized[no] = normalize(item['rev'])
+                except (KeyError, TypeError, ValueError, IndexError):
+                    continue
+        return self
+
+    def lookup(self, no, normalize=None) -> tuple:
+        """
+        Returns the actual item with the given number and its normalized revision.
+
+        :param no: Number of the standard method, e.g. 'ASTM D92'.
+        :param normalize: A callable which takes a revision string and returns a comparable key. If None, the revision
+            string is returned as is.
+        :return: A tuple of the actual dict and the normalized revision, or (None, None) if not found.
+        """
+        item = self._index.get(no)
+        if item is None:
+            return None, None
+        if normalize is None:
+            return item, item['rev']
+        normalized = self._normalized.get(normalize)
+        if normalized is None:
+            normalized = self._normalized[normalize] = dict()
+        try:
+            return item, normalized[no]
+        except KeyError:
+            rev = normalized[no] = normalize(item['rev'])
+            return item, rev
+
+
+class SortedActual:
+    """
+    Merge-joins actual standard methods sorted by their 'no' key with fetched items looked up in the same order, so
+    only the current actual item is kept in memory. If more than one item has the same 'no', the first one is used.
+
+    It can be passed to a check function in place of the 'actual' list when the fetched items are sorted by 'no' as
+    well, e.g. fetched with ``ordered=True`` from a sorted query list, with fetching errors anywhere. Items out of
+    order are detected when the merge passes over them.
+    """
+
+    def __init__(self, actual):
+        """
+        :param actual: A source of dicts sorted by 'no', accepted by :func:`stdchecker.sources.iter_source`: an
+            iterable of dicts, a CSV or NDJSON file path or an executed DB-API cursor.
+        """
+        self._actual = iter_source(actual)
+        self._item = None
+        self._last = None
+        self._advance()
+
+    def _advance(self):
+        previous = self._item
+        for item in self._actual:
+            if previous is not None and item['no'] == previous.no:
+                continue
+            if previous is not None and item['no'] < previous.no:
+                raise ValueError(f"Actual standard methods are not sorted by 'no': '{item['no']}' after "
+                                 f"'{previous.no}'.")
+            self._item = ActualRecord(item['no'], _actual_rev(item), item.get("id"))
+            return
+        self._item = None
+
+    def get(self, no):
+        """
+        Returns the actual item with the given number. Numbers must be given in ascending order.
+
+        :param no: Number of the standard method, e.g. 'ASTM D92'. None (the number of a failed query) is not found and
+            does not move the merge.
+        :return: An :class:`ActualRecord <stdchecker.record.ActualRecord>` or None if not found.
+        :raises ValueError: If numbers are not given in ascending order, the actual items are not sorted or the revision
+            of an actual item is missing.
+        """
+        if no is None:
+            return None
+        if self._last is not None and no < self._last:
+            raise ValueError(f"Fetched standard methods are not sorted by 'no': '{no}' after '{self._last}'.")
+        self._last = no
+        while self._item is not None and self._item.no < no:
+            self._advance()
+        if self._item is not None and self._item.no == no:
+            return self._item
+        return None
+
+    def lookup(self, no, normalize=None) -> tuple:
+        """
+        Returns the actual item with the given number and its normalized revision. Numbers must be given in ascending
+        order.
+
+        :param no: Number of the standard method, e.g. 'ASTM D92'.
+        :param normalize: A callable which takes a revision string and returns a comparable key. If None, the revision
+            string is returned as is.
+        :return: A tuple of the actual item and the normalized revision, or (None, None) if not found.
+        """
+        item = self.get(no)
+        if item is None:
+            return None, None
+        return item, item.rev if normalize is None else normalize(item.rev)
+
+
+def as_catalog(actual):
+    """
+    Returns 'actual' as an :class:`ActualCatalog`. Catalogs and :class:`SortedActual` objects are returned as they are.
+    A list or a tuple of dicts is indexed as it is. Other sources are consumed once into a compact catalog which keeps
+    only 'no', 'rev' and 'id' keys of each item.
+
+    :param actual: A list, a tuple or another iterable of dicts, a CSV or NDJSON file path or an executed DB-API
+        cursor.
+    """
+    if isinstance(actual, (ActualCatalog, SortedActual)):
+        return actual
+    if isinstance(actual, (list, tuple)):
+        return ActualCatalog(actual)
+    try:
+        source = iter_source(actual)
+    except TypeError:
+        raise TypeError("'actual' argument must be an iterable of dicts, a CSV or NDJSON file path, a DB-API cursor "
+                        "or an ActualCatalog.") from None
+    return ActualCatalog(source, compact=True)
@@ -0,0 +1,156 @@
+"""Command-line tool which checks an inventory file and streams the results to stdout.
+
+    stdchecker inventory.csv > results.ndjson
+    stdchecker inventory.ndjson --format csv --max-workers 8 --cache cache.db
+    cat inventory.csv | stdchecker - --input-format csv
+
+Inventory rows should include 'body', 'no' and 'rev', and may include 'query' and 'id' (see
+:func:`stdchecker.check_all`). Results are written as they complete, one JSON object or CSV row per checked standard
+method.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from . import __version__
+from .sources import FORMATS, input_format, read_rows
+
+OUTPUT_FORMATS = ("ndjson", "csv")
+CSV_FIELDS = ("body", "query", "no", "rev", "actual", "check", "id", "error", "desc", "url")
+FLUSH_INTERVAL = 1.0
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+
+class _Writer:
+    """
+    Writes result dicts to a text stream and flushes it at most every :data:`FLUSH_INTERVAL` seconds, so piped output
+    reaches the next tool soon without flushing each row.
+    """
+
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self._last_flush = time.monotonic()
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore", lineterminator="\n")
+            self._csv.writeheader()
+
+    def write(self, item):
+        if self._csv is not None:
+            self._csv.writerow(item)
+        else:
+            self.stream.write(json.dumps(item, ensure_ascii=False, default=str))
+            self.stream.write("\n")
+        now = time.monotonic()
+        if now - self._last_flush >= FLUSH_INTERVAL:
+            self.stream.flush()
+            self._last_flush = now
+
+    def close(self):
+        self.stream.flush()
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="stdchecker", description="Check the latest revisions of the standard methods in an inventory file.")
+    parser.add_argument("inventory", help="CSV or NDJSON inventory file, or '-' for stdin.")
+    parser.add_argument("--input-format", choices=FORMATS,
+                        help="Format of the inventory. Default: from the file extension.")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="ndjson", help="Output format. Default: ndjson.")
+    parser.add_argument("--max-workers", type=int, default=4,
+                        help="Number of concurrent requests per standard body. Default: 4.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Send a single search for all parts of a multi-part standard (IEC, IEEE and TSE).")
+    parser.add_argument("--parse-workers", type=int,
+                        help="Parse the downloaded pages on a pool of this many processes.")
+    parser.add_argument("--parse-chunksize", type=int, help="Number of pages sent to a parsing process at a time.")
+    parser.add_argument("--cache", metavar="PATH", help="SQLite file of a response cache.")
+    parser.add_argument("--state", metavar="PATH",
+                        help="SQLite file of a state store. Only stale or failed queries are fetched again.")
+    parser.add_argument("--index", metavar="PATH",
+                        help="SQLite file of a local catalog index. Standard methods are looked up in it offline.")
+    parser.add_argument("--with-id", action="store_true", help="Include the 'id' of inventory rows in the results.")
+    parser.add_argument("--html-parser", help="BeautifulSoup parser backend, e.g. 'lxml'.")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="Log to stderr. Repeat for debug logs.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    return parser
+
+
+def main(argv=None, stdin=None, stdout=None) -> int:
+    """
+    Runs the command-line tool and returns its exit status: 0 if all standard methods were fetched, 1 if fetching
+    some of them ended with an error and 2 if the inventory could not be read.
+    """
+    args = make_parser().parse_args(argv)
+    stdin = sys.stdin if stdin is None else stdin
+    stdout = sys.stdout if stdout is None else stdout
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG if args.verbose > 1 else logging.INFO, stream=sys.stderr,
+                            format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    from .orchestrator import check_all, route_inventory
+    kwargs = dict()
+    if args.batch:
+        kwargs['batch'] = True
+    if args.parse_workers:
+        kwargs['parse_workers'] = args.parse_workers
+        kwargs['parse_chunksize'] = args.parse_chunksize
+    if args.html_parser:
+        from .parsers import set_html_parser
+        set_html_parser(args.html_parser)
+    cache = state = index = None
+    if args.cache:
+        from .cache import ResponseCache
+        cache = kwargs['cache'] = ResponseCache(args.cache)
+    if args.state:
+        from .state import StateStore
+        state = StateStore(args.state)
+    if args.index:
+        from .offline import LocalIndex
+        index = LocalIndex(args.index)
+
+    errors = 0
+    f = stdin if args.inventory == "-" else None
+    try:
+        try:
+            fmt = args.input_format or input_format(args.inventory)
+            if f is None:
+                f = open(args.inventory, "r", encoding="utf-8-sig", newline="")
+            inventory = list(read_rows(f, fmt))
+            # Rows are routed before fetching, so that missing columns and unknown standard bodies are input errors.
+            route_inventory(inventory)
+        except (OSError, ValueError, KeyError) as e:
+            message = f"missing column {e}" if isinstance(e, KeyError) else e
+            print(f"stdchecker: error: {message}", file=sys.stderr)
+            return 2
+        finally:
+            if f is not None and f is not stdin:
+                f.close()
+        writer = _Writer(stdout, args.format)
+        try:
+            for checked_item in check_all(inventory, id_from_actual=args.with_id, max_workers=args.max_workers,
+                                          state=state, index=index, **kwargs):
+                if checked_item['error'] is not None:
+                    errors += 1
+                writer.write(checked_item)
+        finally:
+            writer.close()
+    except BrokenPipeError:
+        # The reader of the output (e.g. head) exited. Output is discarded, so that flushing at exit does not fail.
+        if stdout is sys.stdout:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if cache is not None:
+            cache.close()
+        if state is not None:
+            state.close()
+        if index is not None:
+            index.close()
+    if errors:
+        log.warning(f"Fetching {errors} standard methods ended with an error.")
+    return 1 if errors else 0
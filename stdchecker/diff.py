@@ -0,0 +1,110 @@
+"""Change feed of the latest revisions between runs.
+
+A snapshot is a dict of keys identifying a standard method (standard body, query and number) and its latest revision.
+It is stored as gzip-compressed JSON. Diffing streams the results of a check function against the previous snapshot
+and yields only the standard methods that were added, removed or whose latest revision changed.
+"""
+import gzip
+import json
+import logging
+import os
+from collections.abc import Iterable
+
+SEPARATOR = "\x1f"
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+
+def snapshot_key(item) -> str:
+    """
+    Returns the snapshot key of a fetched or checked dict.
+    """
+    return f"{item['body']}{SEPARATOR}{item['query']}{SEPARATOR}{item['no']}"
+
+
+def make_snapshot(checked: Iterable) -> dict:
+    """
+    Returns the snapshot of fetched or checked dicts. Dicts with an error are left out.
+    """
+    return {snapshot_key(i): i['rev'] for i in checked if i['error'] is None}
+
+
+def load_snapshot(path) -> dict:
+    """
+    Loads a snapshot saved with :func:`save_snapshot`. Returns an empty snapshot if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return dict()
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_snapshot(snapshot, path):
+    """
+    Saves a snapshot as gzip-compressed JSON. The file is replaced atomically.
+    """
+    temp_path = f"{path}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def diff_checked(checked: Iterable, previous: dict, snapshot=None):
+    """
+    Compares fetched or checked dicts with a previous snapshot.
+
+    If fetching a query ended with an error, the standard methods of that query in the previous snapshot are neither
+    reported as removed nor dropped from the new snapshot.
+
+    :param checked: An iterable of dicts yielded by a fetch or check function, or by :func:`stdchecker.check_all`.
+    :param previous: The previous snapshot, e.g. from :func:`load_snapshot`.
+    :param snapshot: If a dict is given, it is filled with the new snapshot.
+    :return: A generator that yields dicts with 'change' ('added', 'changed' or 'removed'), 'body', 'query', 'no',
+        'old_rev' and 'new_rev' keys. Added and changed dicts also include all items of the checked dict. Removed
+        dicts are yielded after the checked dicts are exhausted.
+    """
+    if not isinstance(checked, Iterable):
+        raise TypeError("'checked' argument must be an iterable of dicts.")
+    if snapshot is None:
+        snapshot = dict()
+    failed = set()
+    for item in checked:
+        if item['error'] is not None:
+            failed.add(f"{item['body']}{SEPARATOR}{item['query']}{SEPARATOR}")
+            continue
+        key = snapshot_key(item)
+        rev = item['rev']
+        snapshot[key] = rev
+        old_rev = previous.get(key)
+        if old_rev is None and key not in previous:
+            yield dict(item, change="added", old_rev=None, new_rev=rev)
+        elif old_rev != rev:
+            yield dict(item, change="changed", old_rev=old_rev, new_rev=rev)
+    for key, old_rev in previous.items():
+        if key in snapshot:
+            continue
+        body, query, no = key.split(SEPARATOR, 2)
+        if f"{body}{SEPARATOR}{query}{SEPARATOR}" in failed:
+            snapshot[key] = old_rev
+            continue
+        yield {'change': "removed", 'body': body, 'query': query, 'no': None if no == "None" else no,
+               'old_rev': old_rev, 'new_rev': None}
+
+
+def diff_with_snapshot(checked: Iterable, path):
+    """
+    Compares fetched or checked dicts with the snapshot stored in a file and replaces the file with the new snapshot
+    once all changes are yielded.
+
+    :param checked: An iterable of dicts yielded by a fetch or check function, or by :func:`stdchecker.check_all`.
+    :param path: Path of the snapshot file. It is created if it does not exist.
+    :return: A generator that yields the same dicts as :func:`diff_checked`.
+    """
+    previous = load_snapshot(path)
+    snapshot = dict()
+    changes = 0
+    for change in diff_checked(checked, previous, snapshot=snapshot):
+        changes += 1
+        yield change
+    save_snapshot(snapshot, path)
+    log.info(f"{changes} changes in {len(snapshot)} standard methods.")
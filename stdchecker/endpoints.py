@@ -0,0 +1,55 @@
+"""Overriding the websites of the standard bodies, e.g. with a local stand-in server for testing and load tests."""
+import importlib
+import logging
+import threading
+from urllib.parse import urlsplit
+
+URL_CONSTANTS = {
+    'astm': ("stdchecker.astm", ("ASTM_URL",)),
+    'iec': ("stdchecker.iec", ("IEC_BASE_URL", "IEC_SEARCH_URL", "IEC_SEARCH_PAGE_URL")),
+    'ieee': ("stdchecker.ieee", ("IEEE_SEARCH_URL",)),
+    'tse': ("stdchecker.tse", ("TSE_SEARCH_URL",)),
+}
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+_defaults = dict()
+_lock = threading.Lock()
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def set_base_url(body, base_url=None):
+    """
+    Replaces the scheme and host of the URL constants of a standard body (e.g. ``ASTM_URL``) with a base URL. Paths
+    are kept, so the server at the base URL should serve the same endpoints as the website.
+
+    :param body: Name of the standard body ('astm', 'iec', 'ieee' or 'tse').
+    :param base_url: Scheme and host, e.g. 'http://127.0.0.1:8000'. If None, the original URLs are restored.
+    :raises ValueError: If an unknown standard body is given.
+    """
+    if body not in URL_CONSTANTS:
+        raise ValueError(f"Unknown standard body '{body}'.")
+    module_name, names = URL_CONSTANTS[body]
+    module = importlib.import_module(module_name)
+    with _lock:
+        for name in names:
+            default = _defaults.setdefault((body, name), getattr(module, name))
+            if base_url is None:
+                setattr(module, name, default)
+            else:
+                setattr(module, name, base_url.rstrip("/") + default[len(_origin(default)):])
+    log.debug(f"Base URL of {body} is set to {base_url or 'default'}.")
+
+
+def get_base_url(body) -> str:
+    """
+    Returns the scheme and host of the website of a standard body currently in use.
+    """
+    if body not in URL_CONSTANTS:
+        raise ValueError(f"Unknown standard body '{body}'.")
+    module_name, names = URL_CONSTANTS[body]
+    return _origin(getattr(importlib.import_module(module_name), names[0]))
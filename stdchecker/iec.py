@@ -2,40 +2,49 @@
 up to date.
 """
 import logging
-import requests
+from functools import partial
 from collections.abc import Iterable
-from bs4 import BeautifulSoup
-from .constants import USER_AGENT
+from .catalog import as_catalog
+from .parsers import make_soup
+from .pool import session_scope, map_queries, map_parsed
+from .transport import request
+from .record import StdRecord
+from .normalize import normalize_iec_rev
+from .metrics import count, span, timed, timed_items
 
+IEC_BASE_URL = "https://webstore.iec.ch"
 IEC_SEARCH_URL = "https://webstore.iec.ch/searchkey&key={0}&start=1&MAX=50&FUZZY=0"
+IEC_SEARCH_PAGE_URL = "https://webstore.iec.ch/searchkey&key={0}&start={1}&MAX={2}&FUZZY=0"
+IEC_PAGE_SIZE = 50
+IEC_MAX_PAGES = 10
 log = logging.getLogger(__name__)
 # log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
 
 
-def search_iec(query_item, session) -> list:
+@timed("parse", "iec")
+def parse_iec(query_item, html) -> list:
     """
-    Gets query results from the IEC search engine.
+    Extracts standard method data from an IEC search results page.
 
-    :param query_item: Designation or number of the standard method to be searched.
-    :param session: A :ref:`Session <requests.Session>` object.
+    :param query_item: Designation or number of the standard method which is searched.
+    :param html: HTML content of the search results page.
     :return: A list of dicts containing search results.
     """
+    return _parse_iec_page(query_item, html)[0]
+
+
+def _parse_iec_page(query_item, html) -> tuple:
+    """
+    Extracts standard method data from an IEC search results page as :func:`parse_iec` does, and also returns the
+    number of result rows on the page, including the ones which do not contain the query.
+    """
     found_list = list()
     query_item = str(query_item)
-    url = IEC_SEARCH_URL.format(query_item)
-    try:
-        response = session.get(url, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException:
-        log.exception("Request exception has occurred.")
-        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
-                 'body': "iec", 'url': None}]
-    html = response.text
     if "No valid publication found." in html:
         log.warning(f"No results found for '{query_item}'.")
         return [{'query': query_item, 'error': "Not found", 'no': None, 'rev': None, 'desc': None,
-                 'body': "iec", 'url': None}]
-    soup = BeautifulSoup(html, "html.parser")
+                 'body': "iec", 'url': None}], 0
+    soup = make_soup(html, only="ul")
     try:
         search_result_items = soup.find("ul", {'class': "search-results"}).find_all("li", recursive=False)
         log.debug(f"Found {len(search_result_items)=}.")
@@ -54,7 +63,7 @@ def search_iec(query_item, session) -> list:
                     std_rev = ":".join(std_name_split[1:]).strip()
                     std_url = content.get("href")
                     if std_url:
-                        std_url = f"https://webstore.iec.ch{std_url}"
+                        std_url = f"{IEC_BASE_URL}{std_url}"
                     found = True
                 if content.name == "br" and found:
                     std_desc = item.contents[c + 1].strip()
@@ -63,49 +72,221 @@ def search_iec(query_item, session) -> list:
                          'body': "iec", 'url': std_url})
     except (AttributeError, IndexError):
         log.exception("An exception has occurred while parsing HTML data. IEC search page content may have changed.")
+        count("parse_error", "iec")
         return [
             {'query': query_item, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None, 'body': "iec",
-             'url': None}]
+             'url': None}], 0
+    return found_list, len(search_result_items)
+
+
+def download_iec(query_item, session, cache=None):
+    """
+    Gets the search results page of a query from the IEC search engine without parsing it.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A (query, HTML) tuple of the arguments of :func:`parse_iec`, or a list containing a single error dict if
+        the request failed.
+    """
+    import requests
+    query_item = str(query_item)
+    url = IEC_SEARCH_URL.format(query_item)
+    try:
+        response = request(session, "GET", url, body="iec", key=query_item, cache=cache, timeout=10)
+    except requests.RequestException:
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "iec", 'url': None}]
+    return query_item, response.text
+
+
+def search_iec(query_item, session, cache=None) -> list:
+    """
+    Gets query results from the IEC search engine.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A list of dicts containing search results.
+    """
+    downloaded = download_iec(query_item, session, cache=cache)
+    if isinstance(downloaded, list):
+        return downloaded
+    return parse_iec(*downloaded)
+
+
+def _exact_iec(query_item, found_list) -> list:
+    """
+    Excludes search results whose number does not match the query exactly.
+    """
+    query_upper = str(query_item).upper()
+    if not query_upper.startswith("IEC "):
+        query_upper = "IEC " + query_upper
+    return [i for i in found_list if i['error'] is not None or query_upper == i['no']]
+
+
+def _search_iec_exact(query_item, session, cache=None) -> list:
+    """
+    Gets query results from the IEC search engine, excluding the ones whose number does not match the query exactly.
+    """
+    return _exact_iec(query_item, search_iec(query_item, session, cache=cache))
+
+
+def _parse_iec_exact(query_item, html) -> list:
+    """
+    Extracts standard method data from an IEC search results page, excluding the ones whose number does not match the
+    query exactly.
+    """
+    return _exact_iec(query_item, parse_iec(query_item, html))
+
+
+def iec_base_number(query_item) -> str:
+    """
+    Returns the base number of a standard method without the 'IEC' prefix and the part number,
+    e.g. '60076' for 'IEC 60076-10-1'.
+    """
+    query_upper = str(query_item).upper()
+    if query_upper.startswith("IEC "):
+        query_upper = query_upper[4:]
+    return query_upper.split("-")[0].strip()
+
+
+def plan_iec_searches(query_list) -> list:
+    """
+    Groups queries sharing a base number, so that a single search is sent for all parts of a multi-part standard.
+
+    :param query_list: An iterable of query strings.
+    :return: A list of (search key, list of queries) tuples in the order of the first query of each group. The search
+        key of a group with a single query is the query itself.
+    """
+    groups = dict()
+    for query in query_list:
+        query = str(query)
+        groups.setdefault(iec_base_number(query), list()).append(query)
+    return [(base, queries) if len(queries) > 1 else (queries[0], queries) for base, queries in groups.items()]
+
+
+def _search_iec_each(queries, session, cache=None) -> list:
+    log.warning("IEC search results are incomplete. Queries are searched one by one.")
+    found_list = list()
+    for query in queries:
+        found_list.extend(_search_iec_exact(query, session, cache=cache))
+    return found_list
+
+
+def search_iec_group(group, session, cache=None) -> list:
+    """
+    Gets query results of a group of queries from the IEC search engine with a single search of their common search
+    key, paging through the results if necessary. Queries without an exact match in the results are searched one by
+    one. If a page after the first one fails or there are more than :data:`IEC_MAX_PAGES` pages, the results are
+    incomplete, so all queries of the group are searched one by one.
+
+    :param group: A (search key, list of queries) tuple returned by :func:`plan_iec_searches`.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A list of dicts containing search results whose numbers match the queries exactly.
+    """
+    import requests
+    search_key, queries = group
+    if len(queries) == 1:
+        return _search_iec_exact(queries[0], session, cache=cache)
+    results = list()
+    for page in range(IEC_MAX_PAGES):
+        start = page * IEC_PAGE_SIZE + 1
+        url = IEC_SEARCH_PAGE_URL.format(search_key, start, IEC_PAGE_SIZE)
+        try:
+            response = request(session, "GET", url, body="iec", key=f"{search_key}&start={start}", cache=cache,
+                               timeout=10)
+        except requests.RequestException:
+            log.exception("Request exception has occurred.")
+            if page == 0:
+                return [{'query': query, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                         'body': "iec", 'url': None} for query in queries]
+            return _search_iec_each(queries, session, cache)
+        with span("parse", "iec", search_key):
+            found_list, rows = _parse_iec_page(search_key, response.text)
+        if found_list and found_list[0]['error'] is not None:
+            if page == 0:
+                return [dict(found_list[0], query=query) for query in queries]
+            if found_list[0]['error'] != "Not found":
+                return _search_iec_each(queries, session, cache)
+            break
+        results.extend(found_list)
+        # Rows which do not contain the search key are not in 'found_list', but they fill the page.
+        if rows < IEC_PAGE_SIZE:
+            break
+    else:
+        # All IEC_MAX_PAGES pages are full, so there may be more results.
+        return _search_iec_each(queries, session, cache)
+    found_list = list()
+    for query in queries:
+        exact_list = _exact_iec(query, results)
+        if exact_list:
+            found_list.extend(dict(i, query=query) for i in exact_list)
+        else:
+            found_list.extend(_search_iec_exact(query, session, cache=cache))
     return found_list
 
 
-def fetch_iec(query_list):
+def fetch_iec(query_list, max_workers=None, ordered=True, cache=None, batch=False, compact=False, parse_workers=None,
+              parse_chunksize=None, session=None):
     """
     Fetches data of the latest revision of standard methods from the IEC search engine.
 
     :param query_list: A string or an iterable object contains query strings. A query string should be designation
         (or number) of a standard method.
+    :param max_workers: Number of threads sending requests concurrently. If None, queries are sent one at a time.
+    :param ordered: If True, results are yielded in the order of 'query_list', otherwise as soon as they are ready.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :param batch: If True, queries sharing a base number (e.g. '60076-1', '60076-2') are searched together with a
+        single search of the base number. Results are yielded group by group in the order of the first query of each
+        group.
+    :param compact: If True, :class:`StdRecord <stdchecker.record.StdRecord>` objects are yielded instead of dicts.
+    :param parse_workers: Number of processes parsing the downloaded pages. If given, pages are downloaded by the
+        threads and parsed on a process pool (see :func:`stdchecker.pool.map_parsed`). Ignored if 'batch' is True.
+    :param parse_chunksize: Number of pages sent to a parsing process at a time.
+    :param session: A :ref:`Session <requests.Session>` object owned by the caller, which is reused and not closed.
+        If None, the session set with :func:`stdchecker.pool.set_shared_session` is used, or a session is created for
+        the call.
     :return: A generator that yields dicts containing data of the latest standard method(s).
     """
     if isinstance(query_list, str):
         query_list = (query_list,)
     if not isinstance(query_list, Iterable):
         raise TypeError(f"Argument must be a string or an iterable object, {query_list.__class__.__name__} given.")
-    with requests.Session() as session:
-        session.headers.update({'User-Agent': USER_AGENT})
-        for query in query_list:
-            query = str(query)
-            query_upper = query.upper()
-            if not query_upper.startswith("IEC "):
-                query_upper = "IEC " + query_upper
-            found_list = search_iec(query, session)
+    if batch:
+        query_list = plan_iec_searches(query_list)
+    with session_scope(session, max_workers) as session:
+        if parse_workers and not batch:
+            found_lists = map_parsed(partial(download_iec, cache=cache), _parse_iec_exact, query_list, session,
+                                     max_workers=max_workers, parse_workers=parse_workers, chunksize=parse_chunksize,
+                                     ordered=ordered, body="iec")
+        else:
+            search = partial(search_iec_group if batch else _search_iec_exact, cache=cache)
+            found_lists = map_queries(search, query_list, session, max_workers=max_workers, ordered=ordered)
+        for found_list in found_lists:
             for found_item in found_list:
-                if found_item['error'] is None:
-                    if query_upper == found_item['no']:
-                        yield found_item
-                else:
-                    yield found_item
+                yield StdRecord.from_dict(found_item) if compact else found_item
     return
 
 
+@timed_items("check", "iec")
 def check_iec(fetched: Iterable, actual: list, id_from_actual=False):
     """
     Checks the revision status of actual standard methods.
 
     :param fetched: An iterable of dicts containing the latest revision data. Dict should include at least 'no' and
         'rev' keys for comparison and an 'error' key to indicate the status of the IEC search engine's result.
-    :param actual: A list of dicts containing actual revision data. Dict should include at least 'no' and 'rev' keys
-        for comparison.
+        :class:`StdRecord <stdchecker.record.StdRecord>` objects are updated in place and yielded instead of copied.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor. Dict should include
+        at least 'no' and 'rev' keys for comparison.
     :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
     :return: A generator that yields dicts containing comparison data. The dict includes all items and keys from
         the fetched dict, 'rev' key from the actual dict as 'actual' and 'check' key which is the comparison result
@@ -113,49 +294,27 @@ def check_iec(fetched: Iterable, actual: list, id_from_actual=False):
     """
     if not isinstance(fetched, Iterable):
         raise TypeError("'fetched' argument must be an iterable of dicts.")
-    if not isinstance(actual, (list, tuple)):
-        raise TypeError("'actual' argument must be a list or a tuple of dicts.")
+    actual = as_catalog(actual)
     for fetched_item in fetched:
-        checked_item = dict(fetched_item)
+        # Records are updated in place, dicts are copied.
+        checked_item = fetched_item if isinstance(fetched_item, StdRecord) else dict(fetched_item)
+        actual_item = None
         if fetched_item['error'] is None:
-            fetched_no = fetched_item['no']
-            actual_item = next((i for i in actual if i['no'] == fetched_no), None)
-            if actual_item:
-                fetched_rev = fetched_item['rev']
-                actual_rev = actual_item['rev']
-                actual_rev2 = actual_rev
-                if " RLV" in fetched_rev:
-                    fetched_rev = fetched_rev.replace(" RLV", "")
-                if ":" in fetched_rev:
-                    fetched_rev = fetched_rev.split(":")[-1]
-                    if " CSV" in fetched_rev:
-                        fetched_rev = fetched_rev.replace(" CSV", "")
-                if " RLV" in actual_rev:
-                    actual_rev2 = actual_rev.replace(" RLV", "")
-                if ":" in actual_rev2:
-                    actual_rev2 = actual_rev2.split(":")[-1]
-                    if " CSV" in actual_rev2:
-                        actual_rev2 = actual_rev2.replace(" CSV", "")
-                if fetched_rev == actual_rev2:
-                    checked_item['check'] = True
-                else:
-                    checked_item['check'] = False
-                checked_item['actual'] = actual_rev
-                if id_from_actual:
-                    checked_item['id'] = actual_item.get("id")
-                yield checked_item
+            actual_item, actual_rev_key = actual.lookup(fetched_item['no'], normalize_iec_rev)
+        if actual_item is not None:
+            if normalize_iec_rev(fetched_item['rev']) == actual_rev_key:
+                checked_item['check'] = True
             else:
-                checked_item['actual'] = "Yok"
                 checked_item['check'] = False
-                if id_from_actual:
-                    checked_item['id'] = None
-                yield checked_item
+            checked_item['actual'] = actual_item['rev']
+            if id_from_actual:
+                checked_item['id'] = actual_item.get("id")
         else:
             checked_item['actual'] = "Yok"
             checked_item['check'] = False
             if id_from_actual:
                 checked_item['id'] = None
-            yield checked_item
+        yield checked_item
     return
 
 
@@ -165,8 +324,10 @@ def check_iec_as_list(fetched: Iterable, actual: list, id_from_actual=False) ->
 
     :param fetched: An iterable of dicts containing the latest revision data. Dict should include at least 'no' and
         'rev' keys for comparison and an 'error' key to indicate the status of the IEC search engine's result.
-    :param actual: A list of dicts containing actual revision data. Dict should include at least 'no' and 'rev' keys
-        for comparison.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor. Dict should include
+        at least 'no' and 'rev' keys for comparison.
     :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
     :return: A list of  dicts containing comparison data. The dict includes all items and keys from
         the fetched dict, 'rev' key from the actual dict as 'actual' and 'check' key which is the comparison result
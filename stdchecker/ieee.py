@@ -2,79 +2,92 @@
 up to date.
 """
 import logging
+from functools import partial
 import json
-import requests
 from collections.abc import Iterable
-from .constants import USER_AGENT
+from .catalog import as_catalog
+from .pool import session_scope, map_queries, map_parsed
+from .transport import request
+from .record import StdRecord
+from .metrics import count, span, timed, timed_items
 
 IEEE_SEARCH_URL = "https://standards.ieee.org/wp-admin/admin-ajax.php"
+IEEE_MAX_PAGES = 20
 log = logging.getLogger(__name__)
 # log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
 
 
-def search_ieee(query_item, session) -> list:
+def ieee_form_data(query_item, page="") -> dict:
     """
-    Gets query results from the IEEE search engine.
+    Returns the form data posted to the IEEE search engine.
 
     :param query_item: Designation or number of the standard method to be searched.
-    :param session: A :ref:`Session <requests.Session>` object.
-    :return: A list of dicts containing search results.
+    :param page: Page number of the search results. Empty string for the first page.
+    :return: A dict of form fields.
     """
-    found_list = list()
-    query_item = str(query_item)
-    data = {
+    return {
         'action': "ieee_cloudsearch",
-        'q': query_item,
+        'q': str(query_item),
         'type': "|Standard",
         'topic': "",
         'category': "",
-        'page': ""
+        'page': str(page)
     }
-    url = IEEE_SEARCH_URL
-    try:
-        response = session.post(url, data=data, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException:
-        log.exception("Request exception has occurred.")
-        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
-                 'body': "ieee", 'url': None}]
-    try:
-        response_json = response.json()
-        if response_json["status"] == "ok":
-            data = response_json.get("results", None)
-            if data:
-                for item in data['hits']['hit']:
-                    if item['fields'].get('doc_title_t') is None:
-                        continue
-                    std_name = item['fields']['doc_title_t'][10:]
-                    std_name_split = std_name.split("-")
-                    start_index = item['fields']['doc_text_t'].find("MAC Address")
-                    if start_index == -1:
-                        start_index = item['fields']['doc_text_t'].find("MAC ADDRESS")
-                    end_index = item['fields']['doc_text_t'].find("Purchase", start_index)
-                    desc_index = item['fields']['doc_text_t'].find(std_name, start_index) + len(std_name)
-                    std_desc = item['fields']['doc_text_t'][desc_index + 1:end_index - 1]
-                    std_number = std_name_split[0]
-                    std_rev = std_name_split[1]
-                    std_url = item['fields']['doc_id_l']
-                    if std_number.startswith("IEEE " + query_item) or std_number.startswith("P" + query_item):
-                        if not std_rev and std_number.startswith("P" + query_item):
-                            std_rev = "project"
-                        # Append corrigenda to standard's number so that 'no' item can be unique.
-                        corrigenda = std_rev.split("/")[-1] if "/" in std_rev else ""
-                        corrigenda = corrigenda.split("-")[0] if "-" in corrigenda else corrigenda
-                        std_number = std_number + "/" + corrigenda if corrigenda else std_number
-                        found_list.append(
-                            {'query': query_item, 'error': None, 'no': std_number, 'rev': std_rev, 'desc': std_desc,
-                             'body': "ieee", 'url': std_url})
-            else:
-                log.warning(f"No results found for '{query_item}'.")
-                return [{'query': query_item, 'error': "Not found", 'no': None, 'rev': None, 'desc': None,
-                         'body': "ieee", 'url': None}]
-    except (json.JSONDecodeError, KeyError, IndexError):
-        log.exception("An exception has occurred while parsing JSON data. IEEE search page content may have changed.")
-        return [{'query': query_item, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None,
-                 'body': "ieee", 'url': None}]
+
+
+def _ieee_hits(response_json):
+    """
+    Extracts (number, revision, description, URL) tuples of all documents in an IEEE search engine response.
+
+    :return: A list of tuples, or None if the response contains no results.
+    """
+    if isinstance(response_json, (str, bytes)):
+        response_json = json.loads(response_json)
+    hits = list()
+    if response_json["status"] == "ok":
+        data = response_json.get("results", None)
+        if not data:
+            return None
+        for item in data['hits']['hit']:
+            if item['fields'].get('doc_title_t') is None:
+                continue
+            std_name = item['fields']['doc_title_t'][10:]
+            std_name_split = std_name.split("-")
+            start_index = item['fields']['doc_text_t'].find("MAC Address")
+            if start_index == -1:
+                start_index = item['fields']['doc_text_t'].find("MAC ADDRESS")
+            end_index = item['fields']['doc_text_t'].find("Purchase", start_index)
+            desc_index = item['fields']['doc_text_t'].find(std_name, start_index) + len(std_name)
+            std_desc = item['fields']['doc_text_t'][desc_index + 1:end_index - 1]
+            std_number = std_name_split[0]
+            std_rev = std_name_split[1]
+            std_url = item['fields']['doc_id_l']
+            hits.append((std_number, std_rev, std_desc, std_url))
+    return hits
+
+
+def select_ieee(query_item, hits) -> list:
+    """
+    Selects the latest revisions of the documents matching a query among the documents of IEEE search engine
+    responses.
+
+    :param query_item: Designation or number of the standard method which is searched.
+    :param hits: A list of (number, revision, description, URL) tuples.
+    :return: A list of dicts containing search results.
+    """
+    found_list = list()
+    query_item = str(query_item)
+    for std_number, std_rev, std_desc, std_url in hits:
+        if std_number.startswith("IEEE " + query_item) or std_number.startswith("P" + query_item):
+            if not std_rev and std_number.startswith("P" + query_item):
+                std_rev = "project"
+            # Append corrigenda to standard's number so that 'no' item can be unique.
+            corrigenda = std_rev.split("/")[-1] if "/" in std_rev else ""
+            corrigenda = corrigenda.split("-")[0] if "-" in corrigenda else corrigenda
+            std_number = std_number + "/" + corrigenda if corrigenda else std_number
+            found_list.append(
+                {'query': query_item, 'error': None, 'no': std_number, 'rev': std_rev, 'desc': std_desc,
+                 'body': "ieee", 'url': std_url})
     # IEEE search engine returns all revisions (latest and older ones). Older revisions will be excluded.
     filtered_found_list = list()
     sorted_list = sorted(found_list, key=lambda k: k['rev'], reverse=True)
@@ -101,36 +114,225 @@ def search_ieee(query_item, session) -> list:
     return filtered_found_list
 
 
-def fetch_ieee(query_list):
+@timed("parse", "ieee")
+def parse_ieee(query_item, response_json) -> list:
+    """
+    Extracts standard method data from an IEEE search engine response. Older revisions are excluded.
+
+    :param query_item: Designation or number of the standard method which is searched.
+    :param response_json: Decoded JSON object or JSON string of the search engine response.
+    :return: A list of dicts containing search results.
+    """
+    query_item = str(query_item)
+    try:
+        hits = _ieee_hits(response_json)
+    except (json.JSONDecodeError, KeyError, IndexError):
+        log.exception("An exception has occurred while parsing JSON data. IEEE search page content may have changed.")
+        count("parse_error", "ieee")
+        return [{'query': query_item, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "ieee", 'url': None}]
+    if hits is None:
+        log.warning(f"No results found for '{query_item}'.")
+        return [{'query': query_item, 'error': "Not found", 'no': None, 'rev': None, 'desc': None,
+                 'body': "ieee", 'url': None}]
+    return select_ieee(query_item, hits)
+
+
+def download_ieee(query_item, session, cache=None):
+    """
+    Gets the response of the IEEE search engine for a query and decodes its JSON without extracting the results.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A (query, decoded JSON) tuple of the arguments of :func:`parse_ieee`, or a list containing a single error
+        dict if the request failed.
+    """
+    import requests
+    query_item = str(query_item)
+    data = ieee_form_data(query_item)
+    url = IEEE_SEARCH_URL
+    try:
+        response = request(session, "POST", url, body="ieee", key=query_item, cache=cache, data=data,
+                           timeout=10)
+    except requests.RequestException:
+        log.exception("Request exception has occurred.")
+        return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "ieee", 'url': None}]
+    try:
+        return query_item, response.json()
+    except json.JSONDecodeError:
+        log.exception("An exception has occurred while parsing JSON data. IEEE search page content may have changed.")
+        count("parse_error", "ieee")
+        return [{'query': query_item, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "ieee", 'url': None}]
+
+
+def search_ieee(query_item, session, cache=None) -> list:
+    """
+    Gets query results from the IEEE search engine.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A list of dicts containing search results.
+    """
+    downloaded = download_ieee(query_item, session, cache=cache)
+    if isinstance(downloaded, list):
+        return downloaded
+    return parse_ieee(*downloaded)
+
+
+def ieee_family(query_item) -> str:
+    """
+    Returns the designation family of a standard method, e.g. 'C57' for 'C57.12.90'.
+    """
+    return str(query_item).split(".")[0].strip()
+
+
+def plan_ieee_searches(query_list) -> list:
+    """
+    Groups queries of the same designation family, so that a single search is sent for the whole family.
+
+    :param query_list: An iterable of query strings.
+    :return: A list of (search key, list of queries) tuples in the order of the first query of each group. The search
+        key of a group with a single query is the query itself.
+    """
+    groups = dict()
+    for query in query_list:
+        query = str(query)
+        groups.setdefault(ieee_family(query), list()).append(query)
+    return [(family, queries) if len(queries) > 1 else (queries[0], queries) for family, queries in groups.items()]
+
+
+def _search_ieee_each(queries, session, cache=None) -> list:
+    found_list = list()
+    for query in queries:
+        found_list.extend(search_ieee(query, session, cache=cache))
+    return found_list
+
+
+def search_ieee_group(group, session, cache=None) -> list:
+    """
+    Gets query results of a group of queries from the IEEE search engine with a single search of their designation
+    family, paging through the results. Prefix matching and revision filtering are done locally for each query.
+    Queries without a match in the results are searched one by one. If the family has more than
+    :data:`IEEE_MAX_PAGES` pages or a page after the first one fails, the hits are incomplete, so all queries of the
+    group are searched one by one.
+
+    :param group: A (search key, list of queries) tuple returned by :func:`plan_ieee_searches`.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A list of dicts containing search results.
+    """
+    import requests
+    search_key, queries = group
+    if len(queries) == 1:
+        return search_ieee(queries[0], session, cache=cache)
+    hits = list()
+    page = 1
+    total_pages = 1
+    while page <= total_pages:
+        data = ieee_form_data(search_key, page if page > 1 else "")
+        error = None
+        try:
+            response = request(session, "POST", IEEE_SEARCH_URL, body="ieee", key=f"{search_key}&page={page}",
+                               cache=cache, data=data, timeout=10)
+            with span("parse", "ieee", search_key):
+                response_json = response.json()
+                page_hits = _ieee_hits(response_json)
+            if page_hits is None:
+                error = "Not found"
+        except requests.RequestException:
+            log.exception("Request exception has occurred.")
+            error = "Connection error"
+        except (json.JSONDecodeError, KeyError, IndexError):
+            log.exception("An exception has occurred while parsing JSON data. IEEE search page content may have "
+                          "changed.")
+            count("parse_error", "ieee")
+            error = "Data parsing error"
+        if error is not None:
+            if page == 1:
+                return [{'query': query, 'error': error, 'no': None, 'rev': None, 'desc': None, 'body': "ieee",
+                         'url': None} for query in queries]
+            log.warning(f"Page {page} of IEEE search '{search_key}' failed. Queries are searched one by one.")
+            return _search_ieee_each(queries, session, cache)
+        hits.extend(page_hits)
+        total_pages = int(response_json.get("total_pages") or 1)
+        if total_pages > IEEE_MAX_PAGES:
+            log.warning(f"IEEE search '{search_key}' has {total_pages} pages, more than {IEEE_MAX_PAGES}. Queries "
+                        f"are searched one by one.")
+            return _search_ieee_each(queries, session, cache)
+        page += 1
+    found_list = list()
+    for query in queries:
+        selected_list = select_ieee(query, hits)
+        if selected_list:
+            found_list.extend(selected_list)
+        else:
+            found_list.extend(search_ieee(query, session, cache=cache))
+    return found_list
+
+
+def fetch_ieee(query_list, max_workers=None, ordered=True, cache=None, batch=False, compact=False, parse_workers=None,
+               parse_chunksize=None, session=None):
     """
     Fetches data of the latest revision of standard methods from the IEEE search engine.
 
     :param query_list: A string or an iterable object contains query strings. A query string should be designation
         (or number) of a standard method.
+    :param max_workers: Number of threads sending requests concurrently. If None, queries are sent one at a time.
+    :param ordered: If True, results are yielded in the order of 'query_list', otherwise as soon as they are ready.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :param batch: If True, queries of the same designation family (e.g. 'C57.104', 'C57.12.90') are searched together
+        with a single search of the family. Results are yielded group by group in the order of the first query of each
+        group.
+    :param compact: If True, :class:`StdRecord <stdchecker.record.StdRecord>` objects are yielded instead of dicts.
+    :param parse_workers: Number of processes extracting the results from the decoded responses. If given, responses
+        are downloaded by the threads and the results are extracted on a process pool (see
+        :func:`stdchecker.pool.map_parsed`). Ignored if 'batch' is True.
+    :param parse_chunksize: Number of responses sent to a parsing process at a time.
+    :param session: A :ref:`Session <requests.Session>` object owned by the caller, which is reused and not closed.
+        If None, the session set with :func:`stdchecker.pool.set_shared_session` is used, or a session is created for
+        the call.
     :return: A generator that yields dicts containing data of the latest standard method(s).
     """
     if isinstance(query_list, str):
         query_list = (query_list,)
     if not isinstance(query_list, Iterable):
         raise TypeError(f"Argument must be a string or an iterable object, {query_list.__class__.__name__} given.")
-    with requests.Session() as session:
-        session.headers.update({'User-Agent': USER_AGENT})
-        for query in query_list:
-            query = str(query)
-            found_list = search_ieee(query, session)
+    if batch:
+        query_list = plan_ieee_searches(query_list)
+    with session_scope(session, max_workers) as session:
+        if parse_workers and not batch:
+            found_lists = map_parsed(partial(download_ieee, cache=cache), parse_ieee, query_list, session,
+                                     max_workers=max_workers, parse_workers=parse_workers, chunksize=parse_chunksize,
+                                     ordered=ordered, body="ieee")
+        else:
+            search = partial(search_ieee_group if batch else search_ieee, cache=cache)
+            found_lists = map_queries(search, query_list, session, max_workers=max_workers, ordered=ordered)
+        for found_list in found_lists:
             for found_item in found_list:
-                yield found_item
+                yield StdRecord.from_dict(found_item) if compact else found_item
     return
 
 
+@timed_items("check", "ieee")
 def check_ieee(fetched: Iterable, actual: list, id_from_actual=False):
     """
     Checks the revision status of actual standard methods.
 
     :param fetched: An iterable of dicts containing the latest revision data. Dict should include at least 'no' and
         'rev' keys for comparison.
-    :param actual: A list of dicts containing actual revision data. Dict should include at least 'no' and 'rev' keys
-        for comparison.
+        :class:`StdRecord <stdchecker.record.StdRecord>` objects are updated in place and yielded instead of copied.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor. Dict should include
+        at least 'no' and 'rev' keys for comparison.
     :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
     :return: A generator that yields dicts containing comparison data. The dict includes all items and keys from
         the fetched dict, 'rev' key from the actual dict as 'actual' and 'check' key which is the comparison result
@@ -138,29 +340,27 @@ def check_ieee(fetched: Iterable, actual: list, id_from_actual=False):
     """
     if not isinstance(fetched, Iterable):
         raise TypeError("'fetched' argument must be an iterable of dicts.")
-    if not isinstance(actual, (list, tuple)):
-        raise TypeError("'actual' argument must be a list or a tuple of dicts.")
+    actual = as_catalog(actual)
     for fetched_item in fetched:
-        checked_item = dict(fetched_item)
-        fetched_no = fetched_item['no']
-        actual_item = next((i for i in actual if i['no'] == fetched_no), None)
-        if actual_item:
-            fetched_rev = fetched_item['rev']
-            actual_rev = actual_item['rev']
-            if fetched_rev == actual_rev:
+        # Records are updated in place, dicts are copied.
+        checked_item = fetched_item if isinstance(fetched_item, StdRecord) else dict(fetched_item)
+        actual_item = None
+        if fetched_item['error'] is None:
+            actual_item, actual_rev_key = actual.lookup(fetched_item['no'])
+        if actual_item is not None:
+            if fetched_item['rev'] == actual_rev_key:
                 checked_item['check'] = True
             else:
                 checked_item['check'] = False
-            checked_item['actual'] = actual_rev
+            checked_item['actual'] = actual_item['rev']
             if id_from_actual:
                 checked_item['id'] = actual_item.get("id")
-            yield checked_item
         else:
             checked_item['actual'] = "Yok"
             checked_item['check'] = False
             if id_from_actual:
                 checked_item['id'] = None
-            yield checked_item
+        yield checked_item
     return
 
 
@@ -170,8 +370,10 @@ def check_ieee_as_list(fetched: Iterable, actual: list, id_from_actual=False) ->
 
     :param fetched: An iterable of dicts containing the latest revision data. Dict should include at least 'no' and
         'rev' keys for comparison.
-    :param actual: A list of dicts containing actual revision data. Dict should include at least 'no' and 'rev' keys
-        for comparison.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor. Dict should include
+        at least 'no' and 'rev' keys for comparison.
     :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
     :return: A list of dicts containing comparison data. The dict includes all items and keys from
         the fetched dict, 'rev' key from the actual dict as 'actual' and 'check' key which is the comparison result
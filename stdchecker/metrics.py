@@ -0,0 +1,256 @@
+"""Instrumentation hooks of the request, parse and check paths.
+
+An instrument is set with :func:`set_instrument` and receives timed spans and counters:
+
+Spans (seconds, per standard body and query):
+
+- ``request``: a whole request including cache lookups, rate limiting and retries.
+- ``wait``: sending a request until the response headers are received (connection, DNS and server time).
+- ``download``: reading the response content after the headers are received.
+- ``parse``: extracting standard method data from a page.
+- ``check``: comparing a fetched standard method with the actual one.
+
+Counters (per standard body): ``bytes``, ``cache_hit``, ``cache_miss``, ``cache_revalidated``, ``retry``, ``hedge``,
+``error`` (failed requests) and ``parse_error``.
+
+Nothing is measured while no instrument is set, so the overhead is a global lookup per call.
+"""
+import bisect
+import contextlib
+import functools
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+_instrument = None
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Instrument:
+    """
+    Base class of instruments. Subclasses override :meth:`record_span` and :meth:`record_count`, which may be called
+    from multiple threads at the same time.
+    """
+
+    def record_span(self, name, body, query, seconds):
+        """
+        :param name: Name of the span, e.g. 'request'.
+        :param body: Name of the standard body, e.g. 'astm'.
+        :param query: Query string or None.
+        :param seconds: Duration of the span.
+        """
+
+    def record_count(self, name, body, value):
+        """
+        :param name: Name of the counter, e.g. 'bytes'.
+        :param body: Name of the standard body, e.g. 'astm'.
+        :param value: Amount to add to the counter.
+        """
+
+
+class Collector(Instrument):
+    """
+    In-process instrument which keeps all span durations and counters in memory.
+    """
+
+    def __init__(self):
+        self.spans = defaultdict(list)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def record_span(self, name, body, query, seconds):
+        with self._lock:
+            self.spans[(name, body)].append(seconds)
+
+    def record_count(self, name, body, value):
+        with self._lock:
+            self.counts[(name, body)] += value
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.counts.clear()
+
+    def histogram(self, name, body=None, buckets=DEFAULT_BUCKETS) -> list:
+        """
+        Returns (upper bound, count) tuples of the durations of a span. The last upper bound is infinity.
+
+        :param name: Name of the span.
+        :param body: Name of the standard body. If None, spans of all standard bodies are included.
+        :param buckets: Upper bounds of the buckets in seconds, in ascending order.
+        """
+        counts = [0] * (len(buckets) + 1)
+        for seconds in self._durations(name, body):
+            counts[bisect.bisect_left(buckets, seconds)] += 1
+        return list(zip(tuple(buckets) + (float("inf"),), counts))
+
+    def _durations(self, name, body=None):
+        with self._lock:
+            return [s for (n, b), durations in self.spans.items() if n == name and body in (None, b)
+                    for s in durations]
+
+    def summary(self) -> str:
+        """
+        Returns a table of span statistics, counters and a latency histogram of each span name.
+        """
+        lines = [f"{'span':<10} {'body':<6} {'count':>7} {'total (s)':>10} {'mean (ms)':>10} {'p50 (ms)':>9} "
+                 f"{'p95 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}"]
+        with self._lock:
+            spans = {key: sorted(durations) for key, durations in self.spans.items()}
+            counts = dict(self.counts)
+        for (name, body), durations in sorted(spans.items()):
+            n = len(durations)
+            lines.append(f"{name:<10} {body:<6} {n:>7} {sum(durations):>10.3f} {sum(durations) / n * 1000:>10.2f} "
+                         f"{_quantile(durations, 0.50) * 1000:>9.2f} {_quantile(durations, 0.95) * 1000:>9.2f} "
+                         f"{_quantile(durations, 0.99) * 1000:>9.2f} {durations[-1] * 1000:>9.2f}")
+        if counts:
+            lines.append("")
+            lines.append(f"{'counter':<18} {'body':<6} {'value':>12}")
+            for (name, body), value in sorted(counts.items()):
+                lines.append(f"{name:<18} {body:<6} {value:>12}")
+        for name in sorted({name for name, _ in spans}):
+            histogram = self.histogram(name)
+            total = sum(n for _, n in histogram) or 1
+            lines.append("")
+            lines.append(f"{name} latency")
+            for upper, n in histogram:
+                label = f"<= {upper * 1000:g} ms" if upper != float("inf") else f"> {histogram[-2][0] * 1000:g} ms"
+                lines.append(f"{label:>14} {n:>7} {'#' * round(40 * n / total)}")
+        return "\n".join(lines)
+
+
+def _quantile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def set_instrument(instrument=None):
+    """
+    Sets the instrument which receives the spans and counters of all standard bodies.
+
+    :param instrument: An :class:`Instrument` object, e.g. a :class:`Collector`. If None, instrumentation is disabled.
+    :return: The instrument.
+    """
+    global _instrument
+    _instrument = instrument
+    log.debug(f"Instrument is set to {instrument!r}.")
+    return instrument
+
+
+def get_instrument():
+    """
+    Returns the current instrument or None.
+    """
+    return _instrument
+
+
+def count(name, body, value=1):
+    """
+    Adds a value to a counter of the current instrument, if there is one.
+    """
+    instrument = _instrument
+    if instrument is not None:
+        instrument.record_count(name, body, value)
+
+
+class _Span:
+    __slots__ = ("instrument", "name", "body", "query", "start")
+
+    def __init__(self, instrument, name, body, query):
+        self.instrument = instrument
+        self.name = name
+        self.body = body
+        self.query = query
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.instrument.record_span(self.name, self.body, self.query, time.perf_counter() - self.start)
+
+
+def span(name, body, query=None):
+    """
+    Returns a context manager which records a span of its block in the current instrument, if there is one.
+    """
+    instrument = _instrument
+    if instrument is None:
+        return _NULL_SPAN
+    return _Span(instrument, name, body, query)
+
+
+def timed(name, body):
+    """
+    Decorator which records a span of each call of a function whose first argument is the query.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(query_item, *args, **kwargs):
+            instrument = _instrument
+            if instrument is None:
+                return func(query_item, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(query_item, *args, **kwargs)
+            finally:
+                instrument.record_span(name, body, str(query_item), time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def timed_items(name, body):
+    """
+    Decorator which records a span of each item yielded by a generator function, labelled with the item's 'query'.
+    The first argument of the function is the upstream iterable (e.g. fetched items). Time spent pulling items from it
+    and time spent by the consumer between items are not included.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(upstream, *args, **kwargs):
+            instrument = _instrument
+            if instrument is None or not isinstance(upstream, Iterable):
+                return func(upstream, *args, **kwargs)
+            upstream = _PullTimer(upstream)
+            return _timed_items(instrument, name, body, func(upstream, *args, **kwargs), upstream)
+        return wrapper
+    return decorator
+
+
+class _PullTimer:
+    """
+    Iterates over an upstream iterable and adds up the time spent waiting for its items.
+    """
+    __slots__ = ("iterator", "elapsed")
+
+    def __init__(self, iterable):
+        self.iterator = iter(iterable)
+        self.elapsed = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self.iterator)
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+
+def _timed_items(instrument, name, body, items, upstream):
+    while True:
+        start = time.perf_counter()
+        pulled = upstream.elapsed
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        seconds = time.perf_counter() - start - (upstream.elapsed - pulled)
+        instrument.record_span(name, body, item.get('query'), seconds)
+        yield item
@@ -0,0 +1,87 @@
+"""Revision normalizers of the standard bodies.
+
+A normalizer turns a revision string into a key which compares equal for revisions that the check functions treat as
+the same, e.g. ASTM '20' and '20(2015)'. Normalizers are memoized, since an inventory has only a few distinct
+revisions.
+"""
+from collections.abc import Iterable
+from datetime import date
+from functools import lru_cache
+
+NORMALIZE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_astm_rev(rev):
+    """
+    Returns the revision without the parenthetical part (e.g. reapproval year) for comparison.
+    """
+    if "(" in rev and ")" in rev:
+        return rev[0:rev.rfind("(")]
+    return rev
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_iec_rev(rev):
+    """
+    Returns the revision without ' RLV' and ' CSV' suffixes and the edition part for comparison.
+    """
+    if " RLV" in rev:
+        rev = rev.replace(" RLV", "")
+    if ":" in rev:
+        rev = rev.split(":")[-1]
+        if " CSV" in rev:
+            rev = rev.replace(" CSV", "")
+    return rev
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_tse_rev(rev):
+    """
+    Returns the revision date string (DD.MM.YYYY) as a date object for comparison.
+    """
+    _ = rev.split(".")
+    return date(int(_[2]), int(_[1]), int(_[0]))
+
+
+# IEEE revisions (years) are compared as they are.
+NORMALIZERS = {
+    'astm': normalize_astm_rev,
+    'iec': normalize_iec_rev,
+    'ieee': None,
+    'tse': normalize_tse_rev,
+}
+
+
+def get_normalizer(body):
+    """
+    Returns the revision normalizer of a standard body, or None if its revisions are compared as they are.
+
+    :raises ValueError: If an unknown standard body is given.
+    """
+    try:
+        return NORMALIZERS[body]
+    except KeyError:
+        raise ValueError(f"Unknown standard body '{body}'.") from None
+
+
+def normalize_revs(body, revs: Iterable) -> list:
+    """
+    Normalizes many revisions at once. Each distinct revision is normalized only once.
+
+    :param body: Name of the standard body ('astm', 'iec', 'ieee' or 'tse') or a normalizer function.
+    :param revs: An iterable of revision strings.
+    :return: A list of normalized revisions in the same order.
+    """
+    normalize = body if callable(body) else get_normalizer(body)
+    if normalize is None:
+        return list(revs)
+    memo = dict()
+    normalized = list()
+    for rev in revs:
+        try:
+            normalized.append(memo[rev])
+        except KeyError:
+            key = memo[rev] = normalize(rev)
+            normalized.append(key)
+    return normalized
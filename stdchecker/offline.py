@@ -0,0 +1,176 @@
+"""Local index of the catalogs of the standard bodies, for checking large inventories without sending requests.
+
+A catalog dump (e.g. an exported listing of ASTM designations and revisions, or the results of a previous fetch run) is
+ingested into an SQLite database. Ingesting a newer dump of the same standard body only writes the entries which were
+added, changed or removed. :meth:`LocalIndex.fetch` yields the same dicts as the fetch functions, so its results can
+be passed to the check functions.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from .record import StdRecord
+from .sources import iter_source
+
+PREFIXES = {
+    'astm': "ASTM ",
+    'iec': "IEC ",
+    'ieee': "IEEE ",
+    'tse': "",
+}
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+
+def index_key(body, no) -> str:
+    """
+    Returns the lookup key of a standard method number or a query, e.g. 'D92' for both 'ASTM D92' and 'd92'. TSE
+    numbers are looked up without their language and edition notes, e.g. '(İngilizce Metin)'.
+
+    :raises ValueError: If an unknown standard body is given.
+    """
+    try:
+        prefix = PREFIXES[body]
+    except KeyError:
+        raise ValueError(f"Unknown standard body '{body}'.") from None
+    key = str(no).split("\xa0")[0].strip().upper()
+    if prefix and key.startswith(prefix):
+        key = key[len(prefix):].strip()
+    return key
+
+
+class LocalIndex:
+    """
+    Stores the catalog entries ('no', 'rev', 'desc' and 'url') of each standard body in an SQLite database, indexed by
+    the lookup key of their numbers.
+
+    The index can be shared by threads and used as a context manager.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the SQLite database file. It is created if it does not exist. ':memory:' can be used
+            for a non-persistent index.
+        """
+        self._lock = threading.Lock()
+        self._loaded = dict()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS catalog ("
+                "body TEXT NOT NULL, no TEXT NOT NULL, key TEXT NOT NULL, rev TEXT, desc TEXT, url TEXT, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (body, no))")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS catalog_key ON catalog (body, key)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM catalog").fetchone()[0]
+
+    def ingest(self, body, source, full=True) -> dict:
+        """
+        Ingests a catalog dump of a standard body. Only the entries which are new or whose revision, description or
+        URL changed are written. Entries with an error (e.g. fetched items of failed queries) and withdrawn TSE
+        entries are skipped. If an entry is listed more than once, the first one is used.
+
+        :param body: Name of the standard body ('astm', 'iec', 'ieee' or 'tse').
+        :param source: Catalog entries as an iterable of dicts (e.g. the results of a fetch function), a CSV or NDJSON
+            file path or an executed DB-API cursor. Entries should include 'no' and 'rev' keys, and may include 'desc'
+            and 'url' keys.
+        :param full: If True, the source is the whole catalog of the standard body, so the stored entries missing from
+            it are removed. If False, the source only adds and updates entries.
+        :return: A dict of the numbers of 'added', 'changed', 'removed' and 'unchanged' entries.
+        """
+        if body not in PREFIXES:
+            raise ValueError(f"Unknown standard body '{body}'.")
+        with self._lock:
+            stored = {row[0]: row[1:] for row in self._connection.execute(
+                "SELECT no, rev, desc, url FROM catalog WHERE body = ?", (body,))}
+        seen = set()
+        upserts = list()
+        counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        now = time.time()
+        for item in iter_source(source):
+            if item.get("error") is not None:
+                continue
+            no = item['no']
+            if not no or no in seen or (body == "tse" and "İptal Standard" in no):
+                continue
+            seen.add(no)
+            values = tuple(None if i is None else str(i) for i in (item['rev'], item.get("desc"), item.get("url")))
+            previous = stored.get(no)
+            if previous == values:
+                counts['unchanged'] += 1
+                continue
+            counts['added' if previous is None else 'changed'] += 1
+            upserts.append((body, no, index_key(body, no)) + values + (now,))
+        removed = [(body, no) for no in stored if no not in seen] if full else list()
+        counts['removed'] = len(removed)
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO catalog VALUES (?, ?, ?, ?, ?, ?, ?)", upserts)
+            self._connection.executemany("DELETE FROM catalog WHERE body = ? AND no = ?", removed)
+            self._loaded.pop(body, None)
+        log.info(f"Ingested {body} catalog: {counts['added']} added, {counts['changed']} changed, "
+                 f"{counts['removed']} removed, {counts['unchanged']} unchanged.")
+        return counts
+
+    def _load(self, body) -> dict:
+        """
+        Returns a dict of lookup keys and lists of (no, rev, desc, url) tuples of a standard body. The dict is built
+        with a single query and kept until the standard body is ingested again.
+        """
+        with self._lock:
+            loaded = self._loaded.get(body)
+            if loaded is None:
+                loaded = self._loaded[body] = dict()
+                for row in self._connection.execute(
+                        "SELECT key, no, rev, desc, url FROM catalog WHERE body = ? ORDER BY rowid", (body,)):
+                    loaded.setdefault(row[0], list()).append(row[1:])
+        return loaded
+
+    def lookup(self, body, query_item) -> list:
+        """
+        Returns the entries of a query as dicts in the same form as the search functions.
+
+        :param body: Name of the standard body ('astm', 'iec', 'ieee' or 'tse').
+        :param query_item: Designation or number of the standard method.
+        :return: A list of dicts. If the query is not in the index, the list contains a single 'Not found' error dict.
+        """
+        query_item = str(query_item)
+        rows = self._load(body).get(index_key(body, query_item))
+        if not rows:
+            return [{'query': query_item, 'error': "Not found", 'no': None, 'rev': None, 'desc': None, 'body': body,
+                     'url': None}]
+        return [{'query': query_item, 'error': None, 'no': no, 'rev': rev, 'desc': desc, 'body': body, 'url': url}
+                for no, rev, desc, url in rows]
+
+    def fetch(self, body, query_list, compact=False, **kwargs):
+        """
+        Looks up standard methods in the index instead of fetching them from the website of the standard body.
+
+        :param body: Name of the standard body ('astm', 'iec', 'ieee' or 'tse').
+        :param query_list: A string or an iterable object contains query strings.
+        :param compact: If True, :class:`StdRecord <stdchecker.record.StdRecord>` objects are yielded instead of dicts.
+        :param kwargs: Other keyword arguments of the fetch functions (e.g. 'max_workers') are ignored.
+        :return: A generator that yields dicts in the same form as the fetch functions.
+        """
+        if isinstance(query_list, str):
+            query_list = (query_list,)
+        if not isinstance(query_list, Iterable):
+            raise TypeError(f"Argument must be a string or an iterable object, {query_list.__class__.__name__} given.")
+        for query_item in query_list:
+            for found_item in self.lookup(body, query_item):
+                yield StdRecord.from_dict(found_item) if compact else found_item
@@ -0,0 +1,131 @@
+"""Checking a mixed inventory of standard methods of all standard bodies at the same time."""
+import logging
+import queue
+import threading
+import time
+from collections.abc import Iterable
+from functools import partial
+from .catalog import ActualCatalog
+from .offline import index_key
+from .state import fetch_incremental
+from .astm import fetch_astm, check_astm
+from .iec import fetch_iec, check_iec
+from .ieee import fetch_ieee, check_ieee
+from .tse import fetch_tse, check_tse
+
+BODIES = {
+    'astm': (fetch_astm, check_astm),
+    'iec': (fetch_iec, check_iec),
+    'ieee': (fetch_ieee, check_ieee),
+    'tse': (fetch_tse, check_tse),
+}
+DEFAULT_MAX_WORKERS = 4
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+_DONE = object()
+
+
+def route_inventory(inventory: Iterable) -> dict:
+    """
+    Splits an inventory into the queries and the actual standard methods of each standard body.
+
+    :param inventory: An iterable of dicts. Dict should include 'body' ('astm', 'iec', 'ieee' or 'tse'), 'no' and 'rev'
+        keys, and may include 'query' and 'id' keys. If 'query' is missing, 'no' without the standard body prefix and
+        the TSE language and edition notes is used as the query (see :func:`stdchecker.offline.index_key`).
+    :return: A dict of standard body names and (list of unique queries, list of actual dicts) tuples.
+    :raises ValueError: If an unknown standard body is given or the revision of a row is missing (e.g. a blank CSV
+        cell).
+    """
+    if not isinstance(inventory, Iterable):
+        raise TypeError("'inventory' argument must be an iterable of dicts.")
+    routed = dict()
+    for row in inventory:
+        body = str(row['body']).lower()
+        if body not in BODIES:
+            raise ValueError(f"Unknown standard body '{row['body']}'.")
+        if row.get('rev') is None:
+            raise ValueError(f"Revision of '{row['no']}' is missing.")
+        queries, actual = routed.setdefault(body, (dict(), list()))
+        queries.setdefault(str(row.get('query') or index_key(body, row['no'])), None)
+        actual.append(row)
+    return {body: (list(queries), actual) for body, (queries, actual) in routed.items()}
+
+
+def check_all(inventory: Iterable, id_from_actual=False, max_workers=DEFAULT_MAX_WORKERS, timings=None, state=None,
+              index=None, **kwargs):
+    """
+    Fetches and checks the standard methods of all standard bodies in an inventory. Each standard body is processed
+    in its own thread at the same time, so the total time is close to the time of the slowest standard body.
+
+    :param inventory: An iterable of dicts. Dict should include 'body' ('astm', 'iec', 'ieee' or 'tse'), 'no' and 'rev'
+        keys, and may include 'query' and 'id' keys. If 'query' is missing, it is taken from 'no' (see
+        :func:`route_inventory`).
+    :param id_from_actual: If True, 'id' key from the inventory dict will be included in the resulting dict.
+    :param max_workers: Number of concurrent requests per standard body (i.e. per host). Either an integer used for all
+        standard bodies or a dict of standard body names and integers.
+    :param timings: If a dict is given, it is filled with standard body names and elapsed seconds of their fetch and
+        check runs.
+    :param state: A :class:`StateStore <stdchecker.state.StateStore>` object. If given, only the queries whose
+        stored results are stale or ended with an error are fetched, the others are taken from the store. Fetched
+        results and check outcomes are stored.
+    :param index: A :class:`LocalIndex <stdchecker.offline.LocalIndex>` object. If given, standard methods are looked
+        up in the index instead of being fetched from the websites.
+    :param kwargs: Other keyword arguments passed to every fetch function, e.g. 'cache'. 'batch' is ignored by
+        :func:`stdchecker.astm.fetch_astm`.
+    :return: A generator that yields dicts containing comparison data of all standard bodies in completion order.
+        Dicts are the same as the ones yielded by the check functions of each standard body.
+    """
+    routed = route_inventory(inventory)
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def run(body, queries, actual):
+        fetch_func, check_func = BODIES[body]
+        if index is not None:
+            fetch_func = partial(index.fetch, body)
+        workers = max_workers.get(body, DEFAULT_MAX_WORKERS) if isinstance(max_workers, dict) else max_workers
+        fetch_kwargs = dict(kwargs)
+        if body == "astm":
+            fetch_kwargs.pop("batch", None)
+        start = time.perf_counter()
+        try:
+            if state is None:
+                fetched = fetch_func(queries, max_workers=workers, ordered=False, **fetch_kwargs)
+            else:
+                fetched = fetch_incremental(fetch_func, body, queries, state, max_workers=workers, ordered=False,
+                                            **fetch_kwargs)
+            checked = list()
+            catalog = ActualCatalog(actual)
+            for checked_item in check_func(fetched, catalog, id_from_actual=id_from_actual):
+                if stop.is_set():
+                    break
+                results.put(checked_item)
+                if state is not None:
+                    checked.append(checked_item)
+            if state is not None and not stop.is_set():
+                state.record_checked(checked)
+        except Exception as e:
+            results.put(e)
+        finally:
+            results.put((_DONE, body, time.perf_counter() - start))
+
+    threads = [threading.Thread(target=run, args=(body, queries, actual), name=f"stdchecker-{body}", daemon=True)
+               for body, (queries, actual) in routed.items()]
+    for thread in threads:
+        thread.start()
+    running = len(threads)
+    try:
+        while running:
+            result = results.get()
+            if isinstance(result, tuple) and result[0] is _DONE:
+                running -= 1
+                log.info(f"Checked {result[1]} standard methods in {result[2]:.3f} seconds.")
+                if timings is not None:
+                    timings[result[1]] = result[2]
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                yield result
+    finally:
+        stop.set()
@@ -0,0 +1,45 @@
+"""HTML parser backend used by the parse functions."""
+import logging
+
+DEFAULT_HTML_PARSER = "html.parser"
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+_html_parser = DEFAULT_HTML_PARSER
+
+
+def set_html_parser(name=DEFAULT_HTML_PARSER):
+    """
+    Sets the parser used by BeautifulSoup for building HTML trees. "lxml" is a C-accelerated parser which can be
+    installed with ``pip install stdchecker[lxml]``.
+
+    :param name: Name of a parser supported by BeautifulSoup, e.g. "html.parser", "lxml" or "html5lib".
+    :raises ValueError: If the parser is not installed.
+    """
+    global _html_parser
+    from bs4.builder import builder_registry
+    if builder_registry.lookup(name) is None:
+        raise ValueError(f"HTML parser '{name}' is not available. Is it installed?")
+    _html_parser = name
+    log.debug(f"HTML parser is set to '{name}'.")
+
+
+def get_html_parser() -> str:
+    """
+    Returns the name of the parser used by BeautifulSoup for building HTML trees.
+    """
+    return _html_parser
+
+
+def make_soup(html, only=None):
+    """
+    Builds an HTML tree with the selected parser. BeautifulSoup is imported on the first call, so that importing the
+    package does not load it.
+
+    :param html: HTML content.
+    :param only: If given, only the tags with this name and their descendants are added to the tree.
+    :return: A :class:`BeautifulSoup` object.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+    parse_only = SoupStrainer(only) if only else None
+    return BeautifulSoup(html, _html_parser, parse_only=parse_only)
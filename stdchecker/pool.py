@@ -0,0 +1,236 @@
+"""Helpers for running per-query work of the fetch functions concurrently on thread and process pools."""
+import logging
+import multiprocessing
+import os
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from .constants import USER_AGENT
+from .record import FETCHED_KEYS
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_PARSE_CHUNKSIZE = 8
+
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+_shared_session = None
+
+
+def create_session(pool_size=None, user_agent=True, keep_alive=True, pool_block=False):
+    """
+    Creates a :ref:`Session <requests.Session>` object whose connection pool is large enough for the given number of
+    concurrent workers.
+
+    :param pool_size: Maximum number of connections kept per host. If None, requests' default pool size is used.
+    :param user_agent: If True, 'User-Agent' request header is set to the library's default user agent.
+    :param keep_alive: If False, connections are closed after each response ('Connection: close').
+    :param pool_block: If True, workers wait for a free connection when all connections of a host are in use, instead
+        of opening a connection which is discarded after the response.
+    :return: A :ref:`Session <requests.Session>` object.
+    """
+    # requests is imported here, so that importing the package does not load the HTTP stack.
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    if pool_size or pool_block:
+        pool_size = pool_size or DEFAULT_POOL_SIZE
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    if user_agent:
+        session.headers.update({'User-Agent': USER_AGENT})
+    if not keep_alive:
+        session.headers['Connection'] = "close"
+    return session
+
+
+def set_shared_session(session=None):
+    """
+    Sets a session used by the fetch functions which are called without a 'session' argument, so that connections are
+    kept open and reused across calls and standard bodies. The session is owned by the caller and is not closed by the
+    fetch functions.
+
+    :param session: A :ref:`Session <requests.Session>` object, e.g. from :func:`create_session`. Its pool size should
+        not be less than the 'max_workers' of the fetch functions. If None, the shared session is removed and each
+        call creates its own session again.
+    :return: The session.
+    """
+    global _shared_session
+    _shared_session = session
+    return session
+
+
+def get_shared_session():
+    """
+    Returns the session set with :func:`set_shared_session` or None.
+    """
+    return _shared_session
+
+
+@contextmanager
+def session_scope(session=None, pool_size=None, user_agent=True):
+    """
+    Provides the session of a fetch function: the given session, or the shared session, or a new session which is
+    closed on exit.
+
+    :param session: A :ref:`Session <requests.Session>` object owned by the caller or None.
+    :param pool_size: Pool size of a new session.
+    :param user_agent: 'user_agent' argument of :func:`create_session` for a new session.
+    """
+    if session is None:
+        session = _shared_session
+    if session is not None:
+        yield session
+        return
+    with create_session(pool_size, user_agent=user_agent) as session:
+        yield session
+
+
+def map_queries(func, query_list, session, max_workers=None, ordered=True):
+    """
+    Calls ``func(query, session)`` for every query and yields the return values.
+
+    :param func: A callable which takes a query string and a session object, e.g. :func:`stdchecker.iec.search_iec`.
+    :param query_list: An iterable of query strings.
+    :param session: A :ref:`Session <requests.Session>` object shared by all calls.
+    :param max_workers: Number of worker threads. If None or less than 2, queries are processed one at a time in the
+        calling thread.
+    :param ordered: If True, return values are yielded in input order, otherwise in completion order. Ignored when
+        queries are processed sequentially.
+    :return: A generator that yields return values of the calls.
+    """
+    if not max_workers or max_workers < 2:
+        for query in query_list:
+            yield func(query, session)
+        return
+    # At most 'window' calls are submitted ahead of the consumer, so that the generator streams results instead of
+    # queueing the whole query list at once.
+    window = max_workers * 2
+    query_iter = iter(query_list)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stdchecker") as executor:
+        pending = deque() if ordered else set()
+        add = pending.append if ordered else pending.add
+
+        def submit(n):
+            for query in query_iter:
+                add(executor.submit(func, query, session))
+                n -= 1
+                if n == 0:
+                    break
+
+        try:
+            submit(window)
+            while pending:
+                if ordered:
+                    done = (pending.popleft(),)
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    pending.difference_update(done)
+                for future in done:
+                    yield future.result()
+                submit(len(done))
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _init_parse_worker(html_parser, body, base_url):
+    from .parsers import set_html_parser
+    set_html_parser(html_parser)
+    if body is not None:
+        from .endpoints import set_base_url
+        set_base_url(body, base_url)
+
+
+def _parse_chunk(parse, chunk) -> list:
+    """
+    Runs in a worker process. Parses each downloaded item of a chunk and returns the results as tuples of the values
+    of :data:`FETCHED_KEYS <stdchecker.record.FETCHED_KEYS>`, which are smaller to send back than dicts.
+    """
+    parsed = list()
+    for downloaded in chunk:
+        found_list = downloaded if isinstance(downloaded, list) else parse(*downloaded)
+        parsed.append([tuple(item[key] for key in FETCHED_KEYS) for item in found_list])
+    return parsed
+
+
+def _parse_context():
+    """
+    Returns the multiprocessing context of the parsing processes. They are started while the download threads (and
+    possibly other threads of the caller) are running, and forking a multi-threaded process can deadlock, so the
+    'forkserver' start method is used where available and 'spawn' elsewhere.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def map_parsed(download, parse, query_list, session, max_workers=None, parse_workers=None,
+               chunksize=DEFAULT_PARSE_CHUNKSIZE, ordered=True, body=None):
+    """
+    Downloads the responses of every query on a thread pool and parses them on a process pool, so that parsing is not
+    limited to one core by the GIL. Downloaded items are sent to the worker processes in chunks.
+
+    Parse spans and counters of :mod:`stdchecker.metrics` are recorded in the worker processes, so they are not seen by
+    the instrument of the calling process.
+
+    :param download: A callable which takes a query string and a session object, and returns either a tuple of the
+        arguments of 'parse' or a list of error dicts, e.g. :func:`stdchecker.astm.download_astm`.
+    :param parse: A module-level function which returns a list of dicts, e.g. :func:`stdchecker.astm.parse_astm`. It
+        is pickled by reference.
+    :param query_list: An iterable of query strings.
+    :param session: A :ref:`Session <requests.Session>` object shared by all downloads.
+    :param max_workers: Number of download threads, as in :func:`map_queries`.
+    :param parse_workers: Number of worker processes. If None, the number of CPUs is used.
+    :param chunksize: Number of downloaded items sent to a worker process at a time.
+    :param ordered: If True, lists are yielded in input order, otherwise in completion order of the chunks.
+    :param body: Name of the standard body. If given, its base URL set with
+        :func:`stdchecker.endpoints.set_base_url` is also used in the worker processes.
+    :return: A generator that yields a list of dicts for each query.
+    """
+    from .parsers import get_html_parser
+    base_url = None
+    if body is not None:
+        from .endpoints import get_base_url
+        base_url = get_base_url(body)
+    parse_workers = parse_workers or os.cpu_count() or 1
+    chunksize = max(1, chunksize or DEFAULT_PARSE_CHUNKSIZE)
+    with ProcessPoolExecutor(max_workers=parse_workers, mp_context=_parse_context(), initializer=_init_parse_worker,
+                             initargs=(get_html_parser(), body, base_url)) as executor:
+        # At most 'window' chunks are pending, so that the generator streams results instead of queueing the whole
+        # query list at once.
+        window = parse_workers * 2
+        pending = deque() if ordered else set()
+        add = pending.append if ordered else pending.add
+
+        def completed(limit):
+            # Yields the lists of parsed chunks until at most 'limit' chunks are pending and none of them is done.
+            while pending:
+                if ordered:
+                    future = pending[0]
+                    if len(pending) <= limit and not future.done():
+                        return
+                    pending.popleft()
+                else:
+                    done = [i for i in pending if i.done()]
+                    if not done and len(pending) <= limit:
+                        return
+                    future = done[0] if done else wait(pending, return_when=FIRST_COMPLETED)[0].pop()
+                    pending.discard(future)
+                for found_tuples in future.result():
+                    yield [dict(zip(FETCHED_KEYS, i)) for i in found_tuples]
+
+        chunk = list()
+        try:
+            for downloaded in map_queries(download, query_list, session, max_workers=max_workers, ordered=ordered):
+                chunk.append(downloaded)
+                if len(chunk) >= chunksize:
+                    add(executor.submit(_parse_chunk, parse, chunk))
+                    chunk = list()
+                    yield from completed(window)
+            if chunk:
+                add(executor.submit(_parse_chunk, parse, chunk))
+            yield from completed(0)
+        finally:
+            for future in pending:
+                future.cancel()
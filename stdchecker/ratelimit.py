@@ -0,0 +1,147 @@
+"""Per-host rate limiting with adaptive concurrency.
+
+Each standard body is served by a single host, so limiters are registered per standard body. Once a limiter is set
+with :func:`set_rate_limit`, every request sent to that standard body by the fetch and search functions waits for a
+token of the limiter's token bucket and for a free concurrency slot. Concurrency is raised while response latency
+stays flat and halved, together with the request rate, when the host responds with 429 or 5xx status codes or
+times out.
+"""
+import logging
+import threading
+import time
+
+THROTTLE_STATUS_CODES = (429, 502, 503, 504)
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+_limiters = dict()
+_limiters_lock = threading.Lock()
+
+
+class HostLimiter:
+    """
+    Token bucket rate limiter combined with an additive-increase/multiplicative-decrease concurrency limit.
+    """
+
+    def __init__(self, rate=5.0, burst=None, concurrency=2, min_concurrency=1, max_concurrency=16,
+                 latency_tolerance=1.5, max_retries=3):
+        """
+        :param rate: Maximum number of requests per second.
+        :param burst: Maximum number of requests that can be sent at once after an idle period. Defaults to 'rate'.
+        :param concurrency: Initial number of requests allowed in flight.
+        :param min_concurrency: Lower bound of the concurrency limit.
+        :param max_concurrency: Upper bound of the concurrency limit.
+        :param latency_tolerance: Concurrency is not raised while latency is above the baseline latency times this
+            factor.
+        :param max_retries: Number of times a throttled request (429, 502, 503, 504) is retried.
+        """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst or max(rate, 1))
+        self.limit = float(concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_tolerance = latency_tolerance
+        self.max_retries = max_retries
+        self.baseline = None
+        self.in_flight = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Blocks until a token and a concurrency slot are available, and takes them.
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.in_flight >= int(self.limit):
+                    wait = None
+                elif self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    self._tokens -= 1
+                    self.in_flight += 1
+                    return
+                self._condition.wait(wait)
+
+    def release(self, latency=None, throttled=False, retry_after=None):
+        """
+        Frees a concurrency slot and adapts the limits to the outcome of the request.
+
+        :param latency: Response time of a successful request in seconds.
+        :param throttled: True if the host throttled the request or timed out. The token bucket is emptied, so the next
+            request waits for a token at the halved rate, and each further throttle doubles the wait.
+        :param retry_after: Seconds to wait before sending the next request, e.g. from a 'Retry-After' header.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                self.rate = max(self.max_rate / 16, self.rate / 2)
+                self._refill(time.monotonic())
+                self._tokens = 0.0
+                if retry_after:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                log.debug(f"Throttled, concurrency limit is {self.limit:.1f} and rate is {self.rate:.2f}/s.")
+            elif latency is not None:
+                if self.baseline is None or latency < self.baseline:
+                    self.baseline = latency
+                else:
+                    # Let the baseline follow slow drifts of the host's response time.
+                    self.baseline += (latency - self.baseline) * 0.05
+                if latency <= self.baseline * self.latency_tolerance:
+                    self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self.rate = min(self.max_rate, self.rate * 1.1)
+            self._condition.notify_all()
+
+
+def set_rate_limit(body, **kwargs) -> HostLimiter:
+    """
+    Registers a rate limiter for the requests sent to a standard body.
+
+    :param body: Name of the standard body, e.g. 'astm'.
+    :param kwargs: Keyword arguments passed to :class:`HostLimiter`.
+    :return: The registered :class:`HostLimiter` object.
+    """
+    limiter = HostLimiter(**kwargs)
+    with _limiters_lock:
+        _limiters[body] = limiter
+    return limiter
+
+
+def remove_rate_limit(body=None):
+    """
+    Removes the rate limiter of a standard body, or all rate limiters if 'body' is None.
+    """
+    with _limiters_lock:
+        if body is None:
+            _limiters.clear()
+        else:
+            _limiters.pop(body, None)
+
+
+def get_limiter(body):
+    """
+    Returns the rate limiter of a standard body or None.
+    """
+    return _limiters.get(body)
+
+
+def parse_retry_after(value):
+    """
+    Returns the seconds in a 'Retry-After' header, or None if it is missing or an HTTP date.
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
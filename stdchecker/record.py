@@ -0,0 +1,146 @@
+"""Compact record of a standard method, used in place of dicts for large inventories."""
+
+FETCHED_KEYS = ("query", "error", "no", "rev", "desc", "body", "url")
+CHECKED_KEYS = ("check", "actual", "id")
+
+_KEYS = frozenset(FETCHED_KEYS + CHECKED_KEYS)
+
+
+class StdRecord:
+    """
+    Slotted record with the keys of the dicts yielded by the fetch and check functions. It supports item access
+    (``record['rev']``), so it can be used wherever those dicts are read, and :meth:`to_dict` for converting back.
+
+    Check functions set 'check', 'actual' and 'id' on a record in place instead of copying it. Keys which have not
+    been set are missing, as in the dicts.
+    """
+    __slots__ = FETCHED_KEYS + CHECKED_KEYS
+
+    def __init__(self, query, error, no, rev, desc, body, url):
+        self.query = query
+        self.error = error
+        self.no = no
+        self.rev = rev
+        self.desc = desc
+        self.body = body
+        self.url = url
+
+    @classmethod
+    def from_dict(cls, item):
+        """
+        Builds a record from a dict yielded by a fetch or check function.
+        """
+        record = cls.__new__(cls)
+        record.query = item['query']
+        record.error = item['error']
+        record.no = item['no']
+        record.rev = item['rev']
+        record.desc = item['desc']
+        record.body = item['body']
+        record.url = item['url']
+        if len(item) > len(FETCHED_KEYS):
+            for key in CHECKED_KEYS:
+                if key in item:
+                    setattr(record, key, item[key])
+        return record
+
+    def keys(self) -> list:
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def to_dict(self) -> dict:
+        """
+        Returns the record as a dict with the same keys as the ones yielded by the fetch and check functions.
+        """
+        return {key: getattr(self, key) for key in self.__slots__ if hasattr(self, key)}
+
+    def get(self, key, default=None):
+        if key not in _KEYS:
+            return default
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        if key in _KEYS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in _KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in _KEYS and hasattr(self, key)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, StdRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"StdRecord({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+
+
+def as_records(items):
+    """
+    Yields a :class:`StdRecord` for each dict of an iterable. Records are yielded as they are.
+    """
+    for item in items:
+        yield item if isinstance(item, StdRecord) else StdRecord.from_dict(item)
+
+
+class ActualRecord:
+    """
+    Slotted record of an actual standard method with only the 'no', 'rev' and 'id' keys the check functions read.
+    It supports item access and ``get`` like the actual dicts.
+    """
+    __slots__ = ("no", "rev", "id")
+
+    def __init__(self, no, rev, id=None):
+        self.no = no
+        self.rev = rev
+        self.id = id
+
+    @classmethod
+    def from_dict(cls, item):
+        return cls(item['no'], item['rev'], item.get("id"))
+
+    def to_dict(self) -> dict:
+        return {'no': self.no, 'rev': self.rev, 'id': self.id}
+
+    def get(self, key, default=None):
+        if key not in ActualRecord.__slots__:
+            return default
+        return getattr(self, key)
+
+    def __getitem__(self, key):
+        if key not in ActualRecord.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if isinstance(other, ActualRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ActualRecord({self.to_dict()!r})"
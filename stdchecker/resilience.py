@@ -0,0 +1,286 @@
+"""Retries with backoff, hedged requests and circuit breaking per standard body.
+
+Once a policy is set with :func:`set_resilience`, every request sent to that standard body by the fetch and search
+functions is retried with jittered exponential backoff when it fails with a connection error, a timeout or a 5xx
+status code. A duplicate (hedged) request is sent when a request takes longer than a quantile of the recent response
+times, and the first response wins. After consecutive failures, the circuit breaker of the standard body opens and
+requests fail fast with :class:`CircuitOpenError` until a trial request succeeds.
+"""
+import concurrent.futures
+import logging
+import random
+import threading
+import time
+from collections import deque
+import requests
+from . import metrics
+
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+HEDGE_MAX_WORKERS = 64
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+_policies = dict()
+_policies_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    Raised instead of sending a request while the circuit breaker of a standard body is open. It is a
+    :class:`requests.ConnectionError`, so the search functions report it as a connection error.
+    """
+
+
+class CircuitBreaker:
+    """
+    Opens after a number of consecutive failures and lets a single trial request through after a recovery time.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_time=30.0):
+        """
+        :param failure_threshold: Number of consecutive failures which opens the circuit.
+        :param recovery_time: Seconds to wait before a trial request is allowed through an open circuit.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        'closed', 'open' or 'half-open'.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.recovery_time:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """
+        Checks if a request may be sent. Only one trial request is allowed while the circuit is half-open.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.recovery_time:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                log.info("Circuit breaker is closed.")
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    log.warning(f"Circuit breaker is open after {self.failures} consecutive failures.")
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class LatencyTracker:
+    """
+    Keeps the response times of the recent successful requests.
+    """
+
+    def __init__(self, window=200):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._latencies)
+
+    def add(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def quantile(self, q):
+        """
+        Returns the q-quantile (0 < q < 1) of the recent response times, or None if there are none.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+
+class ResiliencePolicy:
+    """
+    Retry, hedging and circuit breaker settings of a standard body.
+    """
+
+    def __init__(self, retries=2, backoff=0.5, max_backoff=8.0, hedge_quantile=0.95, hedge_min_samples=20,
+                 failure_threshold=5, recovery_time=30.0, timeout=None, window=200):
+        """
+        :param retries: Number of times a failed request is retried.
+        :param backoff: Base delay of the exponential backoff in seconds. The delay before the n-th retry is a
+            random number between 0 and backoff * 2 ** (n - 1).
+        :param max_backoff: Upper bound of the backoff delay in seconds.
+        :param hedge_quantile: A hedged request is sent when a request takes longer than this quantile of the recent
+            response times. If None, requests are not hedged.
+        :param hedge_min_samples: Number of response times needed before requests are hedged.
+        :param failure_threshold: Number of consecutive failures which opens the circuit breaker.
+        :param recovery_time: Seconds to wait before a trial request is allowed through an open circuit breaker.
+        :param timeout: Seconds to wait for the server in each attempt. If None, the timeout of the search functions
+            is used.
+        :param window: Number of recent response times used for the hedging quantile.
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.timeout = timeout
+        self.breaker = CircuitBreaker(failure_threshold, recovery_time)
+        self.latencies = LatencyTracker(window)
+
+    def backoff_delay(self, attempt) -> float:
+        """
+        Returns a jittered delay in seconds before the given retry (starting from 1).
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def hedge_delay(self):
+        """
+        Returns the seconds after which a hedged request is sent, or None if requests are not hedged yet.
+        """
+        if self.hedge_quantile is None or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return self.latencies.quantile(self.hedge_quantile)
+
+    def call(self, send, url=None, body=None):
+        """
+        Calls 'send' with retries, hedging and circuit breaking.
+
+        :param send: A callable which sends the request and returns a :class:`requests.Response` object.
+        :param url: URL of the request, used in log messages.
+        :param body: Name of the standard body, used in metrics.
+        :return: The first successful response, or the last response if all attempts end with a 5xx status code.
+        :raises CircuitOpenError: If the circuit breaker is open.
+        :raises requests.RequestException: If all attempts fail with a connection error or a timeout.
+        """
+        response = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                metrics.count("retry", body)
+                time.sleep(self.backoff_delay(attempt))
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit breaker is open. Request to {url} is not sent.")
+            try:
+                response = self._hedged(send, body)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                self.breaker.record_failure()
+                log.warning(f"Attempt {attempt + 1} of request to {url} failed: {e!r}")
+                if attempt == self.retries:
+                    raise
+                continue
+            except BaseException:
+                # Other errors are not retried, but they must end a trial request of a half-open circuit.
+                self.breaker.record_failure()
+                raise
+            if response.status_code not in RETRY_STATUS_CODES:
+                self.breaker.record_success()
+                return response
+            self.breaker.record_failure()
+            log.warning(f"Attempt {attempt + 1} of request to {url} failed with status code {response.status_code}.")
+            if attempt < self.retries:
+                response.close()
+        return response
+
+    def _timed(self, send):
+        start = time.perf_counter()
+        response = send()
+        if response.status_code not in RETRY_STATUS_CODES:
+            self.latencies.add(time.perf_counter() - start)
+        return response
+
+    def _hedged(self, send, body=None):
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._timed(send)
+        executor = _get_executor()
+        first = executor.submit(self._timed, send)
+        try:
+            return first.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        log.debug(f"Sending a hedged request after {delay:.3f} seconds.")
+        metrics.count("hedge", body)
+        pending = {first, executor.submit(self._timed, send)}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except (requests.Timeout, requests.ConnectionError) as e:
+                    error = e
+                    continue
+                for other in pending | done - {future}:
+                    other.add_done_callback(_close_response)
+                return response
+        raise error
+
+
+def _close_response(future):
+    # Closes the response of a hedged request which lost the race, so that its connection goes back to the pool.
+    try:
+        response = future.result()
+    except Exception:
+        return
+    response.close()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(HEDGE_MAX_WORKERS, thread_name_prefix="stdchecker-hedge")
+        return _executor
+
+
+def set_resilience(body, **kwargs) -> ResiliencePolicy:
+    """
+    Registers retry, hedging and circuit breaker settings for the requests sent to a standard body.
+
+    :param body: Name of the standard body, e.g. 'astm'.
+    :param kwargs: Keyword arguments passed to :class:`ResiliencePolicy`.
+    :return: The registered :class:`ResiliencePolicy` object.
+    """
+    policy = ResiliencePolicy(**kwargs)
+    with _policies_lock:
+        _policies[body] = policy
+    return policy
+
+
+def remove_resilience(body=None):
+    """
+    Removes the policy of a standard body, or all policies if 'body' is None.
+    """
+    with _policies_lock:
+        if body is None:
+            _policies.clear()
+        else:
+            _policies.pop(body, None)
+
+
+def get_resilience(body):
+    """
+    Returns the policy of a standard body or None.
+    """
+    return _policies.get(body)
@@ -0,0 +1,101 @@
+"""Readers of inventories and actual standard methods from files, DB-API cursors and other iterables.
+
+Rows are yielded one at a time, so a large export can be indexed by :class:`ActualCatalog
+<stdchecker.catalog.ActualCatalog>` or merged by :class:`SortedActual <stdchecker.catalog.SortedActual>` without
+loading it into memory first.
+"""
+import csv
+import json
+import os
+from collections.abc import Iterable
+
+FORMATS = ("csv", "ndjson")
+CURSOR_BATCH_SIZE = 1000
+
+
+def input_format(path) -> str:
+    """
+    Returns the format of a file from its extension: 'csv' or 'ndjson' ('.ndjson', '.jsonl' or '.json').
+
+    :raises ValueError: If the extension is not known.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    raise ValueError(f"Unknown format of '{path}'. Expected a .csv, .ndjson or .jsonl file.")
+
+
+def read_rows(f, fmt):
+    """
+    Yields the rows of an open text file as dicts. Empty CSV cells and blank lines are skipped.
+
+    :param f: A text file object.
+    :param fmt: 'csv' or 'ndjson'.
+    :raises ValueError: If a line of an NDJSON file is not valid JSON.
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(f):
+            yield {key: value for key, value in row.items() if key and value not in (None, "")}
+    else:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_no}: {e.msg}.") from None
+
+
+def read_file(path, fmt=None):
+    """
+    Yields the rows of a CSV or NDJSON file as dicts. The file is closed when the rows are exhausted.
+
+    :param path: Path of the file.
+    :param fmt: 'csv' or 'ndjson'. If None, the format is taken from the file extension.
+    """
+    fmt = fmt or input_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        yield from read_rows(f, fmt)
+
+
+def is_cursor(source) -> bool:
+    """
+    Checks if an object looks like a DB-API (PEP 249) cursor.
+    """
+    return hasattr(source, "fetchmany") and hasattr(source, "description")
+
+
+def read_cursor(cursor, size=CURSOR_BATCH_SIZE):
+    """
+    Yields the rows of an executed DB-API cursor as dicts keyed by the lower-cased column names, fetching them in
+    batches.
+
+    :param cursor: A DB-API cursor on which a query has been executed.
+    :param size: Number of rows fetched at a time.
+    """
+    columns = [column[0].lower() for column in cursor.description]
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def iter_source(source):
+    """
+    Returns an iterator of the dicts of a source of actual standard methods or inventory rows.
+
+    :param source: An iterable of dicts, a path of a CSV or NDJSON file (str or path-like) or an executed DB-API cursor.
+    :raises TypeError: If the source is none of those.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return read_file(source)
+    if is_cursor(source):
+        return read_cursor(source)
+    if isinstance(source, Iterable):
+        return iter(source)
+    raise TypeError("Source must be an iterable of dicts, a CSV or NDJSON file path or a DB-API cursor, "
+                    f"{source.__class__.__name__} given.")
@@ -0,0 +1,187 @@
+"""Persistent state of the last fetch and check runs, for re-checking only what may have changed."""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from .record import StdRecord, as_records
+
+DAY = 24 * 60 * 60
+DEFAULT_STALENESS = {
+    'astm': 7 * DAY,
+    'iec': 7 * DAY,
+    'ieee': 7 * DAY,
+    'tse': 7 * DAY,
+}
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+StateEntry = namedtuple("StateEntry", ["results", "fetched_at", "error"])
+
+
+class StateStore:
+    """
+    Stores the fetched results of each query and the outcome of checking each standard method in an SQLite database.
+
+    Results of a query are stale when they are older than the staleness window of their standard body or when
+    fetching them ended with an error. :func:`fetch_incremental` and ``check_all(..., state=store)`` only re-fetch
+    stale queries.
+
+    The store can be shared by threads and used as a context manager.
+    """
+
+    def __init__(self, path, staleness=None):
+        """
+        :param path: Path of the SQLite database file. It is created if it does not exist. ':memory:' can be used
+            for a non-persistent store.
+        :param staleness: Staleness window in seconds. Either a number used for all standard bodies or a dict of
+            standard body names ('astm', 'iec', 'ieee', 'tse') and numbers which overrides :data:`DEFAULT_STALENESS`.
+        """
+        if isinstance(staleness, dict):
+            self.staleness = dict(DEFAULT_STALENESS, **staleness)
+        elif staleness is not None:
+            self.staleness = dict.fromkeys(DEFAULT_STALENESS, staleness)
+        else:
+            self.staleness = dict(DEFAULT_STALENESS)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fetched ("
+                "body TEXT NOT NULL, query TEXT NOT NULL, results TEXT NOT NULL, fetched_at REAL NOT NULL, "
+                "error INTEGER NOT NULL, PRIMARY KEY (body, query))")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS checked ("
+                "body TEXT NOT NULL, query TEXT NOT NULL, no TEXT NOT NULL, rev TEXT, actual TEXT, "
+                "result INTEGER NOT NULL, checked_at REAL NOT NULL, PRIMARY KEY (body, query, no))")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def get(self, body, query):
+        """
+        Returns the last fetched results of a query.
+
+        :param body: Name of the standard body, e.g. 'astm'.
+        :param query: Query string.
+        :return: A :class:`StateEntry` or None if the query has not been fetched.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT results, fetched_at, error FROM fetched WHERE body = ? AND query = ?",
+                (body, str(query))).fetchone()
+        if row is None:
+            return None
+        return StateEntry(json.loads(row[0]), row[1], bool(row[2]))
+
+    def is_stale(self, body, entry) -> bool:
+        """
+        Checks if a state entry ended with an error or is older than the staleness window of its standard body.
+        """
+        return entry is None or entry.error or time.time() - entry.fetched_at >= self.staleness.get(body, 0)
+
+    def partition(self, body, query_list):
+        """
+        Splits queries into the ones whose stored results can be reused and the ones to be fetched again.
+
+        :return: A (list of stored result dicts, list of stale queries) tuple.
+        """
+        reused = list()
+        stale = list()
+        for query in query_list:
+            entry = self.get(body, query)
+            if self.is_stale(body, entry):
+                stale.append(query)
+            else:
+                reused.extend(entry.results)
+        return reused, stale
+
+    def record_fetched(self, body, query, results):
+        """
+        Stores the fetched results of a query.
+
+        :param body: Name of the standard body, e.g. 'astm'.
+        :param query: Query string.
+        :param results: A list of dicts or :class:`StdRecord <stdchecker.record.StdRecord>` objects yielded by a fetch
+            function for the query.
+        """
+        error = any(i['error'] is not None for i in results) or not results
+        results = [i.to_dict() if isinstance(i, StdRecord) else i for i in results]
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO fetched VALUES (?, ?, ?, ?, ?)",
+                                     (body, str(query), json.dumps(results), time.time(), int(error)))
+
+    def record_checked(self, checked):
+        """
+        Stores the outcome of checking standard methods.
+
+        :param checked: An iterable of dicts yielded by a check function.
+        """
+        now = time.time()
+        rows = [(i['body'], str(i['query']), i['no'] or "", i['rev'], i['actual'], int(bool(i['check'])), now)
+                for i in checked]
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO checked VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def checks(self, body=None) -> list:
+        """
+        Returns the last outcome of checking each standard method as dicts with 'body', 'query', 'no', 'rev',
+        'actual', 'check' and 'checked_at' keys.
+        """
+        sql = "SELECT body, query, no, rev, actual, result, checked_at FROM checked"
+        with self._lock:
+            if body is None:
+                rows = self._connection.execute(sql).fetchall()
+            else:
+                rows = self._connection.execute(f"{sql} WHERE body = ?", (body,)).fetchall()
+        return [{'body': row[0], 'query': row[1], 'no': row[2] or None, 'rev': row[3], 'actual': row[4],
+                 'check': bool(row[5]), 'checked_at': row[6]} for row in rows]
+
+    def clear(self, body=None):
+        """
+        Deletes all entries or the entries of a standard body.
+        """
+        with self._lock, self._connection:
+            for table in ("fetched", "checked"):
+                if body is None:
+                    self._connection.execute(f"DELETE FROM {table}")
+                else:
+                    self._connection.execute(f"DELETE FROM {table} WHERE body = ?", (body,))
+
+
+def fetch_incremental(fetch_func, body, query_list, store, **kwargs):
+    """
+    Yields the stored results of the queries which are not stale, then fetches the stale queries and stores their
+    results.
+
+    :param fetch_func: Fetch function of the standard body, e.g. :func:`stdchecker.astm.fetch_astm`.
+    :param body: Name of the standard body, e.g. 'astm'.
+    :param query_list: List of queries.
+    :param store: A :class:`StateStore` object.
+    :param kwargs: Other keyword arguments passed to the fetch function, e.g. 'max_workers' or 'compact'.
+    :return: A generator that yields dicts in the same form as the fetch function.
+    """
+    if isinstance(query_list, str):
+        query_list = [query_list]
+    reused, stale = store.partition(body, [str(i) for i in query_list])
+    log.info(f"Reusing stored results of {len(query_list) - len(stale)} {body} queries, fetching {len(stale)}.")
+    yield from as_records(reused) if kwargs.get("compact") else reused
+    if not stale:
+        return
+    results = {query: list() for query in stale}
+    for fetched_item in fetch_func(stale, **kwargs):
+        results.setdefault(str(fetched_item['query']), list()).append(fetched_item)
+        yield fetched_item
+    for query, query_results in results.items():
+        store.record_fetched(body, query, query_results)
@@ -0,0 +1,180 @@
+"""Single request path shared by the search functions of all standard bodies."""
+import json
+import logging
+import time
+from datetime import timedelta
+from functools import partial
+from . import metrics
+from .ratelimit import get_limiter, parse_retry_after, THROTTLE_STATUS_CODES
+
+log = logging.getLogger(__name__)
+# log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
+
+
+class CachedResponse:
+    """
+    A minimal stand-in for :class:`requests.Response` built from a cached response text.
+    """
+    status_code = 200
+    from_cache = True
+
+    def __init__(self, text):
+        self.text = text
+        self.headers = dict()
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        pass
+
+
+def _measure(send, url, body, key, **kwargs):
+    """
+    Sends a request and records its wait and download spans and its size if an instrument is set.
+    """
+    instrument = metrics.get_instrument()
+    if instrument is None:
+        return send(url, **kwargs)
+    start = time.perf_counter()
+    response = send(url, **kwargs)
+    total = time.perf_counter() - start
+    # Response.elapsed is the time until the headers are parsed. The content is read after that.
+    elapsed = getattr(response, "elapsed", None)
+    wait = min(total, elapsed.total_seconds()) if isinstance(elapsed, timedelta) else total
+    instrument.record_span("wait", body, key, wait)
+    instrument.record_span("download", body, key, total - wait)
+    # The content of a streamed response is read by the caller. Reading it here would download the whole body.
+    content = None if kwargs.get("stream") else getattr(response, "content", None)
+    if isinstance(content, bytes):
+        instrument.record_count("bytes", body, len(content))
+    return response
+
+
+def _send(session, method, url, body, key, **kwargs):
+    """
+    Sends a request through the rate limiter of the standard body, if there is one. Throttled requests are retried
+    after the limiter backs off. If the last retry is throttled too, :class:`requests.ConnectionError` is raised, so
+    the search functions report a connection error rather than a missing page.
+    """
+    import requests
+    send = session.get if method == "GET" else session.post
+    limiter = get_limiter(body)
+    if limiter is None:
+        return _measure(send, url, body, key, **kwargs)
+    for attempt in range(limiter.max_retries + 1):
+        if attempt:
+            metrics.count("retry", body)
+        limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = _measure(send, url, body, key, **kwargs)
+        except (requests.Timeout, requests.ConnectionError):
+            limiter.release(throttled=True)
+            raise
+        except BaseException:
+            limiter.release()
+            raise
+        if response.status_code not in THROTTLE_STATUS_CODES:
+            limiter.release(latency=time.perf_counter() - start)
+            return response
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        limiter.release(throttled=True, retry_after=retry_after)
+        log.warning(f"Request to {url} is throttled with status code {response.status_code}.")
+        response.close()
+    raise requests.ConnectionError(f"Request to {url} is still throttled after {limiter.max_retries} retries.",
+                                   response=response)
+
+
+def _call(session, method, url, body, key, **kwargs):
+    """
+    Sends a request through the resilience policy of the standard body, if there is one.
+    """
+    from .resilience import get_resilience
+    policy = get_resilience(body)
+    if policy is None:
+        return _send(session, method, url, body, key, **kwargs)
+    if policy.timeout is not None:
+        kwargs['timeout'] = policy.timeout
+    return policy.call(partial(_send, session, method, url, body, key, **kwargs), url, body=body)
+
+
+def request(session, method, url, body=None, key=None, cache=None, **kwargs):
+    """
+    Sends a request with the session and raises :class:`requests.HTTPError` for error status codes.
+
+    If a cache is given, a fresh cached response is returned without sending a request. A stale cached response of a
+    GET request is revalidated with 'If-None-Match' and 'If-Modified-Since' headers and returned if the server
+    responds with 304 Not Modified.
+
+    If a rate limiter is set for the standard body with :func:`stdchecker.ratelimit.set_rate_limit`, the request waits
+    for the limiter, and throttled requests are retried. If a policy is set with
+    :func:`stdchecker.resilience.set_resilience`, failed requests are retried with backoff, slow requests are hedged and
+    requests fail fast with :class:`stdchecker.resilience.CircuitOpenError` while the circuit breaker is open. If an
+    instrument is set with :func:`stdchecker.metrics.set_instrument`, spans and counters of the request are recorded.
+
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param method: 'GET' or 'POST'.
+    :param url: URL of the request.
+    :param body: Name of the standard body, e.g. 'astm'. Required if 'cache' is given or for rate limiting.
+    :param key: Query string which identifies the response in the cache. Required if 'cache' is given.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object or None.
+    :param kwargs: Other keyword arguments passed to the session's request method, e.g. 'data' and 'timeout'.
+    :return: A :class:`requests.Response` or a :class:`CachedResponse` object.
+    """
+    import requests
+    instrument = metrics.get_instrument()
+    if instrument is None:
+        return _request(session, method, url, body, key, cache, **kwargs)
+    start = time.perf_counter()
+    try:
+        return _request(session, method, url, body, key, cache, **kwargs)
+    except requests.RequestException:
+        instrument.record_count("error", body, 1)
+        raise
+    finally:
+        instrument.record_span("request", body, key, time.perf_counter() - start)
+
+
+def _raise_for_status(response):
+    """
+    Raises :class:`requests.HTTPError` for error status codes. The response is closed first, so that the connection of
+    an unread (streamed) response goes back to the pool.
+    """
+    try:
+        response.raise_for_status()
+    except Exception:
+        response.close()
+        raise
+
+
+def _request(session, method, url, body, key, cache, **kwargs):
+    if cache is None:
+        response = _call(session, method, url, body, key, **kwargs)
+        _raise_for_status(response)
+        return response
+    entry = cache.get(body, key)
+    if entry is None:
+        metrics.count("cache_miss", body)
+    else:
+        if cache.is_fresh(body, entry):
+            log.debug(f"Fresh cache hit for {body} '{key}'.")
+            metrics.count("cache_hit", body)
+            return CachedResponse(entry.text)
+        if method == "GET" and (entry.etag or entry.last_modified):
+            headers = dict(kwargs.pop("headers", None) or {})
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+            kwargs['headers'] = headers
+    response = _call(session, method, url, body, key, **kwargs)
+    if entry is not None and response.status_code == 304:
+        log.debug(f"Revalidated cache entry for {body} '{key}'.")
+        metrics.count("cache_revalidated", body)
+        cache.touch(body, key)
+        return CachedResponse(entry.text)
+    _raise_for_status(response)
+    cache.set(body, key, response.text, etag=response.headers.get("ETag"),
+              last_modified=response.headers.get("Last-Modified"))
+    return response
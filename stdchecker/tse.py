@@ -2,110 +2,269 @@
 up to date.
 """
 import logging
-import requests
-from datetime import date
+from functools import partial
 from collections.abc import Iterable
-from bs4 import BeautifulSoup
+from .catalog import as_catalog
+from .parsers import make_soup
+from .pool import session_scope, map_queries, map_parsed
+from .transport import request
+from .record import StdRecord
+from .normalize import normalize_tse_rev
+from .metrics import count, span, timed, timed_items
 
 TSE_SEARCH_URL = "https://intweb.tse.org.tr/Standard/Standard/StandardAra.aspx"
 log = logging.getLogger(__name__)
 # log.addHandler(logging.NullHandler()) is not necessary. Parent's handler is already NullHandler.
 
 
-def search_tse(query_item, session) -> list:
+def tse_form_data(query_item) -> dict:
     """
-    Gets query results of the TSE search engine.
+    Returns the form data posted to the TSE search engine.
 
     :param query_item: Designation or number of the standard method to be searched.
-    :param session: A :ref:`Session <requests.Session>` object.
-    :return: A list of dicts containing search results.
+    :return: A dict of form fields.
     """
-    found_list = list()
-    query_item = str(query_item)
-    data = {
+    return {
         "__EVENTTARGET": "ctl00$cph1$lnkAra",
         "__EVENTARGUMENT": "",
-        "ctl00$cph1$txtTsNo": query_item,
+        "ctl00$cph1$txtTsNo": str(query_item),
         # "ctl00$cph1$StdAramaTip": "rdEsit" not working!
     }
+
+
+def _tse_rows(html) -> list:
+    """
+    Extracts (number, revision, description) tuples of the standard methods in a TSE search results page. Withdrawn
+    ("İptal Standard") ones are excluded.
+    """
+    rows = list()
+    soup = make_soup(html, only="tr")
+    search_result_items = soup.find_all("tr", {'class': ["grvRowStyle", "grvAlternatingRowStyle"]})
+    log.debug(f"Found {len(search_result_items)=}.")
+    for item in search_result_items:
+        td = item.find_all("td")
+        std_number = ""
+        for span_item in td[2].find_all("span"):
+            if span_item.get("id", "").startswith("cph1_grvStandard_lblTsNo"):
+                std_number = span_item.text
+            if span_item.get("id", "").startswith("cph1_grvStandard_lblBaslik"):
+                std_desc = span_item.contents[1].strip().replace("\r\n", " ")
+        if std_number == "" or "İptal Standard" in std_number:
+            continue
+        # Plain strings are stored, since a NavigableString keeps the whole tree alive (e.g. when it is pickled).
+        std_rev = td[3].string
+        rows.append((std_number, None if std_rev is None else str(std_rev), std_desc))
+    return rows
+
+
+def select_tse(query_item, rows) -> list:
+    """
+    Selects the standard methods matching a query among the rows of TSE search results pages.
+
+    :param query_item: Designation or number of the standard method which is searched.
+    :param rows: A list of (number, revision, description) tuples.
+    :return: A list of dicts containing search results.
+    """
+    found_list = list()
+    query_item = str(query_item)
+    for std_number, std_rev, std_desc in rows:
+        if query_item != std_number:
+            std_number_split = std_number.split(" ")[0].split(":")[0].split("/")[0]
+            if query_item != std_number_split:
+                continue
+        found_list.append(
+            {'query': query_item, 'error': None, 'no': std_number, 'rev': std_rev, 'desc': std_desc,
+             'body': "tse", 'url': TSE_SEARCH_URL})
+    if found_list:
+        return found_list
+    else:
+        return [{'query': query_item, 'error': "Not found", 'no': None, 'rev': None, 'desc': None,
+                 'body': "tse", 'url': None}]
+
+
+@timed("parse", "tse")
+def parse_tse(query_item, html) -> list:
+    """
+    Extracts standard method data from a TSE search results page.
+
+    :param query_item: Designation or number of the standard method which is searched.
+    :param html: HTML content of the search results page.
+    :return: A list of dicts containing search results.
+    """
+    query_item = str(query_item)
+    try:
+        rows = _tse_rows(html)
+    except (AttributeError, IndexError):
+        log.exception("An exception has occurred while parsing HTML data. TSE search page content may have changed.")
+        count("parse_error", "tse")
+        return [{'query': query_item, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "tse", 'url': None}]
+    return select_tse(query_item, rows)
+
+
+def download_tse(query_item, session, cache=None):
+    """
+    Gets the search results page of a query from the TSE search engine without parsing it.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A (query, HTML) tuple of the arguments of :func:`parse_tse`, or a list containing a single error dict if
+        the request failed.
+    """
+    import requests
+    query_item = str(query_item)
+    data = tse_form_data(query_item)
     url = TSE_SEARCH_URL
     try:
-        response = session.post(url, data=data, timeout=10)
-        response.raise_for_status()
+        response = request(session, "POST", url, body="tse", key=query_item, cache=cache, data=data,
+                           timeout=10)
     except requests.RequestException:
         log.exception("Request exception has occurred.")
         return [{'query': query_item, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
                  'body': "tse", 'url': None}]
-    html = response.text
-    soup = BeautifulSoup(html, "html.parser")
+    return query_item, response.text
+
+
+def search_tse(query_item, session, cache=None) -> list:
+    """
+    Gets query results of the TSE search engine.
+
+    :param query_item: Designation or number of the standard method to be searched.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A list of dicts containing search results.
+    """
+    downloaded = download_tse(query_item, session, cache=cache)
+    if isinstance(downloaded, list):
+        return downloaded
+    return parse_tse(*downloaded)
+
+
+def tse_stem(query_item) -> str:
+    """
+    Returns the number of a standard method without its part number, e.g. 'TS EN 60076' for 'TS EN 60076-10-1'.
+    """
+    words = str(query_item).split(" ")
+    words[-1] = words[-1].split("-")[0]
+    return " ".join(words)
+
+
+def plan_tse_searches(query_list) -> list:
+    """
+    Groups queries sharing the same stem, so that a single search is sent for all parts of a multi-part standard.
+
+    :param query_list: An iterable of query strings.
+    :return: A list of (search key, list of queries) tuples in the order of the first query of each group. The search
+        key of a group with a single query is the query itself.
+    """
+    groups = dict()
+    for query in query_list:
+        query = str(query)
+        groups.setdefault(tse_stem(query), list()).append(query)
+    return [(stem, queries) if len(queries) > 1 else (queries[0], queries) for stem, queries in groups.items()]
+
+
+def search_tse_group(group, session, cache=None) -> list:
+    """
+    Gets query results of a group of queries from the TSE search engine with a single search of their common stem.
+    The rows of the results page are parsed once and every query is answered from them. Queries without a match in the
+    results are searched one by one.
+
+    :param group: A (search key, list of queries) tuple returned by :func:`plan_tse_searches`.
+    :param session: A :ref:`Session <requests.Session>` object.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :return: A list of dicts containing search results.
+    """
+    import requests
+    search_key, queries = group
+    if len(queries) == 1:
+        return search_tse(queries[0], session, cache=cache)
     try:
-        search_result_items = soup.find_all("tr", {'class': ["grvRowStyle", "grvAlternatingRowStyle"]})
-        log.debug(f"Found {len(search_result_items)=}.")
-        for item in search_result_items:
-            td = item.find_all("td")
-            std_number = ""
-            for span_item in td[2].find_all("span"):
-                if span_item.get("id", "").startswith("cph1_grvStandard_lblTsNo"):
-                    std_number = span_item.text
-                if span_item.get("id", "").startswith("cph1_grvStandard_lblBaslik"):
-                    std_desc = span_item.contents[1].strip().replace("\r\n", " ")
-            if std_number == "":
-                continue
-            std_rev = td[3].string
-            std_url = TSE_SEARCH_URL
-            if query_item != std_number:
-                std_number_split = std_number.split(" ")[0].split(":")[0].split("/")[0]
-                if query_item != std_number_split:
-                    continue
-            if "İptal Standard" in std_number:
-                continue
-            found_list.append(
-                {'query': query_item, 'error': None, 'no': std_number, 'rev': std_rev, 'desc': std_desc,
-                 'body': "tse", 'url': std_url})
+        response = request(session, "POST", TSE_SEARCH_URL, body="tse", key=search_key, cache=cache,
+                           data=tse_form_data(search_key), timeout=10)
+    except requests.RequestException:
+        log.exception("Request exception has occurred.")
+        return [{'query': query, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "tse", 'url': None} for query in queries]
+    try:
+        with span("parse", "tse", search_key):
+            rows = _tse_rows(response.text)
     except (AttributeError, IndexError):
         log.exception("An exception has occurred while parsing HTML data. TSE search page content may have changed.")
-        return [{'query': query_item, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None,
-                 'body': "tse", 'url': None}]
-    if found_list:
-        return found_list
-    else:
-        return [{'query': query_item, 'error': "Not found", 'no': None, 'rev': None, 'desc': None,
-                 'body': "tse", 'url': None}]
+        count("parse_error", "tse")
+        return [{'query': query, 'error': "Data parsing error", 'no': None, 'rev': None, 'desc': None,
+                 'body': "tse", 'url': None} for query in queries]
+    found_list = list()
+    for query in queries:
+        selected_list = select_tse(query, rows)
+        if selected_list[0]['error'] is None:
+            found_list.extend(selected_list)
+        else:
+            found_list.extend(search_tse(query, session, cache=cache))
+    return found_list
 
 
-def fetch_tse(query_list):
+def fetch_tse(query_list, max_workers=None, ordered=True, cache=None, batch=False, compact=False, parse_workers=None,
+              parse_chunksize=None, session=None):
     """
     Fetches data of the latest revision of standard methods from the TSE search engine.
 
     :param query_list: A string or an iterable object contains query strings. A query string should be designation
         (or number) of a standard method.
+    :param max_workers: Number of threads sending requests concurrently. If None, queries are sent one at a time.
+    :param ordered: If True, results are yielded in the order of 'query_list', otherwise as soon as they are ready.
+    :param cache: A :class:`ResponseCache <stdchecker.cache.ResponseCache>` object. If given, cached responses are
+        used instead of sending requests while they are fresh.
+    :param batch: If True, queries sharing the same stem (e.g. 'TS EN 60076-1', 'TS EN 60076-11') are searched
+        together with a single search of the stem. Results are yielded group by group in the order of the first query
+        of each group.
+    :param compact: If True, :class:`StdRecord <stdchecker.record.StdRecord>` objects are yielded instead of dicts.
+    :param parse_workers: Number of processes parsing the downloaded pages. If given, pages are downloaded by the
+        threads and parsed on a process pool (see :func:`stdchecker.pool.map_parsed`). Ignored if 'batch' is True.
+    :param parse_chunksize: Number of pages sent to a parsing process at a time.
+    :param session: A :ref:`Session <requests.Session>` object owned by the caller, which is reused and not closed.
+        If None, the session set with :func:`stdchecker.pool.set_shared_session` is used, or a session without the
+        library's user agent is created for the call. Headers of a given or shared session are sent as they are.
     :return: A generator that yields dicts containing data of the latest standard method(s).
     """
     if isinstance(query_list, str):
         query_list = (query_list,)
     if not isinstance(query_list, Iterable):
         raise TypeError(f"Argument must be a string or an iterable object, {query_list.__class__.__name__} given.")
-    with requests.Session() as session:
-        for query in query_list:
-            query = str(query)
-            found_list = search_tse(query, session)
+    if batch:
+        query_list = plan_tse_searches(query_list)
+    with session_scope(session, max_workers, user_agent=False) as session:
+        if parse_workers and not batch:
+            found_lists = map_parsed(partial(download_tse, cache=cache), parse_tse, query_list, session,
+                                     max_workers=max_workers, parse_workers=parse_workers, chunksize=parse_chunksize,
+                                     ordered=ordered, body="tse")
+        else:
+            search = partial(search_tse_group if batch else search_tse, cache=cache)
+            found_lists = map_queries(search, query_list, session, max_workers=max_workers, ordered=ordered)
+        for found_list in found_lists:
             for found_item in found_list:
-                if found_item['error'] is None:
-                    if "İptal Standard" not in found_item['no']:
-                        yield found_item
-                else:
-                    yield found_item
+                if found_item['error'] is None and "İptal Standard" in found_item['no']:
+                    continue
+                yield StdRecord.from_dict(found_item) if compact else found_item
     return
 
 
+@timed_items("check", "tse")
 def check_tse(fetched: Iterable, actual: list, id_from_actual=False):
     """
     Checks the revision status of actual standard methods.
 
     :param fetched: An iterable of dicts containing the latest revision data. Dict should include at least 'no' and
         'rev' keys for comparison and an 'error' key to indicate the status of the TSE search engine's result.
-    :param actual: A list of dicts containing actual revision data. Dict should include at least 'no' and 'rev' keys
-        for comparison.
+        :class:`StdRecord <stdchecker.record.StdRecord>` objects are updated in place and yielded instead of copied.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor. Dict should include
+        at least 'no' and 'rev' keys for comparison.
     :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
     :return: A generator that yields dicts containing comparison data. Includes all items and keys from
         the fetched dict, 'rev' key from the actual dict as 'actual' and 'check' key which is the comparison result
@@ -113,40 +272,27 @@ def check_tse(fetched: Iterable, actual: list, id_from_actual=False):
     """
     if not isinstance(fetched, Iterable):
         raise TypeError("'fetched' argument must be an iterable of dicts.")
-    if not isinstance(actual, (list, tuple)):
-        raise TypeError("'actual' argument must be a list or a tuple of dicts.")
+    actual = as_catalog(actual)
     for fetched_item in fetched:
-        checked_item = dict(fetched_item)
+        # Records are updated in place, dicts are copied.
+        checked_item = fetched_item if isinstance(fetched_item, StdRecord) else dict(fetched_item)
+        actual_item = None
         if fetched_item['error'] is None:
-            expected_no = fetched_item['no']
-            actual_item = next((i for i in actual if i['no'] == expected_no), None)
-            if actual_item:
-                fetched_rev = fetched_item['rev']
-                _ = fetched_rev.split(".")
-                fetched_rev_date = date(int(_[2]), int(_[1]), int(_[0]))
-                actual_rev = actual_item['rev']
-                _ = actual_rev.split(".")
-                actual_rev_date = date(int(_[2]), int(_[1]), int(_[0]))
-                if fetched_rev_date == actual_rev_date:
-                    checked_item['check'] = True
-                else:
-                    checked_item['check'] = False
-                checked_item['actual'] = actual_rev
-                if id_from_actual:
-                    checked_item['id'] = actual_item.get("id")
-                yield checked_item
+            actual_item, actual_rev_key = actual.lookup(fetched_item['no'], normalize_tse_rev)
+        if actual_item is not None:
+            if normalize_tse_rev(fetched_item['rev']) == actual_rev_key:
+                checked_item['check'] = True
             else:
-                checked_item['actual'] = "Yok"
                 checked_item['check'] = False
-                if id_from_actual:
-                    checked_item['id'] = None
-                yield checked_item
+            checked_item['actual'] = actual_item['rev']
+            if id_from_actual:
+                checked_item['id'] = actual_item.get("id")
         else:
             checked_item['actual'] = "Yok"
             checked_item['check'] = False
             if id_from_actual:
                 checked_item['id'] = None
-            yield checked_item
+        yield checked_item
     return
 
 
@@ -156,8 +302,10 @@ def check_tse_as_list(fetched: Iterable, actual: list, id_from_actual=False) ->
 
     :param fetched: An iterable of dicts containing latest the revision data. Dict should include at least 'no' and
         'rev' keys for comparison and an 'error' key to indicate the status of the TSE search engine's result.
-    :param actual: A list of dicts containing actual revision data. Dict should include at least 'no' and 'rev' keys
-        for comparison.
+    :param actual: A list of dicts containing the actual revision data, an
+        :class:`ActualCatalog <stdchecker.catalog.ActualCatalog>` built from them or another source accepted by
+        :func:`as_catalog <stdchecker.catalog.as_catalog>`, e.g. a CSV file path or a DB-API cursor. Dict should include
+        at least 'no' and 'rev' keys for comparison.
     :param id_from_actual: If True, 'id' key from the actual dict will be included in the resulting dict.
     :return: A list of dicts containing comparison data. The dict includes all items and keys from
         the fetched dict, 'rev' key from actual dict as 'actual' and 'check' key which is the comparison result
@@ -0,0 +1,136 @@
+import os
+import json
+import asyncio
+import unittest
+try:
+    import httpx
+    from stdchecker.aio import (fetch_astm_async, fetch_iec_async, fetch_ieee_async, fetch_tse_async,
+                                check_astm_async, map_queries_async, create_client)
+except ImportError:
+    httpx = None
+from stdchecker.astm import check_astm
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def mock_client(text=None, status_code=200, exception=None):
+    requests = list()
+
+    def handler(request):
+        requests.append(request)
+        if exception:
+            raise exception
+        return httpx.Response(status_code, text=text)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.sent_requests = requests
+    return client
+
+
+async def collect(async_iterable):
+    return [i async for i in async_iterable]
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_fetch_astm(self):
+        async with mock_client(read_webdata("D92.html")) as client:
+            std_list = await collect(fetch_astm_async("D92", client=client))
+        self.assertEqual(1, len(std_list))
+        self.assertEqual("ASTM D92", std_list[0]['no'])
+        self.assertEqual("18", std_list[0]['rev'])
+        self.assertEqual("https://www.astm.org/Standards/D92.htm", std_list[0]['url'])
+
+    async def test_fetch_astm_not_found_error(self):
+        async with mock_client("", status_code=404) as client:
+            std_list = await collect(fetch_astm_async("BAD D92", client=client))
+        self.assertEqual("Not found", std_list[0]['error'])
+
+    async def test_fetch_astm_redirect(self):
+        def handler(request):
+            if request.url.path == "/Standards/D92.htm":
+                return httpx.Response(301, headers={'Location': "https://www.astm.org/d0092-18.html"})
+            return httpx.Response(200, text=read_webdata("D92.html"))
+
+        async with create_client(transport=httpx.MockTransport(handler)) as client:
+            std_list = await collect(fetch_astm_async("D92", client=client))
+        self.assertEqual(None, std_list[0]['error'])
+        self.assertEqual("18", std_list[0]['rev'])
+
+    async def test_fetch_connection_error(self):
+        async with mock_client(exception=httpx.ConnectError("connection error side effect")) as client:
+            for func in (fetch_astm_async, fetch_iec_async, fetch_ieee_async, fetch_tse_async):
+                std_list = await collect(func("60296", client=client))
+                self.assertEqual(1, len(std_list))
+                self.assertEqual("Connection error", std_list[0]['error'])
+
+    async def test_fetch_iec(self):
+        async with mock_client(read_webdata("60296.html")) as client:
+            std_list = await collect(fetch_iec_async("60296", client=client))
+        self.assertEqual(1, len(std_list))
+        self.assertEqual("IEC 60296", std_list[0]['no'])
+        self.assertEqual("2020", std_list[0]['rev'])
+
+    async def test_fetch_ieee(self):
+        async with mock_client(read_webdata("ieee_search.json")) as client:
+            std_list = await collect(fetch_ieee_async("C57.104", client=client))
+            self.assertEqual("C57.104", httpx.QueryParams(client.sent_requests[0].content.decode())['q'])
+        self.assertEqual(1, len(std_list))
+        self.assertEqual("IEEE C57.104", std_list[0]['no'])
+        self.assertEqual("2019", std_list[0]['rev'])
+
+    async def test_fetch_tse(self):
+        async with mock_client(read_webdata("tse.html")) as client:
+            std_list = await collect(fetch_tse_async("TS EN IEC 60296", client=client))
+        self.assertEqual(1, len(std_list))
+        self.assertEqual("09.11.2020", std_list[0]['rev'])
+
+    async def test_fetch_same_schema_as_sync(self):
+        async with mock_client("Bad webpage") as client:
+            std_list = await collect(fetch_astm_async(["D92", "D93"], client=client))
+        self.assertEqual(2, len(std_list))
+        self.assertEqual({"D92", "D93"}, {i['query'] for i in std_list})
+        self.assertTrue(all(i['error'] == "Data parsing error" for i in std_list))
+        self.assertEqual(["query", "error", "no", "rev", "desc", "body", "url"], list(std_list[0].keys()))
+
+    async def test_fetch_type_error(self):
+        with self.assertRaises(TypeError):
+            await collect(fetch_astm_async(92))
+
+    async def test_map_queries_async_concurrency(self):
+        in_flight = list()
+        peak = list()
+
+        async def func(query, client):
+            in_flight.append(query)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(query)
+            return query
+
+        result = await collect(map_queries_async(func, range(10), None, concurrency=3))
+        self.assertEqual(list(range(10)), sorted(result))
+        self.assertEqual(3, max(peak))
+
+    async def test_check(self):
+        with open(os.path.join(MODULE_PATH, "data/astm_fetched.json"), "r", encoding="utf-8") as f:
+            fetched = json.load(f)
+        with open(os.path.join(MODULE_PATH, "data/astm_actual.json"), "r", encoding="utf-8") as f:
+            actual = json.load(f)
+
+        async def fetched_async():
+            for i in fetched:
+                yield i
+
+        expected_check = list(check_astm(fetched, actual, id_from_actual=True))
+        self.assertEqual(expected_check, await collect(check_astm_async(fetched_async(), actual, True)))
+        self.assertEqual(expected_check, await collect(check_astm_async(fetched, actual, True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,9 @@
 import os
 import json
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 from requests import Session, ConnectionError, HTTPError
-from stdchecker.astm import fetch_astm, check_astm, check_astm_as_list
+from stdchecker.astm import fetch_astm, check_astm, check_astm_as_list, parse_astm, read_astm_stream
 
 MODULE_PATH = os.path.dirname(__file__)
 
@@ -66,6 +66,55 @@ class TestCase(unittest.TestCase):
         self.assertEqual("astm", std['body'])
         self.assertEqual(None, std['url'])
 
+    @patch.object(Session, "get")
+    def test_fetch_stream(self, mock_get):
+        with open(os.path.join(MODULE_PATH, "webdata/D92.html"), "rb") as f:
+            content = f.read()
+        chunks = [content[i:i + 8192] for i in range(0, len(content), 8192)]
+        read = list()
+
+        def iter_content(chunk_size):
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+
+        mock_get.return_value = MagicMock(status_code=200, encoding="utf-8", iter_content=iter_content)
+        std = list(fetch_astm("D92", stream=True))[0]
+        self.assertTrue(mock_get.call_args.kwargs['stream'])
+        self.assertEqual(("ASTM D92", "18"), (std['no'], std['rev']))
+        self.assertEqual("Standard Test Method for Flash and Fire Points by Cleveland Open Cup Tester", std['desc'])
+        self.assertLess(len(read), len(chunks) / 2)
+        mock_get.return_value.close.assert_called_once()
+
+    @patch.object(Session, "get")
+    def test_fetch_stream_http_error(self, mock_get):
+        mock_get.return_value.raise_for_status.side_effect = HTTPError()
+        std = list(fetch_astm("D9999", stream=True))[0]
+        self.assertEqual("Not found", std['error'])
+        mock_get.return_value.close.assert_called_once()
+
+    def test_read_stream_not_found(self):
+        response = MagicMock(encoding=None, iter_content=lambda chunk_size: iter([b"<html>", b"<b>D92</b></html>"]))
+        self.assertEqual("<html><b>D92</b></html>", read_astm_stream(response))
+        response.close.assert_called_once()
+
+    def test_parse_fallback(self):
+        html = '<b class="sku">ASTM&nbsp;D92-18</b><b class="name"><i>Flash</i> Point</b>'
+        self.assertEqual("Flash Point", parse_astm("D92", html, None)[0]['desc'])
+        self.assertEqual("18", parse_astm("D92", html.replace("&nbsp;", " "), None)[0]['rev'])
+
+    def test_parse_first_element(self):
+        # The first title holds markup, so the regular expression must not skip to the later plain one.
+        html = ('<b class="sku">ASTM D92-18</b><b class="name">Flash <i>and</i> Fire</b>'
+                '<b class="name">Related standard</b>')
+        self.assertEqual("Flash and Fire", parse_astm("D92", html, None)[0]['desc'])
+        html = '<b class="sku extra">ASTM D92-18</b><b class="product-name">Other</b><b class="name">Flash Point</b>'
+        self.assertEqual(("18", "Flash Point"), tuple(parse_astm("D92", html, None)[0][i] for i in ("rev", "desc")))
+        response = MagicMock(encoding="utf-8", iter_content=lambda chunk_size: iter(
+            [b'<b class="sku">ASTM D92-18</b><b class="name">Flash <i>and</i>', b' Fire</b><b class="name">Other</b>']))
+        self.assertEqual('<b class="sku">ASTM D92-18</b><b class="name">Flash <i>and</i> Fire</b>',
+                         read_astm_stream(response))
+
     def test_fetch_type_error(self):
         with self.assertRaises(TypeError):
             list(fetch_astm(92))
@@ -0,0 +1,94 @@
+import os
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session
+from stdchecker.cache import ResponseCache, normalize_key
+from stdchecker.astm import fetch_astm
+from stdchecker.tse import fetch_tse
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(":memory:")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_normalize_key(self):
+        self.assertEqual("TS EN IEC 60296", normalize_key(" ts  en iec 60296"))
+
+    def test_set_get(self):
+        self.assertIsNone(self.cache.get("astm", "D92"))
+        self.cache.set("astm", "D92", "html", etag='"abc"')
+        entry = self.cache.get("astm", "d92")
+        self.assertEqual("html", entry.text)
+        self.assertEqual('"abc"', entry.etag)
+        self.assertTrue(self.cache.is_fresh("astm", entry))
+        self.assertIsNone(self.cache.get("iec", "D92"))
+        self.cache.clear("astm")
+        self.assertIsNone(self.cache.get("astm", "D92"))
+
+    def test_ttl(self):
+        cache = ResponseCache(":memory:", ttl={'astm': 0})
+        cache.set("astm", "D92", "html")
+        cache.set("iec", "60296", "html")
+        self.assertFalse(cache.is_fresh("astm", cache.get("astm", "D92")))
+        self.assertTrue(cache.is_fresh("iec", cache.get("iec", "60296")))
+        cache.close()
+
+    def test_eviction(self):
+        cache = ResponseCache(":memory:", max_size=10)
+        cache.set("astm", "D92", "12345")
+        time.sleep(0.01)
+        cache.set("astm", "D93", "12345")
+        time.sleep(0.01)
+        cache.get("astm", "D92")
+        cache.set("astm", "D97", "12345")
+        self.assertIsNotNone(cache.get("astm", "D92"))
+        self.assertIsNone(cache.get("astm", "D93"))
+        self.assertEqual(10, cache.size())
+        cache.close()
+
+    @patch.object(Session, "get")
+    def test_fetch_fresh(self, mock_get):
+        mock_get.return_value.text = read_webdata("D92.html")
+        mock_get.return_value.headers = {}
+        first = list(fetch_astm("D92", cache=self.cache))
+        second = list(fetch_astm("d92", cache=self.cache))
+        self.assertEqual(1, mock_get.call_count)
+        self.assertEqual(first[0]['rev'], second[0]['rev'])
+        self.assertEqual("d92", second[0]['query'])
+
+    @patch.object(Session, "get")
+    def test_fetch_revalidate(self, mock_get):
+        self.cache.ttl['astm'] = 0
+        mock_get.return_value.text = read_webdata("D92.html")
+        mock_get.return_value.headers = {'ETag': '"v1"', 'Last-Modified': "Wed, 01 Mar 2023 00:00:00 GMT"}
+        list(fetch_astm("D92", cache=self.cache))
+        mock_get.return_value = MagicMock(status_code=304, text="")
+        std_list = list(fetch_astm("D92", cache=self.cache))
+        self.assertEqual("18", std_list[0]['rev'])
+        headers = mock_get.call_args.kwargs['headers']
+        self.assertEqual('"v1"', headers['If-None-Match'])
+        self.assertEqual("Wed, 01 Mar 2023 00:00:00 GMT", headers['If-Modified-Since'])
+
+    @patch.object(Session, "post")
+    def test_fetch_post(self, mock_post):
+        mock_post.return_value.text = read_webdata("tse.html")
+        mock_post.return_value.headers = {}
+        for _ in range(2):
+            std_list = list(fetch_tse("TS EN IEC 60296", cache=self.cache))
+            self.assertEqual("09.11.2020", std_list[0]['rev'])
+        self.assertEqual(1, mock_post.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+from stdchecker.catalog import ActualCatalog, SortedActual, as_catalog
+from stdchecker.record import ActualRecord
+from stdchecker.astm import check_astm
+from stdchecker.iec import check_iec
+from stdchecker.ieee import check_ieee
+from stdchecker.tse import check_tse
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def load(filename):
+    with open(os.path.join(MODULE_PATH, "data", filename), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestCase(unittest.TestCase):
+    def test_lookup(self):
+        catalog = ActualCatalog([{'no': "ASTM D92", 'rev': "18"}, {'no': "ASTM D92", 'rev': "12"},
+                                 {'no': "ASTM D93", 'rev': "20"}])
+        self.assertEqual(2, len(catalog))
+        self.assertIn("ASTM D93", catalog)
+        self.assertEqual("18", catalog.get("ASTM D92")['rev'])
+        self.assertEqual(({'no': "ASTM D93", 'rev': "20"}, "20"), catalog.lookup("ASTM D93"))
+        self.assertEqual((None, None), catalog.lookup("ASTM D97"))
+
+    def test_lookup_normalized_once(self):
+        calls = list()
+
+        def normalize(rev):
+            calls.append(rev)
+            return rev.upper()
+
+        catalog = ActualCatalog([{'no': "IEC 60296", 'rev': "2020 rlv"}])
+        for _ in range(3):
+            self.assertEqual("2020 RLV", catalog.lookup("IEC 60296", normalize)[1])
+        self.assertEqual(["2020 rlv"], calls)
+
+    def test_as_catalog(self):
+        catalog = ActualCatalog([])
+        self.assertIs(catalog, as_catalog(catalog))
+        self.assertIsInstance(as_catalog(({'no': "ASTM D92", 'rev': "18"},)), ActualCatalog)
+        with self.assertRaises(TypeError):
+            as_catalog(92)
+        with self.assertRaises(ValueError):
+            as_catalog("ASTM D92")
+        with self.assertRaises(TypeError):
+            ActualCatalog(92)
+
+    def test_missing_rev(self):
+        fetched = [{'query': "D92", 'error': None, 'no': "ASTM D92", 'rev': "18", 'desc': "", 'body': "astm",
+                    'url': None}]
+        with tempfile.TemporaryDirectory() as path:
+            csv_path = os.path.join(path, "actual.csv")
+            with open(csv_path, "w", encoding="utf-8") as f:
+                f.write("id,no,rev\n1,ASTM D92,18\n2,ASTM D93,\n")
+            with self.assertRaisesRegex(ValueError, "Revision of actual standard method 'ASTM D93' is missing."):
+                list(check_astm(fetched, csv_path))
+            with self.assertRaises(ValueError):
+                list(check_astm(fetched[:1] + [dict(fetched[0], no="ASTM D95")], SortedActual(csv_path)))
+
+    def test_check_with_catalog(self):
+        for body, check_func in (("astm", check_astm), ("iec", check_iec), ("ieee", check_ieee),
+                                 ("tse", check_tse)):
+            fetched = load(f"{body}_fetched.json")
+            catalog = ActualCatalog(load(f"{body}_actual.json"))
+            self.assertEqual(load(f"{body}_check.json"), list(check_func(fetched, catalog)))
+            self.assertEqual(load(f"{body}_check_with_id.json"), list(check_func(fetched, catalog, True)))
+
+    def test_streaming_sources(self):
+        actual = load("astm_actual.json")
+        fetched = load("astm_fetched.json")
+        expected = load("astm_check_with_id.json")
+        catalog = as_catalog(i for i in actual)
+        self.assertIsInstance(catalog.get(actual[0]['no']), ActualRecord)
+        self.assertEqual(expected, list(check_astm(fetched, catalog, True)))
+        with tempfile.TemporaryDirectory() as path:
+            ndjson_path = os.path.join(path, "actual.ndjson")
+            with open(ndjson_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(i) + "\n" for i in actual)
+            self.assertEqual(expected, list(check_astm(fetched, ndjson_path, True)))
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE actual (ID INTEGER, NO TEXT, REV TEXT)")
+        connection.executemany("INSERT INTO actual VALUES (?, ?, ?)", [(i['id'], i['no'], i['rev']) for i in actual])
+        cursor = connection.execute("SELECT id, no, rev FROM actual")
+        self.assertEqual(expected, list(check_astm(fetched, cursor, True)))
+        connection.close()
+
+    def test_sorted_actual(self):
+        actual = [{'id': 1, 'no': "ASTM D92", 'rev': "18"}, {'id': 2, 'no': "ASTM D92", 'rev': "12"},
+                  {'id': 3, 'no': "ASTM D93", 'rev': "20(2015)"}, {'id': 4, 'no': "ASTM D97", 'rev': "17"}]
+        fetched = [{'query': no, 'error': None, 'no': no, 'rev': rev, 'desc': "", 'body': "astm", 'url': None}
+                   for no, rev in (("ASTM D92", "18"), ("ASTM D93", "20"), ("ASTM D95", "13"))]
+        checked = list(check_astm(fetched, SortedActual(iter(actual)), True))
+        self.assertEqual([True, True, False], [i['check'] for i in checked])
+        self.assertEqual([1, 3, None], [i['id'] for i in checked])
+        self.assertEqual(list(check_astm(fetched, actual, True)), checked)
+        with self.assertRaises(ValueError):
+            list(check_astm(fetched[::-1], SortedActual(actual), True))
+        with self.assertRaises(ValueError):
+            SortedActual(actual[2::-1]).get("ASTM D95")
+
+    def test_sorted_actual_fetch_error(self):
+        actual = [{'id': 1, 'no': "IEEE C57.104", 'rev': "2019"}]
+        fetched = [{'query': "C57.999", 'error': "Not found", 'no': None, 'rev': None, 'desc': None, 'body': "ieee",
+                    'url': None},
+                   {'query': "C57.104", 'error': None, 'no': "IEEE C57.104", 'rev': "2019", 'desc': "",
+                    'body': "ieee", 'url': None}]
+        checked = list(check_ieee(fetched, SortedActual(actual), True))
+        self.assertEqual([(False, None), (True, 1)], [(i['check'], i['id']) for i in checked])
+        self.assertIsNone(SortedActual(actual).get(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
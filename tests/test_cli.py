@@ -0,0 +1,84 @@
+import io
+import os
+import csv
+import json
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session
+from stdchecker.cli import main, input_format
+
+MODULE_PATH = os.path.dirname(__file__)
+
+INVENTORY_CSV = "id,body,query,no,rev\n1,astm,D92,ASTM D92,12\n2,iec,60296,IEC 60296,2020\n"
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def mock_get(url, **kwargs):
+    return MagicMock(text=read_webdata("D92.html" if "astm" in url else "60296.html"))
+
+
+@patch.object(Session, "get", side_effect=mock_get)
+class TestCase(unittest.TestCase):
+    def test_ndjson_output(self, mock):
+        stdout = io.StringIO()
+        self.assertEqual(0, main(["-", "--input-format", "csv", "--with-id"], stdin=io.StringIO(INVENTORY_CSV),
+                                 stdout=stdout))
+        results = {i['body']: i for i in map(json.loads, stdout.getvalue().splitlines())}
+        self.assertEqual(["astm", "iec"], sorted(results))
+        self.assertFalse(results['astm']['check'])
+        self.assertEqual("12", results['astm']['actual'])
+        self.assertEqual("1", results['astm']['id'])
+        self.assertTrue(results['iec']['check'])
+
+    def test_csv_output(self, mock):
+        with tempfile.TemporaryDirectory() as path:
+            inventory_path = os.path.join(path, "inventory.ndjson")
+            with open(inventory_path, "w", encoding="utf-8") as f:
+                f.write('{"body": "astm", "no": "ASTM D92", "rev": "18"}\n\n')
+            stdout = io.StringIO()
+            self.assertEqual(0, main([inventory_path, "--format", "csv"], stdout=stdout))
+        rows = list(csv.DictReader(io.StringIO(stdout.getvalue())))
+        self.assertEqual(1, len(rows))
+        self.assertEqual("ASTM D92", rows[0]['no'])
+        self.assertEqual("True", rows[0]['check'])
+
+    def test_invalid_inventory(self, mock):
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(2, main(["-", "--input-format", "ndjson"], stdin=io.StringIO("{"), stdout=io.StringIO()))
+            self.assertEqual(2, main(["-", "--input-format", "csv"], stdin=io.StringIO("no,rev\nD92,18\n"),
+                                     stdout=io.StringIO()))
+            self.assertEqual(2, main(["missing.txt"], stdout=io.StringIO()))
+        self.assertIn("missing column 'body'", stderr.getvalue())
+        self.assertEqual("ndjson", input_format("inventory.jsonl"))
+
+    def test_runtime_error_is_not_input_error(self, mock):
+        def check_all(inventory, **kwargs):
+            yield {'body': "astm", 'error': None}
+            raise KeyError("rev")
+
+        stdout = io.StringIO()
+        with patch("stdchecker.orchestrator.check_all", check_all):
+            with self.assertRaises(KeyError):
+                main(["-", "--input-format", "csv"], stdin=io.StringIO(INVENTORY_CSV), stdout=stdout)
+        self.assertEqual(1, len(stdout.getvalue().splitlines()))
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(2, main(["-", "--input-format", "csv"], stdin=io.StringIO("body,no,rev\niso,ISO 1,1\n"),
+                                     stdout=io.StringIO()))
+        self.assertIn("Unknown standard body 'iso'", stderr.getvalue())
+
+    def test_blank_rev(self, mock):
+        stdout = io.StringIO()
+        stdin = io.StringIO(INVENTORY_CSV + "3,tse,TS 1,TS 1,\n")
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(2, main(["-", "--input-format", "csv"], stdin=stdin, stdout=stdout))
+        self.assertIn("Revision of 'TS 1' is missing.", stderr.getvalue())
+        self.assertEqual("", stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import time
+import unittest
+from stdchecker.diff import make_snapshot, load_snapshot, save_snapshot, diff_checked, diff_with_snapshot
+
+
+def checked_item(query, rev, error=None, no=None):
+    return {'query': query, 'error': error, 'no': None if error else (no or f"ASTM {query}"),
+            'rev': None if error else rev, 'desc': None, 'body': "astm", 'url': None, 'check': False, 'actual': "Yok"}
+
+
+class TestCase(unittest.TestCase):
+    def test_diff(self):
+        previous = make_snapshot([checked_item("D92", "18"), checked_item("D93", "18"), checked_item("D94", "18"),
+                                  checked_item("D95", "17")])
+        current = [checked_item("D92", "18"), checked_item("D93", "20"), checked_item("D96", "21"),
+                   checked_item("D95", None, error="Connection error")]
+        snapshot = dict()
+        changes = list(diff_checked(current, previous, snapshot=snapshot))
+        self.assertEqual([("changed", "ASTM D93", "18", "20"), ("added", "ASTM D96", None, "21"),
+                          ("removed", "ASTM D94", "18", None)],
+                         [(i['change'], i['no'], i['old_rev'], i['new_rev']) for i in changes])
+        self.assertEqual("D93", changes[0]['query'])
+        self.assertEqual("D94", changes[2]['query'])
+        self.assertEqual(4, len(snapshot))
+        self.assertEqual("17", snapshot["astm\x1fD95\x1fASTM D95"])
+        with self.assertRaises(TypeError):
+            list(diff_checked(None, previous))
+
+    def test_diff_with_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.json.gz")
+            self.assertEqual(dict(), load_snapshot(path))
+            first = list(diff_with_snapshot([checked_item("D92", "18")], path))
+            self.assertEqual(["added"], [i['change'] for i in first])
+            self.assertEqual([], list(diff_with_snapshot([checked_item("D92", "18")], path)))
+            second = list(diff_with_snapshot([checked_item("D92", "20")], path))
+            self.assertEqual([("changed", "18", "20")], [(i['change'], i['old_rev'], i['new_rev']) for i in second])
+
+    def test_large_snapshot(self):
+        current = [checked_item(f"D{i}", "20" if i % 100 else "21") for i in range(100000)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.json.gz")
+            save_snapshot(make_snapshot(checked_item(f"D{i}", "20") for i in range(100000)), path)
+            self.assertLess(os.path.getsize(path), 1024 * 1024)
+            start = time.perf_counter()
+            changes = list(diff_with_snapshot(current, path))
+            elapsed = time.perf_counter() - start
+        self.assertEqual(1000, len(changes))
+        self.assertLess(elapsed, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import unittest
+from unittest.mock import patch
+from requests import Session
+from stdchecker import astm, iec
+from stdchecker.astm import fetch_astm
+from stdchecker.iec import parse_iec
+from stdchecker.endpoints import set_base_url, get_base_url
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestCase(unittest.TestCase):
+    def tearDown(self):
+        for body in ("astm", "iec", "ieee", "tse"):
+            set_base_url(body)
+
+    def test_set_base_url(self):
+        set_base_url("iec", "http://127.0.0.1:8000/")
+        self.assertEqual("http://127.0.0.1:8000", get_base_url("iec"))
+        self.assertEqual("http://127.0.0.1:8000/searchkey&key={0}&start=1&MAX=50&FUZZY=0", iec.IEC_SEARCH_URL)
+        std = parse_iec("60296", read_webdata("60296.html"))[0]
+        self.assertTrue(std['url'].startswith("http://127.0.0.1:8000/"))
+        set_base_url("iec")
+        self.assertEqual("https://webstore.iec.ch", get_base_url("iec"))
+        self.assertEqual("https://webstore.iec.ch/searchkey&key={0}&start=1&MAX=50&FUZZY=0", iec.IEC_SEARCH_URL)
+        with self.assertRaises(ValueError):
+            set_base_url("iso", "http://127.0.0.1:8000")
+
+    @patch.object(Session, "get")
+    def test_fetch_uses_base_url(self, mock_get):
+        mock_get.return_value.text = read_webdata("D92.html")
+        set_base_url("astm", "http://127.0.0.1:8000")
+        std_list = list(fetch_astm("D92"))
+        self.assertEqual("http://127.0.0.1:8000/Standards/D92.htm", mock_get.call_args.args[0])
+        self.assertEqual("http://127.0.0.1:8000/Standards/D92.htm", std_list[0]['url'])
+        set_base_url("astm")
+        self.assertEqual("https://www.astm.org/Standards/{0}.htm", astm.ASTM_URL)
+
+
+if __name__ == '__main__':
+    unittest.main()
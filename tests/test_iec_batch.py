@@ -0,0 +1,125 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session, ConnectionError
+from stdchecker import iec
+from stdchecker.iec import fetch_iec, plan_iec_searches, iec_base_number
+
+PARTS = ["1", "2", "3", "10", "10-1", "11", "18"]
+
+
+def results_page(numbers):
+    items = "".join(f'<li>\n<a href="/publication/{no}">IEC {no}:2011&nbsp;&nbsp;</a>\n<br>Power transformers - '
+                    f'Part {no}</li>\n' for no in numbers)
+    return f'<html><body><ul class="search-results lined-list">\n{items}</ul></body></html>'
+
+
+def mock_response(url):
+    key = url.split("key=")[1].split("&")[0]
+    response = MagicMock()
+    if key == "60076":
+        response.text = results_page(["60076-" + i for i in PARTS] + ["TS 60076-20"])
+    elif key.startswith("60076-") and key[6:] in PARTS:
+        response.text = results_page([key])
+    else:
+        response.text = "No valid publication found."
+    return response
+
+
+class TestCase(unittest.TestCase):
+    def test_plan(self):
+        self.assertEqual("60076", iec_base_number("IEC 60076-10-1"))
+        self.assertEqual([("60076", ["60076-1", "IEC 60076-2"]), ("60296", ["60296"])],
+                         plan_iec_searches(["60076-1", "60296", "IEC 60076-2"]))
+
+    @patch.object(Session, "get")
+    def test_fetch_batch(self, mock_get):
+        mock_get.side_effect = lambda url, **kwargs: mock_response(url)
+        queries = ["60076-" + i for i in PARTS]
+        expected = list(fetch_iec(queries))
+        self.assertEqual(len(PARTS), mock_get.call_count)
+        mock_get.reset_mock()
+        std_list = list(fetch_iec(queries, batch=True))
+        self.assertEqual(1, mock_get.call_count)
+        self.assertEqual(expected, std_list)
+        self.assertEqual(queries, [i['query'] for i in std_list])
+
+    @patch.object(Session, "get")
+    def test_fetch_batch_falls_back_to_single_search(self, mock_get):
+        mock_get.side_effect = lambda url, **kwargs: mock_response(url)
+        std_list = list(fetch_iec(["60076-1", "60076-99"], batch=True))
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(["60076-1", "60076-99"], [i['query'] for i in std_list])
+        self.assertEqual("Not found", std_list[1]['error'])
+
+    @patch.object(Session, "get")
+    def test_fetch_batch_pages(self, mock_get):
+        def page(url, **kwargs):
+            start = int(url.split("start=")[1].split("&")[0])
+            response = MagicMock()
+            numbers = [f"60076-{i}" for i in range(start, start + 3)]
+            response.text = results_page(numbers) if start < 7 else "No valid publication found."
+            return response
+
+        mock_get.side_effect = page
+        with patch.object(iec, "IEC_PAGE_SIZE", 3):
+            std_list = list(fetch_iec(["60076-1", "60076-5"], batch=True))
+        self.assertEqual(3, mock_get.call_count)
+        self.assertEqual(["IEC 60076-1", "IEC 60076-5"], [i['no'] for i in std_list])
+
+    @patch.object(Session, "get")
+    def test_fetch_batch_pages_with_other_rows(self, mock_get):
+        # The first page is full although only one of its rows contains the search key. The second page has another
+        # entry of 60076-1.
+        def page(url, **kwargs):
+            key = url.split("key=")[1].split("&")[0]
+            start = int(url.split("start=")[1].split("&")[0])
+            response = MagicMock()
+            if key != "60076":
+                response.text = results_page([key])
+            elif start == 1:
+                response.text = results_page(["60076-1", "61000-1", "61000-2"])
+            elif start == 4:
+                response.text = results_page(["60076-1", "60076-3"])
+            else:
+                response.text = "No valid publication found."
+            return response
+
+        mock_get.side_effect = page
+        with patch.object(iec, "IEC_PAGE_SIZE", 3):
+            std_list = list(fetch_iec(["60076-1", "60076-3"], batch=True))
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(["IEC 60076-1", "IEC 60076-1", "IEC 60076-3"], [i['no'] for i in std_list])
+
+    @patch.object(Session, "get")
+    def test_fetch_batch_incomplete_pages(self, mock_get):
+        def page(url, **kwargs):
+            key = url.split("key=")[1].split("&")[0]
+            start = int(url.split("start=")[1].split("&")[0])
+            if key == "60076" and start > 1:
+                raise ConnectionError("connection error side effect")
+            response = MagicMock()
+            response.text = results_page(["60076-1", "60076-2", "60076-3"] if key == "60076" else [key])
+            return response
+
+        mock_get.side_effect = page
+        with patch.object(iec, "IEC_PAGE_SIZE", 3):
+            std_list = list(fetch_iec(["60076-1", "60076-10"], batch=True))
+            self.assertEqual(["IEC 60076-1", "IEC 60076-10"], [i['no'] for i in std_list])
+            self.assertEqual(4, mock_get.call_count)
+            mock_get.reset_mock()
+            mock_get.side_effect = lambda url, **kwargs: MagicMock(text=results_page(["60076-1", "60076-2", "60076-3"]))
+            with patch.object(iec, "IEC_MAX_PAGES", 2):
+                std_list = list(fetch_iec(["60076-1", "60076-2"], batch=True))
+        self.assertEqual(["IEC 60076-1", "IEC 60076-2"], [i['no'] for i in std_list])
+        self.assertEqual(4, mock_get.call_count)
+
+    @patch.object(Session, "get")
+    def test_fetch_batch_connection_error(self, mock_get):
+        mock_get.side_effect = ConnectionError("connection error side effect")
+        std_list = list(fetch_iec(["60076-1", "60076-2"], batch=True))
+        self.assertEqual(["60076-1", "60076-2"], [i['query'] for i in std_list])
+        self.assertTrue(all(i['error'] == "Connection error" for i in std_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session, ConnectionError
+from stdchecker.ieee import fetch_ieee, plan_ieee_searches, ieee_family
+
+DOCUMENTS = [
+    ("IEEE C57.104-2008", "Guide for gases"), ("IEEE C57.104-2019", "Guide for gases"),
+    ("IEEE C57.106-2015", "Guide for oils"), ("IEEE C57.12.90-2021", "Test code"),
+    ("IEEE C57.12.90-2015", "Test code"), ("IEEE C57.152-2013", "Guide for field testing"),
+]
+
+
+def hit(title, desc):
+    text = f"IEEE SA - {title} MAC Address {title} {desc} Purchase"
+    return {'fields': {'doc_title_t': f"IEEE SA - {title}", 'doc_text_t': text,
+                       'doc_id_l': f"https://standards.ieee.org/ieee/{title[5:]}/"}}
+
+
+def mock_response(query, page, page_size=None):
+    documents = [i for i in DOCUMENTS if i[0].startswith("IEEE " + query)]
+    page_size = page_size or len(documents) or 1
+    total_pages = (len(documents) + page_size - 1) // page_size
+    page = int(page or 1)
+    documents = documents[(page - 1) * page_size:page * page_size]
+    response = MagicMock()
+    response.json.return_value = {
+        'status': "ok", 'total_pages': total_pages,
+        'results': {'hits': {'found': len(documents), 'start': 0, 'hit': [hit(*i) for i in documents]}}
+        if documents else []}
+    return response
+
+
+class TestCase(unittest.TestCase):
+    def test_plan(self):
+        self.assertEqual("C57", ieee_family("C57.12.90"))
+        self.assertEqual([("C57", ["C57.104", "C57.12.90"]), ("1547", ["1547"])],
+                         plan_ieee_searches(["C57.104", "1547", "C57.12.90"]))
+
+    @patch.object(Session, "post")
+    def test_fetch_batch(self, mock_post):
+        mock_post.side_effect = lambda url, data, **kwargs: mock_response(data['q'], data['page'])
+        queries = ["C57.104", "C57.106", "C57.12.90", "C57.152"]
+        expected = list(fetch_ieee(queries))
+        self.assertEqual(4, mock_post.call_count)
+        mock_post.reset_mock()
+        std_list = list(fetch_ieee(queries, batch=True))
+        self.assertEqual(1, mock_post.call_count)
+        self.assertEqual(expected, std_list)
+        self.assertEqual(["2019", "2015", "2021", "2013"], [i['rev'] for i in std_list])
+
+    @patch.object(Session, "post")
+    def test_fetch_batch_pages(self, mock_post):
+        mock_post.side_effect = lambda url, data, **kwargs: mock_response(data['q'], data['page'], page_size=2)
+        std_list = list(fetch_ieee(["C57.104", "C57.152"], batch=True))
+        self.assertEqual(3, mock_post.call_count)
+        self.assertEqual(["", "2", "3"], [i.kwargs['data']['page'] for i in mock_post.call_args_list])
+        self.assertEqual(["IEEE C57.104", "IEEE C57.152"], [i['no'] for i in std_list])
+
+    @patch.object(Session, "post")
+    def test_fetch_batch_falls_back_to_single_search(self, mock_post):
+        mock_post.side_effect = lambda url, data, **kwargs: mock_response(data['q'], data['page'])
+        std_list = list(fetch_ieee(["C57.104", "C57.999"], batch=True))
+        self.assertEqual(2, mock_post.call_count)
+        self.assertEqual(["C57.104", "C57.999"], [i['query'] for i in std_list])
+        self.assertEqual("Not found", std_list[1]['error'])
+
+    @patch("stdchecker.ieee.IEEE_MAX_PAGES", 2)
+    @patch.object(Session, "post")
+    def test_fetch_batch_too_many_pages(self, mock_post):
+        # C57.104-2019 is on the second page of the family, but the family has more pages than IEEE_MAX_PAGES.
+        mock_post.side_effect = lambda url, data, **kwargs: mock_response(
+            data['q'], data['page'], page_size=1 if data['q'] == "C57" else None)
+        std_list = list(fetch_ieee(["C57.104", "C57.152"], batch=True))
+        self.assertEqual(["C57", "C57.104", "C57.152"], [i.kwargs['data']['q'] for i in mock_post.call_args_list])
+        self.assertEqual([("IEEE C57.104", "2019"), ("IEEE C57.152", "2013")], [(i['no'], i['rev']) for i in std_list])
+
+    @patch.object(Session, "post")
+    def test_fetch_batch_page_error(self, mock_post):
+        def post(url, data, **kwargs):
+            if data['q'] == "C57" and data['page'] == "2":
+                raise ConnectionError("connection error side effect")
+            return mock_response(data['q'], data['page'], page_size=1 if data['q'] == "C57" else None)
+        mock_post.side_effect = post
+        std_list = list(fetch_ieee(["C57.104", "C57.152"], batch=True))
+        self.assertEqual(["C57", "C57", "C57.104", "C57.152"],
+                         [i.kwargs['data']['q'] for i in mock_post.call_args_list])
+        self.assertEqual([("IEEE C57.104", "2019"), ("IEEE C57.152", "2013")], [(i['no'], i['rev']) for i in std_list])
+
+    @patch.object(Session, "post")
+    def test_fetch_batch_connection_error(self, mock_post):
+        mock_post.side_effect = ConnectionError("connection error side effect")
+        std_list = list(fetch_ieee(["C57.104", "C57.106"], batch=True))
+        self.assertEqual(["C57.104", "C57.106"], [i['query'] for i in std_list])
+        self.assertTrue(all(i['error'] == "Connection error" for i in std_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
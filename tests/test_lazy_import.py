@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import unittest
+import stdchecker
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT_PATH, capture_output=True, text=True,
+                          check=True).stdout.split()
+
+
+class TestCase(unittest.TestCase):
+    def test_check_does_not_load_http_and_html(self):
+        loaded = run_python(
+            "import sys\n"
+            "from stdchecker import check_tse\n"
+            "fetched = [{'query': 'TS 1', 'error': None, 'no': 'TS 1', 'rev': '01.02.2020', 'desc': '', "
+            "'body': 'tse', 'url': None}]\n"
+            "checked = list(check_tse(fetched, [{'no': 'TS 1', 'rev': '03.04.2011'}]))\n"
+            "print(checked[0]['check'], 'requests' in sys.modules, 'bs4' in sys.modules)")
+        self.assertEqual(["False", "False", "False"], loaded)
+
+    def test_import_does_not_load_submodules(self):
+        loaded = run_python("import sys, stdchecker\nprint('stdchecker.astm' in sys.modules)")
+        self.assertEqual(["False"], loaded)
+
+    def test_public_names(self):
+        for name in stdchecker.__all__:
+            self.assertTrue(callable(getattr(stdchecker, name)))
+        self.assertIn("check_all", dir(stdchecker))
+        with self.assertRaises(AttributeError):
+            getattr(stdchecker, "fetch_iso")
+
+    def test_submodules(self):
+        loaded = run_python("import stdchecker\nprint(stdchecker.astm.ASTM_URL, stdchecker.offline.LocalIndex.__name__)")
+        self.assertEqual(2, len(loaded))
+        self.assertEqual("LocalIndex", loaded[1])
+        self.assertTrue(callable(stdchecker.tse.fetch_tse))
+        with self.assertRaises(AttributeError):
+            getattr(stdchecker, "iso")
+
+
+if __name__ == '__main__':
+    unittest.main()
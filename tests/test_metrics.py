@@ -0,0 +1,89 @@
+import os
+import unittest
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+from requests import Session, HTTPError
+from stdchecker.astm import fetch_astm, check_astm
+from stdchecker.cache import ResponseCache
+from stdchecker.metrics import Collector, set_instrument, get_instrument, span
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestCase(unittest.TestCase):
+    def setUp(self):
+        self.collector = set_instrument(Collector())
+
+    def tearDown(self):
+        set_instrument()
+
+    @patch.object(Session, "get")
+    def test_fetch_and_check(self, mock_get):
+        text = read_webdata("D92.html")
+        mock_get.return_value = MagicMock(status_code=200, headers={}, text=text, content=text.encode("utf-8"),
+                                          elapsed=timedelta(seconds=0))
+        with ResponseCache(":memory:") as cache:
+            fetched = list(fetch_astm(["D92", "D92"], cache=cache))
+        checked = list(check_astm(fetched, [{'no': "ASTM D92", 'rev': "18"}]))
+        self.assertEqual(2, len(checked))
+        spans = self.collector.spans
+        self.assertEqual(2, len(spans[("request", "astm")]))
+        self.assertEqual(1, len(spans[("wait", "astm")]))
+        self.assertEqual(1, len(spans[("download", "astm")]))
+        self.assertEqual(2, len(spans[("parse", "astm")]))
+        self.assertEqual(2, len(spans[("check", "astm")]))
+        counts = self.collector.counts
+        self.assertEqual(len(text.encode("utf-8")), counts[("bytes", "astm")])
+        self.assertEqual(1, counts[("cache_miss", "astm")])
+        self.assertEqual(1, counts[("cache_hit", "astm")])
+        summary = self.collector.summary()
+        self.assertIn("parse", summary)
+        self.assertIn("cache_hit", summary)
+
+    def test_check_span_excludes_fetching(self):
+        clock = [0.0]
+
+        def fetched():
+            # Each fetched item takes 0.2 seconds of the fake clock, checking takes none.
+            for no in ("ASTM D92", "ASTM D93"):
+                clock[0] += 0.2
+                yield {'query': no, 'error': None, 'no': no, 'rev': "18", 'desc': "", 'body': "astm", 'url': None}
+
+        with patch("time.perf_counter", lambda: clock[0]):
+            checked = list(check_astm(fetched(), [{'no': "ASTM D92", 'rev': "18"}]))
+        self.assertEqual([True, False], [i['check'] for i in checked])
+        self.assertEqual([0.0, 0.0], self.collector.spans[("check", "astm")])
+
+    @patch.object(Session, "get")
+    def test_error_count(self, mock_get):
+        mock_get.return_value.raise_for_status.side_effect = HTTPError()
+        std_list = list(fetch_astm("D9999"))
+        self.assertEqual("Not found", std_list[0]['error'])
+        self.assertEqual(1, self.collector.counts[("error", "astm")])
+
+    def test_histogram(self):
+        for seconds in (0.0005, 0.003, 0.003, 20):
+            self.collector.record_span("parse", "iec", None, seconds)
+        histogram = dict(self.collector.histogram("parse", buckets=(0.001, 0.01)))
+        self.assertEqual({0.001: 1, 0.01: 2, float("inf"): 1}, histogram)
+        self.collector.reset()
+        self.assertEqual(0, sum(n for _, n in self.collector.histogram("parse")))
+
+    def test_disabled(self):
+        set_instrument()
+        self.assertIsNone(get_instrument())
+        with span("parse", "iec", "60296"):
+            pass
+        self.assertEqual(0, len(self.collector.spans))
+        checked = check_astm([], [])
+        self.assertEqual("check_astm", check_astm.__name__)
+        self.assertEqual([], list(checked))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from datetime import date
+from stdchecker.catalog import ActualCatalog
+from stdchecker.normalize import (normalize_astm_rev, normalize_iec_rev, normalize_tse_rev, normalize_revs,
+                                  get_normalizer)
+
+
+class TestCase(unittest.TestCase):
+    def test_normalizers(self):
+        self.assertEqual("20", normalize_astm_rev("20(2015)"))
+        self.assertEqual("18", normalize_astm_rev("18"))
+        self.assertEqual("2020", normalize_iec_rev("2020 RLV"))
+        self.assertEqual("2011", normalize_iec_rev("ED4:2011 CSV"))
+        self.assertEqual(date(2020, 11, 9), normalize_tse_rev("09.11.2020"))
+        normalize_tse_rev.cache_clear()
+        normalize_tse_rev("09.11.2020")
+        normalize_tse_rev("09.11.2020")
+        self.assertEqual(1, normalize_tse_rev.cache_info().hits)
+
+    def test_normalize_revs(self):
+        self.assertEqual(["20", "20", "18"], normalize_revs("astm", ["20(2015)", "20", "18"]))
+        self.assertEqual(["2019", "2008"], normalize_revs("ieee", ("2019", "2008")))
+        self.assertEqual([date(2020, 1, 2)], normalize_revs(normalize_tse_rev, ["02.01.2020"]))
+        self.assertIsNone(get_normalizer("ieee"))
+        with self.assertRaises(ValueError):
+            normalize_revs("iso", ["2020"])
+
+    def test_catalog_normalize_all(self):
+        catalog = ActualCatalog([{'no': "ASTM D92", 'rev': "18(2015)"}, {'no': "ASTM D93", 'rev': "20"}])
+        self.assertIs(catalog, catalog.normalize_all("astm"))
+        self.assertEqual("18", catalog.lookup("ASTM D92", normalize_astm_rev)[1])
+        self.assertEqual("20", catalog.lookup("ASTM D93", normalize_astm_rev)[1])
+        self.assertIs(catalog, catalog.normalize_all("ieee"))
+
+    def test_catalog_normalize_all_invalid_rev(self):
+        catalog = ActualCatalog([{'no': "TS 1", 'rev': "09.11.2020"}, {'no': "TS 2", 'rev': "-"}, {'no': "TS 3"}])
+        catalog.normalize_all("tse")
+        self.assertEqual(date(2020, 11, 9), catalog.lookup("TS 1", normalize_tse_rev)[1])
+        with self.assertRaises(IndexError):
+            catalog.lookup("TS 2", normalize_tse_rev)
+
+
+if __name__ == '__main__':
+    unittest.main()
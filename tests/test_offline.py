@@ -0,0 +1,70 @@
+import os
+import json
+import tempfile
+import unittest
+from stdchecker import check_all
+from stdchecker.astm import check_astm
+from stdchecker.offline import LocalIndex, index_key
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def load(filename):
+    with open(os.path.join(MODULE_PATH, "data", filename), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestCase(unittest.TestCase):
+    def test_index_key(self):
+        self.assertEqual("D92", index_key("astm", "ASTM D92"))
+        self.assertEqual("D92", index_key("astm", "d92"))
+        self.assertEqual("60296", index_key("iec", "IEC 60296"))
+        self.assertEqual("TS EN IEC 60296", index_key("tse", "TS EN IEC 60296\xa0(İngilizce Metin)\xa0(Renkli)"))
+        with self.assertRaises(ValueError):
+            index_key("iso", "ISO 3104")
+
+    def test_check_against_index(self):
+        fetched = load("astm_fetched.json")
+        with LocalIndex(":memory:") as index:
+            self.assertEqual(len(fetched), index.ingest("astm", fetched)['added'])
+            self.assertEqual(len(fetched), len(index))
+            queries = [i['query'] for i in fetched]
+            self.assertEqual(fetched, list(index.fetch("astm", queries, max_workers=8)))
+            self.assertEqual(load("astm_check.json"), list(check_astm(index.fetch("astm", queries),
+                                                                      load("astm_actual.json"))))
+            not_found = list(index.fetch("astm", "D9999"))
+            self.assertEqual("Not found", not_found[0]['error'])
+
+    def test_differential_refresh(self):
+        dump = [{'no': "ASTM D92", 'rev': "18"}, {'no': "ASTM D93", 'rev': "20"}, {'no': "ASTM D97", 'rev': "17b"}]
+        with tempfile.TemporaryDirectory() as path:
+            dump_path = os.path.join(path, "astm.ndjson")
+            with open(dump_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(i) + "\n" for i in dump[1:] + [{'no': "ASTM D445", 'rev': "21"}])
+            with LocalIndex(os.path.join(path, "index.sqlite")) as index:
+                index.ingest("astm", dump)
+                self.assertEqual("18", index.lookup("astm", "D92")[0]['rev'])
+                self.assertEqual({'added': 1, 'changed': 1, 'removed': 0, 'unchanged': 1},
+                                 index.ingest("astm", [{'no': "ASTM D92", 'rev': "19"}, dump[1],
+                                                       {'no': "ASTM D445", 'rev': "21"}], full=False))
+                self.assertEqual("19", index.lookup("astm", "D92")[0]['rev'])
+                self.assertEqual({'added': 0, 'changed': 0, 'removed': 1, 'unchanged': 3},
+                                 index.ingest("astm", dump_path))
+                self.assertEqual("Not found", index.lookup("astm", "D92")[0]['error'])
+            with LocalIndex(os.path.join(path, "index.sqlite")) as index:
+                self.assertEqual(3, len(index))
+
+    def test_check_all_with_index(self):
+        inventory = [{'id': 1, 'body': "astm", 'no': "ASTM D92", 'rev': "12"},
+                     {'id': 2, 'body': "iec", 'no': "IEC 60296", 'rev': "2020"}]
+        with LocalIndex(":memory:") as index:
+            index.ingest("astm", [{'no': "ASTM D92", 'rev': "18"}])
+            index.ingest("iec", [{'no': "IEC 60296", 'rev': "2020"}])
+            checked = {i['body']: i for i in check_all(inventory, id_from_actual=True, index=index)}
+        self.assertFalse(checked['astm']['check'])
+        self.assertTrue(checked['iec']['check'])
+        self.assertEqual(2, checked['iec']['id'])
+
+
+if __name__ == '__main__':
+    unittest.main()
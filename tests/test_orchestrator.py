@@ -0,0 +1,92 @@
+import os
+import json
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session
+from stdchecker import check_all
+from stdchecker.orchestrator import route_inventory
+
+MODULE_PATH = os.path.dirname(__file__)
+
+INVENTORY = [
+    {'id': 1, 'body': "astm", 'query': "D92", 'no': "ASTM D92", 'rev': "12"},
+    {'id': 2, 'body': "iec", 'query': "60296", 'no': "IEC 60296", 'rev': "2020"},
+    {'id': 3, 'body': "ieee", 'query': "C57.104", 'no': "IEEE C57.104", 'rev': "2019"},
+    {'id': 4, 'body': "TSE", 'query': "TS EN IEC 60296", 'no': "TS EN IEC 60296\xa0(İngilizce Metin)\xa0(Renkli)",
+     'rev': "09.11.2020"},
+]
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def mock_get(url, **kwargs):
+    return MagicMock(text=read_webdata("D92.html" if "astm" in url else "60296.html"))
+
+
+def mock_post(url, **kwargs):
+    if "ieee" in url:
+        response = MagicMock()
+        response.json.return_value = json.loads(read_webdata("ieee_search.json"))
+        return response
+    return MagicMock(text=read_webdata("tse.html"))
+
+
+class TestCase(unittest.TestCase):
+    def test_route_inventory(self):
+        routed = route_inventory(INVENTORY + [{'body': "astm", 'no': "D92", 'rev': "18"}])
+        self.assertEqual(["astm", "iec", "ieee", "tse"], list(routed))
+        self.assertEqual(["D92"], routed['astm'][0])
+        self.assertEqual(2, len(routed['astm'][1]))
+        self.assertEqual(["TS EN IEC 60296"], routed['tse'][0])
+        with self.assertRaises(ValueError):
+            route_inventory([{'body': "iso", 'no': "ISO 3104", 'rev': "2020"}])
+        with self.assertRaises(ValueError):
+            route_inventory([{'body': "tse", 'no': "TS 3"}])
+
+    @patch.object(Session, "post", side_effect=mock_post)
+    @patch.object(Session, "get", side_effect=mock_get)
+    def test_route_inventory_query_from_no(self, _, __):
+        std_list = list(check_all([{**i, 'query': None} for i in INVENTORY], id_from_actual=True))
+        self.assertEqual({1: False, 2: True, 3: True, 4: True}, {i['id']: i['check'] for i in std_list})
+        routed = route_inventory([{**i, 'query': None} for i in INVENTORY])
+        self.assertEqual(["D92", "60296", "C57.104", "TS EN IEC 60296"], [queries[0] for queries, _ in routed.values()])
+
+    def test_check_all(self):
+        # Each standard body sends one request. The requests wait for each other, so they must be sent at the same
+        # time.
+        barrier = threading.Barrier(4, timeout=10)
+
+        def concurrent(send):
+            def wrapper(url, **kwargs):
+                barrier.wait()
+                return send(url, **kwargs)
+            return wrapper
+
+        timings = dict()
+        with patch.object(Session, "get", side_effect=concurrent(mock_get)), \
+                patch.object(Session, "post", side_effect=concurrent(mock_post)):
+            std_list = list(check_all(INVENTORY, id_from_actual=True, timings=timings))
+        self.assertFalse(barrier.broken)
+        self.assertEqual({"astm", "iec", "ieee", "tse"}, set(timings))
+        self.assertEqual({1: False, 2: True, 3: True, 4: True}, {i['id']: i['check'] for i in std_list})
+
+    @patch.object(Session, "post", side_effect=mock_post)
+    @patch.object(Session, "get", side_effect=mock_get)
+    def test_check_all_invalid_rev(self, _, __):
+        # Revisions of actual standard methods which do not match a fetched one are not normalized.
+        inventory = INVENTORY + [{'id': 5, 'body': "tse", 'query': "TS EN IEC 60296", 'no': "TS 2", 'rev': "-"}]
+        std_list = list(check_all(inventory, id_from_actual=True))
+        self.assertEqual({1: False, 2: True, 3: True, 4: True}, {i['id']: i['check'] for i in std_list})
+
+    @patch.object(Session, "get", side_effect=RuntimeError("unexpected"))
+    def test_check_all_error(self, _):
+        with self.assertRaises(RuntimeError):
+            list(check_all(INVENTORY[:1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import unittest
+from bs4 import BeautifulSoup
+from stdchecker.parsers import set_html_parser, get_html_parser, make_soup, DEFAULT_HTML_PARSER
+from stdchecker.astm import parse_astm
+from stdchecker.iec import parse_iec
+from stdchecker.tse import parse_tse
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def parse_fixtures():
+    return [
+        parse_astm("D92", read_webdata("D92.html"), "https://www.astm.org/Standards/D92.htm"),
+        parse_iec("60296", read_webdata("60296.html")),
+        parse_iec("60214", read_webdata("60296.html")),
+        parse_tse("TS EN IEC 60296", read_webdata("tse.html")),
+        parse_tse("TS EN IEC 60296", read_webdata("tse_not_found.html")),
+        parse_tse("TS EN IEC 60296", read_webdata("tse_data_parse_error.html")),
+    ]
+
+
+class TestCase(unittest.TestCase):
+    def tearDown(self):
+        set_html_parser(DEFAULT_HTML_PARSER)
+
+    def test_set_html_parser(self):
+        self.assertEqual("html.parser", get_html_parser())
+        with self.assertRaises(ValueError):
+            set_html_parser("no-such-parser")
+        self.assertEqual("html.parser", get_html_parser())
+
+    def test_make_soup_only(self):
+        soup = make_soup("<div><b class='sku'>ASTM D92-18</b><p>text</p></div>", only="b")
+        self.assertIsNone(soup.find("p"))
+        self.assertEqual("ASTM D92-18", soup.find("b", {'class': "sku"}).string)
+
+    def test_strained_tree_gives_identical_results(self):
+        html = read_webdata("60296.html")
+        full = BeautifulSoup(html, "html.parser").find("ul", {'class': "search-results"})
+        self.assertEqual(str(full), str(make_soup(html, only="ul").find("ul", {'class': "search-results"})))
+
+    def test_lxml_gives_identical_results(self):
+        try:
+            set_html_parser("lxml")
+        except ValueError:
+            self.skipTest("lxml is not installed")
+        lxml_results = parse_fixtures()
+        set_html_parser("html.parser")
+        self.assertEqual(parse_fixtures(), lxml_results)
+
+
+if __name__ == '__main__':
+    unittest.main()
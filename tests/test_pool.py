@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session
+from stdchecker.pool import (create_session, map_queries, map_parsed, set_shared_session, get_shared_session,
+                             _parse_context)
+from stdchecker.astm import fetch_astm
+from stdchecker.iec import fetch_iec
+from stdchecker.ieee import fetch_ieee
+from stdchecker.tse import fetch_tse
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def slow_echo(query, session):
+    time.sleep(query / 100)
+    return query
+
+
+def parse_number(query):
+    return [{'query': query, 'error': None, 'no': str(query), 'rev': "20", 'desc': "", 'body': "astm", 'url': None}]
+
+
+class TestCase(unittest.TestCase):
+    def test_create_session(self):
+        with create_session(16) as session:
+            adapter = session.get_adapter("https://www.astm.org")
+            self.assertEqual(16, adapter._pool_maxsize)
+            self.assertIn("Mozilla", session.headers['User-Agent'])
+        with create_session(user_agent=False) as session:
+            self.assertNotIn("Mozilla", session.headers['User-Agent'])
+        with create_session(keep_alive=False, pool_block=True) as session:
+            self.assertEqual("close", session.headers['Connection'])
+            self.assertTrue(session.get_adapter("https://www.astm.org")._pool_block)
+
+    def test_map_queries_sequential(self):
+        self.assertEqual([3, 1, 2], list(map_queries(slow_echo, [3, 1, 2], None)))
+
+    def test_map_queries_ordered(self):
+        self.assertEqual([3, 1, 2, 0], list(map_queries(slow_echo, iter([3, 1, 2, 0]), None, max_workers=4)))
+
+    def test_map_queries_unordered(self):
+        result = list(map_queries(slow_echo, [10, 1, 5], None, max_workers=3, ordered=False))
+        self.assertEqual([1, 5, 10], result)
+
+    def test_map_queries_more_queries_than_window(self):
+        queries = list(range(20))
+        self.assertEqual(queries, list(map_queries(lambda q, s: q, queries, None, max_workers=2)))
+        self.assertEqual(queries, sorted(map_queries(lambda q, s: q, queries, None, max_workers=2, ordered=False)))
+
+    @patch.object(Session, "get")
+    def test_fetch_concurrent(self, mock_get):
+        with open(os.path.join(MODULE_PATH, "webdata/D92.html"), "r", encoding="utf-8") as f:
+            mock_get.return_value.text = f.read()
+        std_list = list(fetch_astm(["D92", "ASTM D92", "d92"], max_workers=3))
+        self.assertEqual(["D92", "ASTM D92", "d92"], [i['query'] for i in std_list])
+        self.assertTrue(all(i['no'] == "ASTM D92" for i in std_list))
+        self.assertEqual(3, mock_get.call_count)
+
+    def test_caller_owned_session(self):
+        with open(os.path.join(MODULE_PATH, "webdata/D92.html"), "r", encoding="utf-8") as f:
+            session = MagicMock()
+            session.get.return_value.text = f.read()
+        self.assertEqual("ASTM D92", next(fetch_astm("D92", session=session))['no'])
+        self.assertEqual(2, len(list(fetch_astm(["D92", "D93"], max_workers=2, session=session))))
+        self.assertIs(session, set_shared_session(session))
+        try:
+            self.assertEqual(1, len(list(fetch_iec("60296"))))
+            self.assertEqual(4, session.get.call_count)
+        finally:
+            set_shared_session(None)
+        self.assertIsNone(get_shared_session())
+        session.close.assert_not_called()
+        session.__exit__.assert_not_called()
+
+    def test_map_parsed(self):
+        def download(query, session):
+            return [{'query': query, 'error': "Connection error", 'no': None, 'rev': None, 'desc': None,
+                     'body': "astm", 'url': None}] if query % 3 == 0 else (query,)
+        queries = list(range(20))
+        for ordered in (True, False):
+            found_lists = list(map_parsed(download, parse_number, queries, None, max_workers=2, parse_workers=2,
+                                          chunksize=3, ordered=ordered))
+            self.assertEqual(queries, [i[0]['query'] for i in found_lists] if ordered else
+                             sorted(i[0]['query'] for i in found_lists))
+            for found_list in found_lists:
+                query = found_list[0]['query']
+                self.assertEqual("Connection error" if query % 3 == 0 else None, found_list[0]['error'])
+                self.assertEqual(None if query % 3 == 0 else str(query), found_list[0]['no'])
+
+    def test_parse_processes_are_not_forked(self):
+        # Worker processes start while the download threads run, so the process must not be forked.
+        self.assertIn(_parse_context().get_start_method(), ("forkserver", "spawn"))
+
+    @patch.object(Session, "post")
+    @patch.object(Session, "get")
+    def test_fetch_parse_workers(self, mock_get, mock_post):
+        with open(os.path.join(MODULE_PATH, "webdata/D92.html"), "r", encoding="utf-8") as f:
+            mock_get.return_value.text = f.read()
+        queries = ["D92", "ASTM D92", "d92"]
+        self.assertEqual(list(fetch_astm(queries)), list(fetch_astm(queries, max_workers=2, parse_workers=2,
+                                                                     parse_chunksize=2)))
+        with open(os.path.join(MODULE_PATH, "webdata/60296.html"), "r", encoding="utf-8") as f:
+            mock_get.return_value.text = f.read()
+        self.assertEqual(list(fetch_iec("60296")), list(fetch_iec("60296", parse_workers=1, compact=True)))
+        with open(os.path.join(MODULE_PATH, "webdata/tse.html"), "r", encoding="utf-8") as f:
+            mock_post.return_value.text = f.read()
+        self.assertEqual(list(fetch_tse("TS EN IEC 60296")), list(fetch_tse("TS EN IEC 60296", parse_workers=1)))
+        with open(os.path.join(MODULE_PATH, "webdata/ieee_search.json"), "r", encoding="utf-8") as f:
+            mock_post.return_value.json.return_value = json.load(f)
+        self.assertEqual(list(fetch_ieee("C57.104")), list(fetch_ieee("C57.104", parse_workers=1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
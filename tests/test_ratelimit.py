@@ -0,0 +1,101 @@
+import os
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session, Timeout
+from stdchecker.ratelimit import HostLimiter, set_rate_limit, remove_rate_limit, get_limiter, parse_retry_after
+from stdchecker.astm import fetch_astm
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestCase(unittest.TestCase):
+    def tearDown(self):
+        remove_rate_limit()
+
+    def test_token_bucket(self):
+        limiter = HostLimiter(rate=50, burst=1, concurrency=10)
+        start = time.perf_counter()
+        for _ in range(6):
+            limiter.acquire()
+            limiter.release()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+
+    def test_adaptive_concurrency(self):
+        limiter = HostLimiter(rate=1000, concurrency=2, max_concurrency=4)
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(latency=0.1)
+        self.assertEqual(4, limiter.limit)
+        limiter.acquire()
+        limiter.release(latency=1.0)
+        self.assertEqual(4, limiter.limit)
+        limiter.acquire()
+        limiter.release(throttled=True)
+        self.assertEqual(2, limiter.limit)
+        self.assertEqual(500, limiter.rate)
+
+    def test_retry_after(self):
+        self.assertEqual(2.0, parse_retry_after("2"))
+        self.assertIsNone(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"))
+        limiter = HostLimiter(rate=1000)
+        limiter.acquire()
+        limiter.release(throttled=True, retry_after=0.1)
+        start = time.perf_counter()
+        limiter.acquire()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+
+    def test_throttle_empties_bucket(self):
+        limiter = HostLimiter(rate=20, burst=10)
+        limiter.acquire()
+        limiter.release(throttled=True)
+        self.assertEqual(10, limiter.rate)
+        start = time.perf_counter()
+        limiter.acquire()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+
+    def test_registry(self):
+        limiter = set_rate_limit("astm", rate=2)
+        self.assertIs(limiter, get_limiter("astm"))
+        self.assertIsNone(get_limiter("iec"))
+        remove_rate_limit("astm")
+        self.assertIsNone(get_limiter("astm"))
+
+    @patch.object(Session, "get")
+    def test_fetch_retries_throttled_request(self, mock_get):
+        throttled = MagicMock(status_code=429, headers={'Retry-After': "0"})
+        ok = MagicMock(status_code=200, headers={}, text=read_webdata("D92.html"))
+        mock_get.side_effect = [throttled, ok]
+        limiter = set_rate_limit("astm", rate=1000, concurrency=4)
+        std_list = list(fetch_astm("D92"))
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual("18", std_list[0]['rev'])
+        self.assertEqual(2.5, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
+
+    @patch.object(Session, "get")
+    def test_fetch_throttled_until_retries_run_out(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=429, headers={})
+        set_rate_limit("astm", rate=1000, max_retries=2)
+        std_list = list(fetch_astm("D92"))
+        self.assertEqual(3, mock_get.call_count)
+        self.assertEqual("Connection error", std_list[0]['error'])
+        self.assertEqual(3, mock_get.return_value.close.call_count)
+
+    @patch.object(Session, "get")
+    def test_fetch_timeout_releases_slot(self, mock_get):
+        mock_get.side_effect = Timeout("timeout side effect")
+        limiter = set_rate_limit("astm", rate=1000, concurrency=4)
+        with self.assertRaises(Timeout):
+            list(fetch_astm("D92"))
+        self.assertEqual(0, limiter.in_flight)
+        self.assertEqual(2, limiter.limit)
+
+
+if __name__ == '__main__':
+    unittest.main()
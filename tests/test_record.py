@@ -0,0 +1,55 @@
+import os
+import pickle
+import unittest
+from unittest.mock import patch
+from requests import Session
+from stdchecker.astm import fetch_astm, check_astm
+from stdchecker.record import StdRecord, as_records
+
+MODULE_PATH = os.path.dirname(__file__)
+
+FETCHED = {'query': "D92", 'error': None, 'no': "ASTM D92", 'rev': "18", 'desc': "Flash Point", 'body': "astm",
+           'url': "https://www.astm.org/Standards/D92.htm"}
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestCase(unittest.TestCase):
+    def test_record(self):
+        record = StdRecord.from_dict(FETCHED)
+        self.assertEqual(FETCHED, record.to_dict())
+        self.assertEqual(FETCHED, record)
+        self.assertEqual(FETCHED, dict(record))
+        self.assertEqual("18", record['rev'])
+        self.assertEqual("18", record.rev)
+        self.assertNotIn("check", record)
+        self.assertIsNone(record.get("check"))
+        with self.assertRaises(KeyError):
+            _ = record['check']
+        with self.assertRaises(KeyError):
+            record['other'] = 1
+        with self.assertRaises(AttributeError):
+            record.other = 1
+        record['check'] = True
+        self.assertEqual(8, len(record))
+        self.assertEqual(record, pickle.loads(pickle.dumps(record)))
+        self.assertEqual([record], list(as_records([record.to_dict()])))
+
+    @patch.object(Session, "get")
+    def test_fetch_and_check(self, mock_get):
+        mock_get.return_value.text = read_webdata("D92.html")
+        fetched = list(fetch_astm("D92", compact=True))
+        self.assertIsInstance(fetched[0], StdRecord)
+        checked = list(check_astm(fetched, [{'id': 1, 'no': "ASTM D92", 'rev': "18"}], id_from_actual=True))
+        self.assertIs(fetched[0], checked[0])
+        self.assertEqual((True, "18", 1), (checked[0].check, checked[0].actual, checked[0].id))
+        mock_get.return_value.text = read_webdata("D92.html")
+        expected = list(check_astm(fetch_astm("D92"), [{'id': 1, 'no': "ASTM D92", 'rev': "18"}], id_from_actual=True))
+        self.assertEqual(expected[0], checked[0].to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
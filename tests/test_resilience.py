@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session, ConnectionError
+from requests.exceptions import ChunkedEncodingError
+from stdchecker.resilience import (CircuitBreaker, CircuitOpenError, ResiliencePolicy, set_resilience,
+                                   remove_resilience, get_resilience)
+from stdchecker.astm import fetch_astm
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class TestCase(unittest.TestCase):
+    def tearDown(self):
+        remove_resilience()
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+        breaker.record_failure()
+        self.assertEqual("closed", breaker.state)
+        breaker.record_failure()
+        self.assertEqual("open", breaker.state)
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertEqual("half-open", breaker.state)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual("open", breaker.state)
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual("closed", breaker.state)
+
+    def test_backoff_delay(self):
+        policy = ResiliencePolicy(backoff=1, max_backoff=3)
+        for attempt in range(1, 6):
+            self.assertTrue(0 <= policy.backoff_delay(attempt) <= min(3, 2 ** (attempt - 1)))
+
+    def test_retry(self):
+        policy = ResiliencePolicy(retries=2, backoff=0)
+        ok = MagicMock(status_code=200)
+        send = MagicMock(side_effect=[ConnectionError(), MagicMock(status_code=503), ok])
+        self.assertIs(ok, policy.call(send))
+        self.assertEqual(3, send.call_count)
+        send = MagicMock(side_effect=ConnectionError())
+        with self.assertRaises(ConnectionError):
+            policy.call(send)
+        self.assertEqual(3, send.call_count)
+
+    def test_trial_request_error(self):
+        policy = ResiliencePolicy(retries=0, failure_threshold=1, recovery_time=0)
+        policy.breaker.record_failure()
+        send = MagicMock(side_effect=ChunkedEncodingError("chunked encoding error side effect"))
+        with self.assertRaises(ChunkedEncodingError):
+            policy.call(send)
+        self.assertTrue(policy.breaker.allow())
+
+    def test_hedge(self):
+        policy = ResiliencePolicy(hedge_min_samples=5)
+        for _ in range(5):
+            policy.latencies.add(0.01)
+        released = threading.Event()
+        slow = MagicMock(status_code=200, name="slow")
+        fast = MagicMock(status_code=200, name="fast")
+        responses = iter([slow, fast])
+
+        def send():
+            # The first request does not complete until the call returns, so only the hedged one can be returned.
+            response = next(responses)
+            if response is slow:
+                released.wait(5)
+            return response
+
+        self.assertIs(fast, policy.call(send))
+        released.set()
+
+    def test_hedge_closes_slow_response(self):
+        policy = ResiliencePolicy(hedge_min_samples=5)
+        for _ in range(5):
+            policy.latencies.add(0.01)
+        released = threading.Event()
+        closed = threading.Event()
+        slow = MagicMock(status_code=200, name="slow")
+        slow.close.side_effect = closed.set
+        fast = MagicMock(status_code=200, name="fast")
+        responses = iter([slow, fast])
+
+        def send():
+            response = next(responses)
+            if response is slow:
+                released.wait(5)
+            return response
+
+        self.assertIs(fast, policy.call(send))
+        released.set()
+        self.assertTrue(closed.wait(5))
+        fast.close.assert_not_called()
+
+    @patch.object(Session, "get")
+    def test_fetch_retries_connection_error(self, mock_get):
+        mock_get.side_effect = [ConnectionError("connection error side effect"),
+                                MagicMock(status_code=200, headers={}, text=read_webdata("D92.html"))]
+        set_resilience("astm", backoff=0, timeout=3)
+        std_list = list(fetch_astm("D92"))
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(3, mock_get.call_args.kwargs['timeout'])
+        self.assertEqual("18", std_list[0]['rev'])
+
+    @patch.object(Session, "get")
+    def test_fetch_fails_fast_when_circuit_is_open(self, mock_get):
+        mock_get.side_effect = ConnectionError("connection error side effect")
+        policy = set_resilience("astm", retries=0, failure_threshold=2, recovery_time=60)
+        std_list = list(fetch_astm(["D92", "D93", "D94", "D95"]))
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual("open", policy.breaker.state)
+        self.assertTrue(all(i['error'] == "Connection error" for i in std_list))
+        self.assertIs(policy, get_resilience("astm"))
+        self.assertTrue(issubclass(CircuitOpenError, ConnectionError))
+
+
+if __name__ == '__main__':
+    unittest.main()
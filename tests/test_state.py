@@ -0,0 +1,72 @@
+import os
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session, ConnectionError
+from stdchecker import check_all
+from stdchecker.astm import fetch_astm
+from stdchecker.state import StateStore, fetch_incremental
+
+MODULE_PATH = os.path.dirname(__file__)
+
+
+def read_webdata(filename):
+    with open(os.path.join(MODULE_PATH, "webdata", filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def fetched_item(query, error=None):
+    return {'query': query, 'error': error, 'no': None if error else f"ASTM {query}", 'rev': None if error else "18",
+            'desc': None, 'body': "astm", 'url': None}
+
+
+class TestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = StateStore(":memory:", staleness={'astm': 60})
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_partition(self):
+        self.store.record_fetched("astm", "D92", [fetched_item("D92")])
+        self.store.record_fetched("astm", "D93", [fetched_item("D93", "Connection error")])
+        reused, stale = self.store.partition("astm", ["D92", "D93", "D94"])
+        self.assertEqual([fetched_item("D92")], reused)
+        self.assertEqual(["D93", "D94"], stale)
+        entry = self.store.get("astm", "D92")
+        self.assertFalse(entry.error)
+        self.assertTrue(self.store.is_stale("astm", entry._replace(fetched_at=time.time() - 61)))
+        self.assertTrue(self.store.is_stale("iec", self.store.get("astm", "D92")._replace(fetched_at=0)))
+        self.store.clear("astm")
+        self.assertIsNone(self.store.get("astm", "D92"))
+
+    @patch.object(Session, "get")
+    def test_fetch_incremental(self, mock_get):
+        mock_get.side_effect = [MagicMock(text=read_webdata("D92.html")), ConnectionError("connection error"),
+                                MagicMock(text=read_webdata("D92.html"))]
+        first = list(fetch_incremental(fetch_astm, "astm", ["D92", "D93"], self.store))
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(["18", None], [i['rev'] for i in first])
+        second = list(fetch_incremental(fetch_astm, "astm", ["D92", "D93"], self.store))
+        self.assertEqual(3, mock_get.call_count)
+        self.assertEqual("https://www.astm.org/Standards/D93.htm", mock_get.call_args.args[0])
+        self.assertEqual([None, None], [i['error'] for i in second])
+        list(fetch_incremental(fetch_astm, "astm", "D92", self.store))
+        self.assertEqual(3, mock_get.call_count)
+
+    @patch.object(Session, "get")
+    def test_check_all(self, mock_get):
+        mock_get.return_value = MagicMock(text=read_webdata("D92.html"))
+        inventory = [{'id': 1, 'body': "astm", 'query': "D92", 'no': "ASTM D92", 'rev': "12"}]
+        first = list(check_all(inventory, state=self.store))
+        second = list(check_all(inventory, state=self.store))
+        self.assertEqual(1, mock_get.call_count)
+        self.assertEqual(first, second)
+        checks = self.store.checks("astm")
+        self.assertEqual(1, len(checks))
+        self.assertEqual(("ASTM D92", "18", "12", False),
+                         (checks[0]['no'], checks[0]['rev'], checks[0]['actual'], checks[0]['check']))
+
+
+if __name__ == '__main__':
+    unittest.main()
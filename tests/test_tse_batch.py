@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from requests import Session, ConnectionError
+from stdchecker.tse import fetch_tse, plan_tse_searches, tse_stem
+
+STANDARDS = [
+    ("TS EN 60076-1", "09.11.2012"), ("TS EN 60076-2", "14.04.2011"), ("TS EN 60076-3", "10.04.2014"),
+    ("TS EN 60076-10 İptal Standard", "01.01.2005"), ("TS EN 60076-10", "13.04.2017"), ("TS EN 60076-11", "22.02.2019"),
+]
+
+
+def row(c, number, rev):
+    return (f'<tr class="grvRowStyle"><td>{c}</td><td></td><td>'
+            f'<span id="cph1_grvStandard_lblTsNo_{c}">{number}</span>'
+            f'<span id="cph1_grvStandard_lblBaslik_{c}"><br/>Güç transformatörleri<br/></span>'
+            f'</td><td>{rev}</td><td></td></tr>')
+
+
+def mock_response(query):
+    rows = "".join(row(c, *i) for c, i in enumerate(STANDARDS) if i[0].startswith(query))
+    response = MagicMock()
+    response.text = f"<html><body><table>{rows}</table></body></html>"
+    return response
+
+
+class TestCase(unittest.TestCase):
+    def test_plan(self):
+        self.assertEqual("TS EN 60076", tse_stem("TS EN 60076-10-1"))
+        self.assertEqual([("TS EN 60076", ["TS EN 60076-1", "TS EN 60076-11"]), ("TS EN 60296", ["TS EN 60296"])],
+                         plan_tse_searches(["TS EN 60076-1", "TS EN 60296", "TS EN 60076-11"]))
+
+    @patch.object(Session, "post")
+    def test_fetch_batch(self, mock_post):
+        mock_post.side_effect = lambda url, data, **kwargs: mock_response(data["ctl00$cph1$txtTsNo"])
+        queries = ["TS EN 60076-1", "TS EN 60076-2", "TS EN 60076-3", "TS EN 60076-10", "TS EN 60076-11"]
+        expected = list(fetch_tse(queries))
+        self.assertEqual(5, mock_post.call_count)
+        mock_post.reset_mock()
+        std_list = list(fetch_tse(queries, batch=True))
+        self.assertEqual(1, mock_post.call_count)
+        self.assertEqual("TS EN 60076", mock_post.call_args.kwargs['data']["ctl00$cph1$txtTsNo"])
+        self.assertEqual(expected, std_list)
+        self.assertEqual("13.04.2017", std_list[3]['rev'])
+
+    @patch.object(Session, "post")
+    def test_fetch_batch_falls_back_to_single_search(self, mock_post):
+        mock_post.side_effect = lambda url, data, **kwargs: mock_response(data["ctl00$cph1$txtTsNo"])
+        std_list = list(fetch_tse(["TS EN 60076-1", "TS EN 60076-99"], batch=True))
+        self.assertEqual(2, mock_post.call_count)
+        self.assertEqual(["TS EN 60076-1", "TS EN 60076-99"], [i['query'] for i in std_list])
+        self.assertEqual("Not found", std_list[1]['error'])
+
+    @patch.object(Session, "post")
+    def test_fetch_batch_connection_error(self, mock_post):
+        mock_post.side_effect = ConnectionError("connection error side effect")
+        std_list = list(fetch_tse(["TS EN 60076-1", "TS EN 60076-2"], batch=True))
+        self.assertEqual(["TS EN 60076-1", "TS EN 60076-2"], [i['query'] for i in std_list])
+        self.assertTrue(all(i['error'] == "Connection error" for i in std_list))
+
+
+if __name__ == '__main__':
+    unittest.main()